@@ -0,0 +1,430 @@
+import os
+import json
+import time
+import asyncio
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+
+def make_cache_key(document: Union[str, bytes], parser: str, generator_version: str) -> str:
+    """
+    Content-addressed key: same document bytes + same parser path + same
+    generator version always map to the same entry.
+    """
+    if isinstance(document, str):
+        document = document.encode("utf-8")
+    digest = hashlib.sha256()
+    digest.update(document)
+    digest.update(b"\x00" + parser.encode("utf-8"))
+    digest.update(b"\x00" + generator_version.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class LRUCache:
+    """In-process LRU with per-entry TTL and an overall byte budget."""
+
+    def __init__(self, max_entries: int = 256, max_bytes: int = 64 * 1024 * 1024, ttl: float = 3600):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._data: "OrderedDict[str, Tuple[float, int, Any]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, size, value = entry
+            if expires_at < time.monotonic():
+                self._remove(key)
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, size: int = 0, ttl: Optional[float] = None):
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+            expires_at = time.monotonic() + (ttl if ttl is not None else self.ttl)
+            self._data[key] = (expires_at, size, value)
+            self._bytes += size
+            while len(self._data) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._data))
+                self._remove(oldest)
+
+    def delete(self, key: str):
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def _remove(self, key: str):
+        _, size, _ = self._data.pop(key)
+        self._bytes -= size
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    @property
+    def total_bytes(self) -> int:
+        return self._bytes
+
+
+class DiskCache:
+    """
+    Stores JSON payloads as one file per key. A file's mtime is its expiry
+    and its atime is refreshed on reads, so eviction by oldest atime
+    approximates LRU across processes. Sizes are tracked with a running
+    counter; the directory is only rescanned when it passes max_bytes (then
+    trimmed to low_water of it) or every resync_every writes, to pick up
+    what other processes wrote.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_bytes: int = 512 * 1024 * 1024,
+        ttl: float = 24 * 3600,
+        low_water: float = 0.9,
+        resync_every: int = 1000,
+    ):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.low_water = low_water
+        self.resync_every = resync_every
+        self._bytes: Optional[int] = None
+        self._writes = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key: str) -> Optional[str]:
+        path = self._path(key)
+        try:
+            expires_at = os.stat(path).st_mtime
+            if expires_at < time.time():
+                self.delete(key)
+                return None
+            with open(path, "r", encoding="utf-8") as f:
+                payload = f.read()
+            os.utime(path, (time.time(), expires_at))
+            return payload
+        except (FileNotFoundError, OSError):
+            return None
+
+    def set(self, key: str, payload: str, ttl: Optional[float] = None):
+        path = self._path(key)
+        data = payload.encode("utf-8")
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        now = time.time()
+        os.utime(tmp_path, (now, now + (ttl if ttl is not None else self.ttl)))
+        try:
+            replaced = os.stat(path).st_size
+        except FileNotFoundError:
+            replaced = 0
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            if self._bytes is None:
+                self._bytes = self._scan()[1]
+            else:
+                self._bytes += len(data) - replaced
+            self._writes += 1
+            if self._bytes > self.max_bytes or self._writes >= self.resync_every:
+                self._evict()
+
+    def delete(self, key: str):
+        path = self._path(key)
+        try:
+            size = os.stat(path).st_size
+            os.remove(path)
+        except FileNotFoundError:
+            return
+        with self._lock:
+            if self._bytes is not None:
+                self._bytes -= size
+
+    def _scan(self) -> Tuple[list, int]:
+        """Drops expired files; (atime, size, path) of the rest and their total size."""
+        entries = []
+        total = 0
+        now = time.time()
+        for name in os.listdir(self.directory):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+                if stat.st_mtime < now:
+                    os.remove(path)
+                    continue
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_atime, stat.st_size, path))
+            total += stat.st_size
+        return entries, total
+
+    def _evict(self):
+        entries, total = self._scan()
+        if total > self.max_bytes:
+            target = self.max_bytes * self.low_water
+            entries.sort()
+            for _, size, path in entries:
+                if total <= target:
+                    break
+                try:
+                    os.remove(path)
+                    total -= size
+                except FileNotFoundError:
+                    pass
+        self._bytes = total
+        self._writes = 0
+
+
+class RedisCache:
+    """Shared backend for multi-worker deployments (REDIS_URL from docker-compose)."""
+
+    def __init__(self, url: str, ttl: float = 24 * 3600, prefix: str = "doc2sdk:result:"):
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[str]:
+        payload = self.client.get(self.prefix + key)
+        if payload is None:
+            return None
+        return payload.decode("utf-8") if isinstance(payload, bytes) else payload
+
+    def set(self, key: str, payload: str, ttl: Optional[float] = None):
+        self.client.set(self.prefix + key, payload, ex=int(ttl if ttl is not None else self.ttl))
+
+    def delete(self, key: str):
+        self.client.delete(self.prefix + key)
+
+
+class ResultCache:
+    """
+    Two-level cache: a local LRU in front of an optional shared backend
+    (Redis or disk). Backend failures are logged and treated as misses.
+    """
+
+    def __init__(self, local: Optional[LRUCache] = None, backend: Optional[Any] = None):
+        self.local = local if local is not None else LRUCache()
+        self.backend = backend
+        self._stats = {"local_hits": 0, "backend_hits": 0, "misses": 0, "sets": 0, "errors": 0}
+        self._stats_lock = threading.Lock()
+
+    def _incr(self, name: str):
+        with self._stats_lock:
+            self._stats[name] += 1
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        value = self._local_get(key)
+        if value is None and self.backend is not None:
+            value = self._backend_get(key)
+        if value is None:
+            self._incr("misses")
+        return value
+
+    async def aget(self, key: str) -> Optional[Dict[str, Any]]:
+        """get() for async handlers: local hits stay inline, backend reads run in a worker thread."""
+        value = self._local_get(key)
+        if value is None and self.backend is not None:
+            value = await asyncio.to_thread(self._backend_get, key)
+        if value is None:
+            self._incr("misses")
+        return value
+
+    def set(self, key: str, value: Dict[str, Any], ttl: Optional[float] = None):
+        payload = json.dumps(value, separators=(",", ":"), default=str)
+        self.local.set(key, value, size=len(payload), ttl=ttl)
+        self._incr("sets")
+        if self.backend is not None:
+            self._backend_set(key, payload, ttl)
+
+    async def aset(self, key: str, value: Dict[str, Any], ttl: Optional[float] = None):
+        """set() for async handlers: encoding and the backend write run in a worker thread."""
+        if self.backend is None:
+            return self.set(key, value, ttl)
+        await asyncio.to_thread(self.set, key, value, ttl)
+
+    async def aget_many(self, keys: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """Batch lookup: local hits inline, all backend misses in one worker-thread hop."""
+        values = [self._local_get(key) for key in keys]
+        missing = [i for i, value in enumerate(values) if value is None]
+        if missing and self.backend is not None:
+            fetched = await asyncio.to_thread(lambda: [self._backend_get(keys[i]) for i in missing])
+            for i, value in zip(missing, fetched):
+                values[i] = value
+        for value in values:
+            if value is None:
+                self._incr("misses")
+        return values
+
+    async def aset_many(self, items: Dict[str, Any], ttl: Optional[float] = None):
+        """Batch write; the backend writes share one worker-thread hop."""
+        if self.backend is None:
+            for key, value in items.items():
+                self.set(key, value, ttl)
+            return
+        await asyncio.to_thread(lambda: [self.set(key, value, ttl) for key, value in items.items()])
+
+    def _local_get(self, key: str) -> Optional[Dict[str, Any]]:
+        value = self.local.get(key)
+        if value is not None:
+            self._incr("local_hits")
+        return value
+
+    def _backend_get(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            payload = self.backend.get(key)
+        except Exception as e:
+            print(f"DEBUG: Result cache backend read failed: {str(e)}")
+            self._incr("errors")
+            return None
+        if payload is None:
+            return None
+        value = json.loads(payload)
+        self.local.set(key, value, size=len(payload))
+        self._incr("backend_hits")
+        return value
+
+    def _backend_set(self, key: str, payload: str, ttl: Optional[float]):
+        try:
+            self.backend.set(key, payload, ttl=ttl)
+        except Exception as e:
+            print(f"DEBUG: Result cache backend write failed: {str(e)}")
+            self._incr("errors")
+
+    def clear_local(self):
+        self.local.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            stats = dict(self._stats)
+        hits = stats["local_hits"] + stats["backend_hits"]
+        lookups = hits + stats["misses"]
+        stats["hits"] = hits
+        stats["hit_ratio"] = round(hits / lookups, 4) if lookups else 0.0
+        stats["local_entries"] = len(self.local)
+        stats["local_bytes"] = self.local.total_bytes
+        stats["backend"] = type(self.backend).__name__ if self.backend is not None else None
+        return stats
+
+
+def _build_backend(
+    env_prefix: str = "RESULT_CACHE",
+    redis_prefix: str = "doc2sdk:result:",
+    default_dir: str = ".doc2sdk_cache/results",
+    default_backend: str = "",
+) -> Optional[Any]:
+    backend = os.getenv(f"{env_prefix}_BACKEND", default_backend).lower()
+    ttl = float(os.getenv(f"{env_prefix}_TTL", 24 * 3600))
+    try:
+        if backend == "redis":
+            return RedisCache(os.getenv("REDIS_URL", "redis://localhost:6379"), ttl=ttl, prefix=redis_prefix)
+        if backend == "disk":
+            return DiskCache(
+                os.getenv(f"{env_prefix}_DIR", default_dir),
+                max_bytes=int(os.getenv(f"{env_prefix}_DISK_MAX_BYTES", 512 * 1024 * 1024)),
+                ttl=ttl,
+            )
+    except Exception as e:
+        print(f"DEBUG: Failed to initialize {backend} cache for {env_prefix}, using in-process only: {str(e)}")
+    return None
+
+
+_result_cache: Optional[ResultCache] = None
+_translation_cache: Optional[ResultCache] = None
+_playground_cache: Optional[ResultCache] = None
+_fragment_cache: Optional[ResultCache] = None
+
+
+def get_result_cache() -> ResultCache:
+    global _result_cache
+    if _result_cache is None:
+        local = LRUCache(
+            max_entries=int(os.getenv("RESULT_CACHE_MAX_ENTRIES", 256)),
+            max_bytes=int(os.getenv("RESULT_CACHE_MAX_BYTES", 64 * 1024 * 1024)),
+            ttl=float(os.getenv("RESULT_CACHE_TTL", 3600)),
+        )
+        _result_cache = ResultCache(local=local, backend=_build_backend())
+    return _result_cache
+
+
+def get_translation_cache() -> ResultCache:
+    """
+    String -> English translation cache. In-process by default: a response
+    can add thousands of tiny entries, which a per-file disk store handles
+    poorly. TRANSLATION_CACHE_BACKEND=redis|disk (or the result cache's
+    Redis) makes them shared or persistent.
+    """
+    global _translation_cache
+    if _translation_cache is None:
+        local = LRUCache(
+            max_entries=int(os.getenv("TRANSLATION_CACHE_MAX_ENTRIES", 50_000)),
+            max_bytes=int(os.getenv("TRANSLATION_CACHE_MAX_BYTES", 32 * 1024 * 1024)),
+            ttl=float(os.getenv("TRANSLATION_CACHE_TTL", 30 * 24 * 3600)),
+        )
+        backend = _build_backend(
+            env_prefix="TRANSLATION_CACHE",
+            redis_prefix="doc2sdk:translation:",
+            default_dir=".doc2sdk_cache/translations",
+            default_backend=os.getenv("RESULT_CACHE_BACKEND", ""),
+        )
+        _translation_cache = ResultCache(local=local, backend=backend)
+    return _translation_cache
+
+
+def get_playground_cache() -> ResultCache:
+    """Recorded playground upstream responses (record/replay); on disk by default so recordings survive restarts."""
+    global _playground_cache
+    if _playground_cache is None:
+        local = LRUCache(
+            max_entries=int(os.getenv("PLAYGROUND_CACHE_MAX_ENTRIES", 1024)),
+            max_bytes=int(os.getenv("PLAYGROUND_CACHE_MAX_BYTES", 64 * 1024 * 1024)),
+            ttl=float(os.getenv("PLAYGROUND_CACHE_TTL", 24 * 3600)),
+        )
+        backend = _build_backend(
+            env_prefix="PLAYGROUND_CACHE",
+            redis_prefix="doc2sdk:playground:",
+            default_dir=".doc2sdk_cache/playground",
+            default_backend="disk",
+        )
+        _playground_cache = ResultCache(local=local, backend=backend)
+    return _playground_cache
+
+
+def get_fragment_cache() -> ResultCache:
+    """
+    Rendered per-endpoint SDK method fragments. In-process by default (a
+    2,000-endpoint spec is a few thousand small entries); FRAGMENT_CACHE_BACKEND
+    =redis shares them between workers.
+    """
+    global _fragment_cache
+    if _fragment_cache is None:
+        local = LRUCache(
+            max_entries=int(os.getenv("FRAGMENT_CACHE_MAX_ENTRIES", 50_000)),
+            max_bytes=int(os.getenv("FRAGMENT_CACHE_MAX_BYTES", 128 * 1024 * 1024)),
+            ttl=float(os.getenv("FRAGMENT_CACHE_TTL", 7 * 24 * 3600)),
+        )
+        backend = _build_backend(env_prefix="FRAGMENT_CACHE", redis_prefix="doc2sdk:fragment:", default_dir=".doc2sdk_cache/fragments")
+        _fragment_cache = ResultCache(local=local, backend=backend)
+    return _fragment_cache
@@ -0,0 +1,102 @@
+import os
+import asyncio
+import importlib.util
+from contextlib import asynccontextmanager
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+import httpx
+from fastapi import Request
+
+
+class HTTPClientRegistry:
+    """
+    Named, long-lived httpx.AsyncClient instances shared across requests so
+    connections, TLS sessions and keep-alive are reused. Created once in the
+    app lifespan (see main.py) and injected with get_http_clients. A name in
+    client_limits gets its own pool size (e.g. "playground-batch", so load
+    tests can't take the connections interactive calls need).
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        max_per_host: int = 10,
+        keepalive_expiry: float = 30.0,
+        timeout: float = 30.0,
+        http2: bool = True,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        client_limits: Optional[Dict[str, httpx.Limits]] = None,
+    ):
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.client_limits = client_limits or {}
+        self.max_per_host = max_per_host
+        self.timeout = timeout
+        # HTTP/2 needs the optional h2 package (httpx[http2])
+        self.http2 = http2 and importlib.util.find_spec("h2") is not None
+        self.transport = transport
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._host_slots: Dict[str, asyncio.Semaphore] = {}
+
+    @classmethod
+    def from_env(cls) -> "HTTPClientRegistry":
+        batch_connections = int(os.getenv("PLAYGROUND_BATCH_MAX_CONNECTIONS", 20))
+        keepalive_expiry = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", 30.0))
+        return cls(
+            max_connections=int(os.getenv("HTTP_MAX_CONNECTIONS", 100)),
+            max_keepalive_connections=int(os.getenv("HTTP_MAX_KEEPALIVE", 20)),
+            max_per_host=int(os.getenv("HTTP_MAX_PER_HOST", 10)),
+            keepalive_expiry=keepalive_expiry,
+            timeout=float(os.getenv("HTTP_TIMEOUT", 30.0)),
+            http2=os.getenv("HTTP_ENABLE_HTTP2", "true").lower() == "true",
+            client_limits={
+                "playground-batch": httpx.Limits(
+                    max_connections=batch_connections,
+                    max_keepalive_connections=batch_connections,
+                    keepalive_expiry=keepalive_expiry,
+                ),
+            },
+        )
+
+    def get(self, name: str = "default") -> httpx.AsyncClient:
+        client = self._clients.get(name)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                limits=self.client_limits.get(name, self.limits),
+                timeout=self.timeout,
+                http2=self.http2,
+                transport=self.transport,
+                # Playground calls must not silently follow redirects; doc fetches should
+                follow_redirects=(name == "scraper"),
+            )
+            self._clients[name] = client
+        return client
+
+    @asynccontextmanager
+    async def host_slot(self, url: str):
+        """Caps concurrent in-flight requests to a single host."""
+        host = urlsplit(url).netloc.lower()
+        slot = self._host_slots.get(host)
+        if slot is None:
+            slot = self._host_slots[host] = asyncio.Semaphore(self.max_per_host)
+        async with slot:
+            yield
+
+    async def aclose(self):
+        for client in self._clients.values():
+            await client.aclose()
+        self._clients.clear()
+
+    async def __aenter__(self) -> "HTTPClientRegistry":
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+
+
+def get_http_clients(request: Request) -> HTTPClientRegistry:
+    return request.app.state.http_clients
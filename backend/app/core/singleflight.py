@@ -0,0 +1,116 @@
+import os
+import time
+import uuid
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key into one in-flight task
+    whose result (or exception) every caller receives. The shared task is
+    only cancelled once all of its callers have gone away, so one client
+    disconnecting doesn't fail the others.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Task] = {}
+        # callers currently awaiting each shared task
+        self._waiters: Dict[asyncio.Task, int] = {}
+        self._stats = {"leaders": 0, "followers": 0}
+        self._stats_lock = threading.Lock()
+
+    def _incr(self, name: str):
+        with self._stats_lock:
+            self._stats[name] += 1
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t, key=key: self._forget(key, t))
+            self._incr("leaders")
+        else:
+            self._incr("followers")
+
+        self._waiters[task] = self._waiters.get(task, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if self._waiters[task] == 1 and not task.done():
+                task.cancel()
+            raise
+        finally:
+            self._waiters[task] -= 1
+            if not self._waiters[task]:
+                del self._waiters[task]
+
+    def _forget(self, key: str, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()  # mark retrieved; callers already got it through shield()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats["in_flight"] = len(self._inflight)
+        return stats
+
+
+class RedisSingleFlight(SingleFlight):
+    """
+    Cross-worker variant: after in-process coalescing, one worker per key
+    takes a Redis lock and runs the call; other workers wait for the lock to
+    be released and then run it themselves, which by then is served from the
+    shared result cache instead of repeating the LLM call.
+    """
+
+    def __init__(self, url: str, lock_ttl: float = 300, poll_interval: float = 0.25, prefix: str = "doc2sdk:singleflight:"):
+        super().__init__()
+        import redis.asyncio as redis_asyncio
+        self.client = redis_asyncio.Redis.from_url(url, decode_responses=True)
+        self.lock_ttl = lock_ttl
+        self.poll_interval = poll_interval
+        self.prefix = prefix
+        self._stats["remote_waits"] = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        return await super().do(key, lambda: self._locked(key, fn))
+
+    async def _locked(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        lock_key = self.prefix + key
+        token = uuid.uuid4().hex
+        try:
+            acquired = await self.client.set(lock_key, token, nx=True, ex=int(self.lock_ttl))
+        except Exception as e:
+            print(f"DEBUG: Single-flight lock unavailable, running uncoordinated: {str(e)}")
+            return await fn()
+
+        if not acquired:
+            self._incr("remote_waits")
+            deadline = time.monotonic() + self.lock_ttl
+            while time.monotonic() < deadline and await self.client.exists(lock_key):
+                await asyncio.sleep(self.poll_interval)
+            return await fn()
+
+        try:
+            return await fn()
+        finally:
+            # Release only our own lock (it may have expired and been re-taken)
+            if await self.client.get(lock_key) == token:
+                await self.client.delete(lock_key)
+
+
+def build_single_flight() -> SingleFlight:
+    if os.getenv("SINGLEFLIGHT_BACKEND", "").lower() == "redis":
+        try:
+            return RedisSingleFlight(
+                os.getenv("REDIS_URL", "redis://localhost:6379"),
+                lock_ttl=float(os.getenv("SINGLEFLIGHT_LOCK_TTL", 300)),
+            )
+        except Exception as e:
+            print(f"DEBUG: Failed to initialize Redis single-flight, using in-process only: {str(e)}")
+    return SingleFlight()
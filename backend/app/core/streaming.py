@@ -0,0 +1,32 @@
+import json
+from typing import Any, AsyncIterator, Dict
+from fastapi.responses import StreamingResponse
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "sse": "text/event-stream",
+}
+
+
+def encode_event(event: Dict[str, Any], fmt: str = "ndjson") -> bytes:
+    payload = json.dumps(event, separators=(",", ":"), default=str)
+    if fmt == "sse":
+        return f"event: {event.get('type', 'message')}\ndata: {payload}\n\n".encode("utf-8")
+    return (payload + "\n").encode("utf-8")
+
+
+def event_stream_response(events: AsyncIterator[Dict[str, Any]], fmt: str = "ndjson") -> StreamingResponse:
+    """Frames an async iterator of event dicts as NDJSON (default) or Server-Sent Events."""
+    if fmt not in MEDIA_TYPES:
+        raise ValueError(f"Unsupported stream format: {fmt}")
+
+    async def body():
+        async for event in events:
+            yield encode_event(event, fmt)
+
+    return StreamingResponse(
+        body(),
+        media_type=MEDIA_TYPES[fmt],
+        # Stop reverse proxies (nginx, Render) from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
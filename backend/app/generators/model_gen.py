@@ -0,0 +1,200 @@
+import re
+import keyword
+from typing import Any, Dict, List, Optional, Tuple
+
+# Names the generated module already defines or imports
+RESERVED_NAMES = {
+    "Any", "Dict", "List", "Optional", "Union", "Enum", "dataclass", "sys", "httpx", "logging",
+    "retry", "asyncio", "importlib", "BaseResource",
+}
+
+SCALAR_TYPES = {
+    "string": "str",
+    "integer": "int",
+    "number": "float",
+    "boolean": "bool",
+    "array": "list",
+    "object": "dict",
+}
+
+
+def python_type(schema_type: Optional[str]) -> str:
+    """Maps an OpenAPI primitive type name onto a Python annotation."""
+    if not schema_type:
+        return "Any"
+    return SCALAR_TYPES.get(schema_type, schema_type)
+
+
+def class_name(name: str) -> str:
+    parts = [p for p in re.split(r"[^0-9a-zA-Z]+", name) if p]
+    cleaned = "".join(p[:1].upper() + p[1:] for p in parts) or "Model"
+    if cleaned[0].isdigit():
+        cleaned = "Model" + cleaned
+    return cleaned
+
+
+def attribute_name(name: str) -> str:
+    snake = re.sub(r"(?<=[a-z0-9])([A-Z])", r"_\1", name)
+    cleaned = re.sub(r"[^0-9a-zA-Z]+", "_", snake).strip("_").lower() or "field"
+    if cleaned[0].isdigit():
+        cleaned = "f_" + cleaned
+    if keyword.iskeyword(cleaned) or cleaned in ("to_dict", "from_dict"):
+        cleaned += "_"
+    return cleaned
+
+
+def _docstring(text: Optional[str]) -> str:
+    """One line of text that is safe inside a triple-quoted docstring."""
+    return " ".join((text or "").replace("\\", "/").replace('"', "'").split())
+
+
+class ModelBuilder:
+    """
+    Turns a spec's component schemas into template-ready model descriptions:
+    one slotted dataclass per object schema, with a generated from_dict that
+    decodes nested models and lists of models with plain attribute access
+    instead of reflection.
+    """
+
+    def __init__(self, schemas: Dict[str, Any], reserved: Tuple[str, ...] = ()):
+        self.schemas = schemas or {}
+        taken = set(RESERVED_NAMES) | set(reserved)
+        # schema name -> class name, for object schemas only
+        self.names: Dict[str, str] = {}
+        for name, schema in self.schemas.items():
+            if not self._is_object(schema):
+                continue
+            cls = class_name(name)
+            while cls in taken:
+                cls += "Model"
+            taken.add(cls)
+            self.names[name] = cls
+
+    def _is_object(self, schema: Any) -> bool:
+        return isinstance(schema, dict) and (
+            (schema.get("type") == "object" and "additionalProperties" not in schema)
+            or "properties" in schema
+            or "allOf" in schema
+        )
+
+    @staticmethod
+    def _ref_target(schema: Dict[str, Any]) -> Optional[str]:
+        if "x-schema-name" in schema:
+            return schema["x-schema-name"]
+        ref = schema.get("$ref")
+        if isinstance(ref, str):
+            return ref.rsplit("/", 1)[-1]
+        return None
+
+    def type_of(self, schema: Any, seen: Tuple[str, ...] = ()) -> Tuple[str, str]:
+        """Returns (annotation, decode expression with a {v} placeholder)."""
+        if not isinstance(schema, dict):
+            return "Any", "{v}"
+
+        target = self._ref_target(schema)
+        if target is not None:
+            if target in self.names:
+                cls = self.names[target]
+                return cls, cls + ".from_dict({v})"
+            if target in self.schemas and target not in seen:
+                # Alias such as `PetList: {type: array, items: {$ref: Pet}}`
+                return self.type_of(self.schemas[target], seen + (target,))
+            return "Any", "{v}"
+
+        if len(schema.get("allOf") or []) == 1:
+            return self.type_of(schema["allOf"][0], seen)
+
+        schema_type = schema.get("type")
+        if schema_type == "array":
+            inner, decode = self.type_of(schema.get("items"), seen)
+            if decode == "{v}":
+                return f"List[{inner}]", "{v}"
+            return f"List[{inner}]", "[" + decode.replace("{v}", "x") + " for x in {v}]"
+        if schema_type == "object" and isinstance(schema.get("additionalProperties"), dict):
+            inner, decode = self.type_of(schema["additionalProperties"], seen)
+            if decode == "{v}":
+                return f"Dict[str, {inner}]", "{v}"
+            return f"Dict[str, {inner}]", "{k: " + decode.replace("{v}", "x") + " for k, x in {v}.items()}"
+        if schema_type == "object":
+            return "Dict[str, Any]", "{v}"
+        return python_type(schema_type), "{v}"
+
+    def _properties(self, schema: Dict[str, Any], seen: Tuple[str, ...] = ()) -> Tuple[Dict[str, Any], List[str]]:
+        """Properties and required names, with allOf parts merged in order."""
+        properties: Dict[str, Any] = {}
+        required: List[str] = []
+        for part in schema.get("allOf") or []:
+            target = self._ref_target(part) if isinstance(part, dict) else None
+            if target is not None:
+                if target in seen or target not in self.schemas:
+                    continue
+                part, seen = self.schemas[target], seen + (target,)
+            if isinstance(part, dict):
+                props, req = self._properties(part, seen)
+                properties.update(props)
+                required.extend(req)
+        properties.update(schema.get("properties") or {})
+        required.extend(schema.get("required") or [])
+        return properties, required
+
+    def models(self) -> List[Dict[str, Any]]:
+        models = []
+        for name, cls in self.names.items():
+            schema = self.schemas[name]
+            properties, required = self._properties(schema, (name,))
+            fields = []
+            attrs = set()
+            for key, prop in properties.items():
+                attr = attribute_name(key)
+                while attr in attrs:
+                    attr += "_"
+                attrs.add(attr)
+                annotation, decode = self.type_of(prop)
+                value = f"data.get({key!r})"
+                if decode != "{v}":
+                    value = decode.replace("{v}", f"data[{key!r}]") + f" if data.get({key!r}) is not None else None"
+                fields.append({
+                    "key": key,
+                    "key_literal": repr(key),
+                    "attr": attr,
+                    "annotation": annotation,
+                    "required": key in required,
+                    "decode": value,
+                })
+            # Dataclass fields without defaults must come first
+            fields.sort(key=lambda f: not f["required"])
+            models.append({
+                "name": cls,
+                "schema_name": name,
+                "description": _docstring(schema.get("description")),
+                "fields": fields,
+            })
+        return models
+
+    def response_decoders(self, endpoints: List[Any]) -> Dict[str, Dict[str, str]]:
+        """'METHOD /path' -> {annotation, decode} for the endpoint's 2xx JSON body."""
+        decoders = {}
+        for endpoint in endpoints:
+            responses = endpoint["responses"] if isinstance(endpoint, dict) else endpoint.responses
+            method = endpoint["method"] if isinstance(endpoint, dict) else endpoint.method
+            path = endpoint["path"] if isinstance(endpoint, dict) else endpoint.path
+            schema = self.success_schema(responses or {})
+            if schema is None:
+                continue
+            annotation, decode = self.type_of(schema)
+            if decode != "{v}":
+                decoders[f"{method} {path}"] = {"annotation": annotation, "decode": decode}
+        return decoders
+
+    @staticmethod
+    def success_schema(responses: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        for status in sorted(responses):
+            if not str(status).startswith("2") or not isinstance(responses[status], dict):
+                continue
+            response = responses[status]
+            if "schema" in response:  # Swagger 2
+                return response["schema"]
+            for media_type, content in (response.get("content") or {}).items():
+                if "json" in media_type and isinstance(content, dict) and "schema" in content:
+                    return content["schema"]
+        return None
@@ -0,0 +1,156 @@
+import io
+import os
+import keyword
+import zipfile
+import datetime
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+from ..parsers.openapi import NormalizedAPISpec
+from .sdk_gen import CodeGenerator, sanitize_identifier
+
+# Below this many endpoints modules are rendered in-process; pool hand-off costs more than it saves
+PARALLEL_MIN_ENDPOINTS = int(os.getenv("SDK_PARALLEL_MIN_ENDPOINTS", 400))
+RENDER_PROCESSES = int(os.getenv("SDK_RENDER_PROCESSES", os.cpu_count() or 1))
+
+_render_pool: Optional[ProcessPoolExecutor] = None
+_worker_generator: Optional[CodeGenerator] = None
+
+
+def _get_render_pool() -> ProcessPoolExecutor:
+    global _render_pool
+    if _render_pool is None:
+        # spawn: forking a process that runs an event loop and thread pools is unsafe
+        _render_pool = ProcessPoolExecutor(
+            max_workers=RENDER_PROCESSES,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _render_pool
+
+
+def shutdown_render_pool():
+    global _render_pool
+    if _render_pool is not None:
+        _render_pool.shutdown(cancel_futures=True)
+        _render_pool = None
+
+
+def _render_job(job: Tuple[str, Dict[str, Any]]) -> str:
+    """Process-pool entry point; each worker compiles the templates once."""
+    global _worker_generator
+    if _worker_generator is None:
+        _worker_generator = CodeGenerator()
+    template_name, context = job
+    return _worker_generator.env.get_template(template_name).render(**context)
+
+
+def _resource_names(tag: str, taken: List[str]) -> Dict[str, str]:
+    module = sanitize_identifier(tag) or "default"
+    if module[0].isdigit():
+        module = "r" + module
+    if keyword.iskeyword(module) or module in ("client", "close"):
+        module += "_"
+    # Distinct tags can sanitize to the same module name ("Pets" / "pets")
+    base, n = module, 2
+    while module in taken:
+        module, n = f"{base}{n}", n + 1
+    class_name = "".join(part.capitalize() for part in module.split("_") if part) + "Resource"
+    return {"tag": tag, "module": module, "attr": module, "class_name": class_name}
+
+
+class PackageGenerator:
+    """
+    Multi-file SDK output: endpoints are grouped by their first tag into
+    per-resource modules that the client loads lazily. Large specs render
+    their modules in parallel on a process pool.
+    """
+
+    def __init__(self, generator: Optional[CodeGenerator] = None):
+        self.generator = generator or CodeGenerator()
+
+    @staticmethod
+    def package_name(spec: NormalizedAPISpec) -> str:
+        return sanitize_identifier(spec.name) or "api_sdk"
+
+    @staticmethod
+    def group_by_tag(spec: NormalizedAPISpec) -> "OrderedDict[str, List[Dict[str, Any]]]":
+        groups: "OrderedDict[str, List[Dict[str, Any]]]" = OrderedDict()
+        for endpoint in spec.endpoints:
+            tag = endpoint.tags[0] if endpoint.tags else "default"
+            groups.setdefault(tag, []).append(endpoint.model_dump())
+        return groups
+
+    def build_files(self, spec: NormalizedAPISpec, language: str = "python") -> Dict[str, str]:
+        """Returns {relative path: file content} for the packaged SDK."""
+        language = language.lower()
+        if language == "ts":
+            language = "typescript"
+        if language not in ("python", "typescript"):
+            raise ValueError(f"Language {language} not supported")
+
+        package_name = self.package_name(spec)
+        groups = self.group_by_tag(spec)
+        resources: List[Dict[str, str]] = []
+        for tag in groups:
+            resources.append(_resource_names(tag, [r["module"] for r in resources]))
+        base = {
+            "name": spec.name,
+            "version": spec.version,
+            "base_url": spec.base_url,
+            "authentication": spec.authentication,
+            "error_class": spec.name.replace(" ", "") + "APIError",
+            "client_class": spec.name.replace(" ", "") + "Client",
+            "package_name": package_name,
+            "resources": resources,
+            "generated_at": datetime.datetime.utcnow().isoformat(),
+        }
+        schema_context = self.generator.schema_context(spec)
+        # Resource modules only need decoders and pagination; the model list goes to models.py alone
+        base["decoders"] = schema_context["decoders"]
+        base["paginations"] = schema_context["paginations"]
+
+        prefix = f"package/{language}"
+        if language == "python":
+            root = f"{package_name}/"
+            jobs = [
+                (f"{root}__init__.py", (f"{prefix}/__init__.py.j2", base)),
+                (f"{root}_base.py", (f"{prefix}/_base.py.j2", base)),
+                (f"{root}client.py", (f"{prefix}/client.py.j2", base)),
+                (f"{root}models.py", (f"{prefix}/models.py.j2", {**base, "models": schema_context["models"]})),
+                ("pyproject.toml", (f"{prefix}/pyproject.toml.j2", base)),
+            ]
+            module_path = root + "resources/{module}.py"
+            resource_template = "resource.py.j2"
+            files = {f"{root}resources/__init__.py": ""}
+        else:
+            jobs = [
+                ("src/base.ts", (f"{prefix}/base.ts.j2", base)),
+                ("src/index.ts", (f"{prefix}/index.ts.j2", base)),
+                ("package.json", (f"{prefix}/package.json.j2", base)),
+            ]
+            module_path = "src/resources/{module}.ts"
+            resource_template = "resource.ts.j2"
+            files = {}
+
+        for resource, endpoints in zip(resources, groups.values()):
+            context = {**base, **resource, "resource_class": resource["class_name"], "endpoints": endpoints}
+            jobs.append((module_path.format(module=resource["module"]), (f"{prefix}/{resource_template}", context)))
+
+        paths = [path for path, _ in jobs]
+        if RENDER_PROCESSES > 1 and len(spec.endpoints) >= PARALLEL_MIN_ENDPOINTS and len(groups) > 1:
+            rendered = list(_get_render_pool().map(_render_job, [job for _, job in jobs]))
+        else:
+            env = self.generator.env
+            rendered = [env.get_template(name).render(**context) for _, (name, context) in jobs]
+
+        files.update(zip(paths, rendered))
+        return files
+
+    def build_zip(self, spec: NormalizedAPISpec, language: str = "python") -> bytes:
+        files = self.build_files(spec, language)
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            for path, content in files.items():
+                archive.writestr(path, content.lstrip("\n"))
+        return buffer.getvalue()
@@ -0,0 +1,120 @@
+import re
+from typing import Any, Dict, List, Optional
+from .model_gen import ModelBuilder
+
+# Parameter / property names compared after lowercasing and dropping separators
+CURSOR_PARAMS = ("cursor", "after", "pagetoken", "nexttoken", "startingafter", "continuationtoken", "marker")
+OFFSET_PARAMS = ("offset", "skip")
+PAGE_PARAMS = ("page", "pagenumber", "pageno")
+SIZE_PARAMS = ("limit", "pagesize", "perpage", "size", "count", "maxresults", "top")
+NEXT_CURSOR_KEYS = (
+    "nextcursor", "nextpagetoken", "nexttoken", "next", "cursor", "after", "continuationtoken", "nextmarker", "marker",
+)
+ITEM_KEYS = ("data", "items", "results", "records", "entries", "values", "content")
+
+
+def _norm(name: str) -> str:
+    return re.sub(r"[^a-z0-9]", "", (name or "").lower())
+
+
+def _pick(names: List[str], candidates: tuple) -> Optional[str]:
+    """First name (in candidate priority order) whose normalized form is a candidate."""
+    by_norm = {_norm(n): n for n in names}
+    for candidate in candidates:
+        if candidate in by_norm:
+            return by_norm[candidate]
+    return None
+
+
+def _get(endpoint: Any, field: str) -> Any:
+    return endpoint[field] if isinstance(endpoint, dict) else getattr(endpoint, field)
+
+
+class PaginationDetector:
+    """
+    Recognises cursor, offset and page-number pagination on GET endpoints from
+    their query parameters and 2xx response schema. The result describes where
+    the items live and how to build the next request; generated SDKs use it
+    to emit lazy iter_* methods that prefetch the following page.
+    """
+
+    def __init__(self, builder: ModelBuilder):
+        self.builder = builder
+
+    def detect(self, endpoint: Any) -> Optional[Dict[str, Any]]:
+        if _get(endpoint, "method") != "GET":
+            return None
+        query = [p.get("name") for p in (_get(endpoint, "parameters") or {}).get("query", []) if p.get("name")]
+        if not query:
+            return None
+
+        schema = ModelBuilder.success_schema(_get(endpoint, "responses") or {})
+        if not isinstance(schema, dict):
+            return None
+        items_path, item_schema = self._items(schema)
+        if items_path is None:
+            return None
+
+        size_param = _pick(query, SIZE_PARAMS)
+        config: Dict[str, Any] = {"items": items_path, "size_param": size_param}
+        cursor_param = _pick(query, CURSOR_PARAMS)
+        offset_param = _pick(query, OFFSET_PARAMS)
+        page_param = _pick(query, PAGE_PARAMS)
+        if cursor_param:
+            next_path = self._next_cursor(schema)
+            if next_path is None:
+                return None
+            config.update(style="cursor", param=cursor_param, next=next_path)
+        elif offset_param:
+            config.update(style="offset", param=offset_param)
+        elif page_param:
+            config.update(style="page", param=page_param)
+        else:
+            return None
+
+        annotation, decode = self.builder.type_of(item_schema)
+        return {
+            "style": config["style"],
+            "config": config,
+            "config_literal": repr(config),
+            "item_annotation": annotation,
+            "item_decode": decode if decode != "{v}" else None,
+        }
+
+    @staticmethod
+    def _properties(schema: Dict[str, Any]) -> Dict[str, Any]:
+        if not isinstance(schema, dict):
+            return {}
+        return schema.get("properties") or {}
+
+    def _items(self, schema: Dict[str, Any]):
+        """(path to the item array inside a page, item schema), or (None, None)."""
+        if schema.get("type") == "array":
+            return [], schema.get("items")
+        arrays = {k: v for k, v in self._properties(schema).items() if isinstance(v, dict) and v.get("type") == "array"}
+        if not arrays:
+            return None, None
+        key = _pick(list(arrays), ITEM_KEYS) or next(iter(arrays))
+        return [key], arrays[key].get("items")
+
+    def _next_cursor(self, schema: Dict[str, Any]) -> Optional[List[str]]:
+        """Path to the next-page cursor: a top-level property or one level down (meta, links, ...)."""
+        properties = self._properties(schema)
+        scalar = [k for k, v in properties.items() if isinstance(v, dict) and v.get("type") != "array" and "properties" not in v]
+        key = _pick(scalar, NEXT_CURSOR_KEYS)
+        if key:
+            return [key]
+        for parent, value in properties.items():
+            key = _pick(list(self._properties(value)), NEXT_CURSOR_KEYS)
+            if key:
+                return [parent, key]
+        return None
+
+    def detect_all(self, endpoints: List[Any]) -> Dict[str, Dict[str, Any]]:
+        """'METHOD /path' -> pagination description, for paginated endpoints only."""
+        found = {}
+        for endpoint in endpoints:
+            pagination = self.detect(endpoint)
+            if pagination is not None:
+                found[f"{_get(endpoint, 'method')} {_get(endpoint, 'path')}"] = pagination
+        return found
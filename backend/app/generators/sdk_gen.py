@@ -1,23 +1,105 @@
+import os
+import json
+import hashlib
 import datetime
 import jinja2
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterator, List, Optional
 from ..parsers.openapi import NormalizedAPISpec
+from ..core.cache import LRUCache, ResultCache, get_fragment_cache
+from .model_gen import ModelBuilder, python_type
+from .pagination import PaginationDetector
+
+# Bump whenever template output changes; it is part of the result cache key.
+GENERATOR_VERSION = "1.3.0"
+
+# One client method per endpoint; shared by the single-file and packaged SDKs
+PYTHON_METHOD_TEMPLATE = """
+    {% set decoder = decoders.get(endpoint.method ~ " " ~ endpoint.path) %}
+    def {{ (endpoint.summary or (endpoint.method + endpoint.path)) | sanitize }}(
+        self,
+        {% if endpoint.parameters and endpoint.parameters.path %}
+        {% for p in endpoint.parameters.path %}
+        {{ p.name | sanitize }}: {{ p.type | py_type }},
+        {% endfor %}
+        {% endif %}
+        **kwargs
+    ) -> {% if decoder %}Union[Dict[str, Any], {{ decoder.annotation }}]{% else %}Dict[str, Any]{% endif %}:
+        \"\"\"
+        {{ endpoint.summary or endpoint.path }}
+        {{ endpoint.description }}
+        \"\"\"
+        path = "{{ endpoint.path }}"
+        {% if endpoint.parameters and endpoint.parameters.path %}
+        {% for p in endpoint.parameters.path %}
+        path = path.replace("{{ '{' + p.name + '}' }}", str({{ p.name | sanitize }}))
+        {% endfor %}
+        {% endif %}
+        
+        try:
+            response = self.client.request(
+                "{{ endpoint.method }}",
+                path,
+                params=kwargs.get("params"),
+                json=_encode(kwargs.get("json")),
+                headers=kwargs.get("headers")
+            )
+            response.raise_for_status()
+            {% if decoder %}
+            if self.models and not kwargs.get("raw"):
+                data = response.json()
+                return {{ decoder.decode | replace("{v}", "data") }}
+            {% endif %}
+            return response.json()
+        except httpx.HTTPStatusError as e:
+            raise {{ error_class }}(
+                message=str(e),
+                status_code=e.response.status_code,
+                response=e.response.json() if e.response.content else {}
+            )
+    {% set pagination = paginations.get(endpoint.method ~ " " ~ endpoint.path) %}
+    {% if pagination %}
+
+    def iter_{{ (endpoint.summary or (endpoint.method + endpoint.path)) | sanitize }}(
+        self,
+        {% if endpoint.parameters and endpoint.parameters.path %}
+        {% for p in endpoint.parameters.path %}
+        {{ p.name | sanitize }}: {{ p.type | py_type }},
+        {% endfor %}
+        {% endif %}
+        **kwargs
+    ) -> Iterator[{{ pagination.item_annotation }}]:
+        \"\"\"
+        Lazily iterates every item across pages ({{ pagination.style }} pagination).
+        The next page is fetched in the background while this one is consumed.
+        \"\"\"
+        params = dict(kwargs.pop("params", None) or {})
+        fetch = lambda page_params: self.{{ (endpoint.summary or (endpoint.method + endpoint.path)) | sanitize }}({% if endpoint.parameters and endpoint.parameters.path %}{% for p in endpoint.parameters.path %}{{ p.name | sanitize }}, {% endfor %}{% endif %}params=page_params, raw=True, **kwargs)
+        {% if pagination.item_decode %}
+        decode = (lambda x: {{ pagination.item_decode | replace("{v}", "x") }}) if self.models else None
+        {% else %}
+        decode = None
+        {% endif %}
+        return _iter_pages(fetch, params, {{ pagination.config_literal }}, decode)
+    {% endif %}
+    """
 
 PYTHON_SDK_TEMPLATE = """
 # Generated by Doc2SDK
 # API: {{ name }} v{{ version }}
 # Generated: {{ generated_at }}
 
-from typing import Optional, Dict, Any, List
+from __future__ import annotations
+from typing import Optional, Dict, Any, List, Union, Iterator, AsyncIterator, Callable, Awaitable
 from dataclasses import dataclass
 from enum import Enum
 import httpx
 import logging
-from tenacity import retry, stop_after_attempt, wait_exponential
 
 logger = logging.getLogger(__name__)
+{% include "python_models.py.j2" %}
+{% include "python_pagination.py.j2" %}
 
-class {{ name.replace(' ', '') }}APIError(Exception):
+class {{ error_class }}(Exception):
     \"\"\"Base exception for {{ name }} API errors\"\"\"
     def __init__(self, message: str, status_code: int, response: Dict):
         self.message = message
@@ -35,12 +117,15 @@ class {{ name.replace(' ', '') }}Client:
         api_key: str = None,
         base_url: str = "{{ base_url }}",
         timeout: int = 30,
-        max_retries: int = 3
+        max_retries: int = 3,
+        models: bool = False
     ):
         self.api_key = api_key
         self.base_url = base_url
         self.timeout = timeout
         self.max_retries = max_retries
+        # Decode responses into the generated model classes instead of dicts
+        self.models = models
         
         headers = {
             "Content-Type": "application/json",
@@ -51,6 +136,8 @@ class {{ name.replace(' ', '') }}Client:
             headers["Authorization"] = f"Bearer {api_key}"
             {% elif authentication.type == 'apiKey' %}
             headers["{{ authentication.name }}"] = api_key
+            {% else %}
+            pass
             {% endif %}
 
         self.client = httpx.Client(
@@ -59,53 +146,333 @@ class {{ name.replace(' ', '') }}Client:
             headers=headers
         )
 
-    {% for endpoint in endpoints %}
-    def {{ (endpoint.summary or (endpoint.method + endpoint.path)) | sanitize }}(
+    {% if fragments is defined %}{{ fragments | join }}{% else %}{% for endpoint in endpoints %}{% include "python_method.py.j2" %}{% endfor %}{% endif %}
+
+    def close(self):
+        self.client.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+"""
+
+# Async variant (language "python-async"): methods delegate to _request, which owns retries
+PYTHON_ASYNC_METHOD_TEMPLATE = """
+    {% set decoder = decoders.get(endpoint.method ~ " " ~ endpoint.path) %}
+    async def {{ (endpoint.summary or (endpoint.method + endpoint.path)) | sanitize }}(
         self,
         {% if endpoint.parameters and endpoint.parameters.path %}
         {% for p in endpoint.parameters.path %}
-        {{ p.name | sanitize }}: {{ p.type }},
+        {{ p.name | sanitize }}: {{ p.type | py_type }},
         {% endfor %}
         {% endif %}
         **kwargs
-    ) -> Dict[str, Any]:
+    ) -> {% if decoder %}Union[Dict[str, Any], {{ decoder.annotation }}]{% else %}Dict[str, Any]{% endif %}:
         \"\"\"
         {{ endpoint.summary or endpoint.path }}
         {{ endpoint.description }}
         \"\"\"
-        path = f"{{ endpoint.path }}"
+        path = "{{ endpoint.path }}"
         {% if endpoint.parameters and endpoint.parameters.path %}
         {% for p in endpoint.parameters.path %}
         path = path.replace("{{ '{' + p.name + '}' }}", str({{ p.name | sanitize }}))
         {% endfor %}
         {% endif %}
-        
+        {% if decoder %}
+        data = await self._request("{{ endpoint.method }}", path, **kwargs)
+        if self.models and not kwargs.get("raw"):
+            return {{ decoder.decode | replace("{v}", "data") }}
+        return data
+        {% else %}
+        return await self._request("{{ endpoint.method }}", path, **kwargs)
+        {% endif %}
+    {% set pagination = paginations.get(endpoint.method ~ " " ~ endpoint.path) %}
+    {% if pagination %}
+
+    def iter_{{ (endpoint.summary or (endpoint.method + endpoint.path)) | sanitize }}(
+        self,
+        {% if endpoint.parameters and endpoint.parameters.path %}
+        {% for p in endpoint.parameters.path %}
+        {{ p.name | sanitize }}: {{ p.type | py_type }},
+        {% endfor %}
+        {% endif %}
+        **kwargs
+    ) -> AsyncIterator[{{ pagination.item_annotation }}]:
+        \"\"\"
+        Lazily iterates every item across pages ({{ pagination.style }} pagination):
+        `async for item in client.iter_...()`. The next page request is already
+        in flight while this one is consumed.
+        \"\"\"
+        params = dict(kwargs.pop("params", None) or {})
+        fetch = lambda page_params: self.{{ (endpoint.summary or (endpoint.method + endpoint.path)) | sanitize }}({% if endpoint.parameters and endpoint.parameters.path %}{% for p in endpoint.parameters.path %}{{ p.name | sanitize }}, {% endfor %}{% endif %}params=page_params, raw=True, **kwargs)
+        {% if pagination.item_decode %}
+        decode = (lambda x: {{ pagination.item_decode | replace("{v}", "x") }}) if self.models else None
+        {% else %}
+        decode = None
+        {% endif %}
+        return _aiter_pages(fetch, params, {{ pagination.config_literal }}, decode)
+    {% endif %}
+    """
+
+PYTHON_ASYNC_SDK_TEMPLATE = """
+# Generated by Doc2SDK
+# API: {{ name }} v{{ version }}
+# Generated: {{ generated_at }}
+
+from __future__ import annotations
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, Iterator, List, Optional, Union
+import asyncio
+import httpx
+import logging
+from tenacity import AsyncRetrying, retry_if_exception, stop_after_attempt, wait_exponential
+
+logger = logging.getLogger(__name__)
+{% include "python_models.py.j2" %}
+{% include "python_pagination.py.j2" %}
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+def _is_retryable(exc: BaseException) -> bool:
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code in RETRY_STATUS_CODES
+    return isinstance(exc, httpx.TransportError)
+
+class {{ error_class }}(Exception):
+    \"\"\"Base exception for {{ name }} API errors\"\"\"
+    def __init__(self, message: str, status_code: int, response: Dict):
+        self.message = message
+        self.status_code = status_code
+        self.response = response
+        super().__init__(self.message)
+
+class {{ name.replace(' ', '') }}AsyncClient:
+    \"\"\"
+    {{ name }} async API Client. One instance holds one connection pool;
+    share it across tasks instead of creating a client per call.
+    \"\"\"
+
+    def __init__(
+        self,
+        api_key: str = None,
+        base_url: str = "{{ base_url }}",
+        timeout: int = 30,
+        max_retries: int = 3,
+        retry_backoff: float = 0.5,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        http2: bool = False,
+        models: bool = False
+    ):
+        self.api_key = api_key
+        self.base_url = base_url
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        # Decode responses into the generated model classes instead of dicts
+        self.models = models
+
+        headers = {
+            "Content-Type": "application/json",
+            "User-Agent": "Doc2SDK-SDK/1.0"
+        }
+        if api_key:
+            {% if authentication.type == 'bearer' %}
+            headers["Authorization"] = f"Bearer {api_key}"
+            {% elif authentication.type == 'apiKey' %}
+            headers["{{ authentication.name }}"] = api_key
+            {% else %}
+            pass
+            {% endif %}
+
+        self.client = httpx.AsyncClient(
+            base_url=base_url,
+            timeout=timeout,
+            headers=headers,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections
+            ),
+            http2=http2  # needs the h2 package
+        )
+
+    async def _request(self, method: str, path: str, **kwargs) -> Dict[str, Any]:
+        # Transport errors and 429/5xx are retried with exponential backoff
+        retrying = AsyncRetrying(
+            stop=stop_after_attempt(self.max_retries + 1),
+            wait=wait_exponential(multiplier=self.retry_backoff, max=10),
+            retry=retry_if_exception(_is_retryable),
+            reraise=True
+        )
         try:
-            response = self.client.request(
-                "{{ endpoint.method }}",
-                path,
-                params=kwargs.get("params"),
-                json=kwargs.get("json"),
-                headers=kwargs.get("headers")
-            )
-            response.raise_for_status()
-            return response.json()
+            async for attempt in retrying:
+                with attempt:
+                    response = await self.client.request(
+                        method,
+                        path,
+                        params=kwargs.get("params"),
+                        json=_encode(kwargs.get("json")),
+                        headers=kwargs.get("headers")
+                    )
+                    response.raise_for_status()
         except httpx.HTTPStatusError as e:
-            raise {{ name | sanitize }}APIError(
+            raise {{ error_class }}(
                 message=str(e),
                 status_code=e.response.status_code,
                 response=e.response.json() if e.response.content else {}
             )
-    {% endfor %}
+        return response.json() if response.content else {}
 
-    def close(self):
-        self.client.close()
+    async def gather(
+        self,
+        method: Callable[..., Awaitable[Any]],
+        calls: Iterable[Dict[str, Any]],
+        concurrency: int = 10,
+        return_exceptions: bool = False
+    ) -> List[Any]:
+        \"\"\"
+        Calls one endpoint method once per kwargs dict in `calls`, at most
+        `concurrency` at a time. Results keep the order of `calls`.
 
-    def __enter__(self):
+            pets = await client.gather(client.get_pet, [{"id": i} for i in ids], concurrency=50)
+        \"\"\"
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def call(kwargs: Dict[str, Any]) -> Any:
+            async with semaphore:
+                return await method(**kwargs)
+
+        return await asyncio.gather(*(call(kwargs) for kwargs in calls), return_exceptions=return_exceptions)
+
+    {% if fragments is defined %}{{ fragments | join }}{% else %}{% for endpoint in endpoints %}{% include "python_async_method.py.j2" %}{% endfor %}{% endif %}
+
+    async def aclose(self):
+        await self.client.aclose()
+
+    async def __aenter__(self):
         return self
 
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        self.close()
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+"""
+
+TYPESCRIPT_METHOD_TEMPLATE = """
+    /**
+     * {{ endpoint.summary or endpoint.path }}
+     * {{ endpoint.description }}
+     */
+    async {{ (endpoint.summary or (endpoint.method + endpoint.path)) | sanitize_ts }}(
+        {% if endpoint.parameters and endpoint.parameters.path %}
+        {% for p in endpoint.parameters.path %}
+        {{ p.name | sanitize }}: any,
+        {% endfor %}
+        {% endif %}
+        data?: any,
+        params?: any
+    ): Promise<any> {
+        let path = `{{ endpoint.path }}`;
+        {% if endpoint.parameters and endpoint.parameters.path %}
+        {% for p in endpoint.parameters.path %}
+        path = path.replace("{{ '{' + p.name + '}' }}", String({{ p.name | sanitize }}));
+        {% endfor %}
+        {% endif %}
+
+        try {
+            const response = await this.client.request({
+                method: '{{ endpoint.method }}',
+                url: path,
+                data,
+                params
+            });
+            return response.data;
+        } catch (error) {
+            const axiosError = error as AxiosError;
+            throw new {{ name | sanitize }}APIError(
+                axiosError.message,
+                axiosError.response?.status,
+                axiosError.response?.data
+            );
+        }
+    }
+    {% set pagination = paginations.get(endpoint.method ~ " " ~ endpoint.path) %}
+    {% if pagination %}
+
+    /**
+     * Lazily iterates every item across pages ({{ pagination.style }} pagination):
+     * `for await (const item of client.{{ ('iter ' ~ (endpoint.summary or (endpoint.method + endpoint.path))) | sanitize_ts }}())`.
+     * The next page request is already in flight while this one is consumed.
+     */
+    async *{{ ('iter ' ~ (endpoint.summary or (endpoint.method + endpoint.path))) | sanitize_ts }}(
+        {% if endpoint.parameters and endpoint.parameters.path %}
+        {% for p in endpoint.parameters.path %}
+        {{ p.name | sanitize }}: any,
+        {% endfor %}
+        {% endif %}
+        params: Record<string, any> = {}
+    ): AsyncGenerator<any> {
+        const fetch = (pageParams: Record<string, any>) => this.{{ (endpoint.summary or (endpoint.method + endpoint.path)) | sanitize_ts }}({% if endpoint.parameters and endpoint.parameters.path %}{% for p in endpoint.parameters.path %}{{ p.name | sanitize }}, {% endfor %}{% endif %}undefined, pageParams);
+        yield* iterPages(fetch, { ...params }, {{ pagination.config | tojson }});
+    }
+    {% endif %}
+    """
+
+TYPESCRIPT_PAGINATION_TEMPLATE = """
+export interface Pagination {
+    style: 'cursor' | 'offset' | 'page';
+    param: string;
+    items: string[];
+    next?: string[];
+    size_param?: string | null;
+}
+
+function dig(data: any, keys: string[]): any {
+    for (const key of keys) {
+        if (data === null || typeof data !== 'object') return undefined;
+        data = data[key];
+    }
+    return data;
+}
+
+function nextPageParams(page: any, items: any[], params: Record<string, any>, pagination: Pagination): Record<string, any> | null {
+    if (!items.length) return null;
+    const param = pagination.param;
+    if (pagination.style === 'cursor') {
+        let cursor = dig(page, pagination.next || []);
+        if (typeof cursor === 'string' && /^(https?:\\/\\/|\\/)/.test(cursor)) {
+            // Some APIs return the next page as a link; take the cursor out of it
+            cursor = new URL(cursor, 'http://localhost').searchParams.get(param);
+        }
+        return cursor ? { ...params, [param]: cursor } : null;
+    }
+    const size = pagination.size_param ? params[pagination.size_param] : undefined;
+    if (size && items.length < Number(size)) return null;
+    if (pagination.style === 'offset') {
+        return { ...params, [param]: Number(params[param] || 0) + items.length };
+    }
+    return { ...params, [param]: Number(params[param] || 1) + 1 };
+}
+
+/** Yields items page by page; the next page is requested before this one is handed out. */
+export async function* iterPages(
+    fetch: (params: Record<string, any>) => Promise<any>,
+    params: Record<string, any>,
+    pagination: Pagination
+): AsyncGenerator<any> {
+    let next: Promise<any> | null = fetch(params);
+    try {
+        while (next) {
+            const page = await next;
+            const items: any[] = dig(page, pagination.items) || [];
+            const nextParams = nextPageParams(page, items, params, pagination);
+            next = nextParams ? fetch(nextParams) : null;
+            if (nextParams) params = nextParams;
+            yield* items;
+        }
+    } finally {
+        // Consumer stopped early: don't leave an unhandled rejection behind
+        next?.catch(() => undefined);
+    }
+}
 """
 
 TYPESCRIPT_SDK_TEMPLATE = """
@@ -116,7 +483,7 @@ TYPESCRIPT_SDK_TEMPLATE = """
  */
 
 import axios, { AxiosInstance, AxiosError } from 'axios';
-
+{% include "typescript_pagination.ts.j2" %}
 export class {{ name | sanitize }}APIError extends Error {
     constructor(
         public message: string,
@@ -164,45 +531,7 @@ export class {{ name | sanitize }}Client {
         });
     }
 
-    {% for endpoint in endpoints %}
-    /**
-     * {{ endpoint.summary or endpoint.path }}
-     * {{ endpoint.description }}
-     */
-    async {{ (endpoint.summary or (endpoint.method + endpoint.path)) | sanitize_ts }}(
-        {% if endpoint.parameters and endpoint.parameters.path %}
-        {% for p in endpoint.parameters.path %}
-        {{ p.name | sanitize }}: any,
-        {% endfor %}
-        {% endif %}
-        data?: any,
-        params?: any
-    ): Promise<any> {
-        let path = `{{ endpoint.path }}`;
-        {% if endpoint.parameters and endpoint.parameters.path %}
-        {% for p in endpoint.parameters.path %}
-        path = path.replace("{{ '{' + p.name + '}' }}", String({{ p.name | sanitize }}));
-        {% endfor %}
-        {% endif %}
-
-        try {
-            const response = await this.client.request({
-                method: '{{ endpoint.method }}',
-                url: path,
-                data,
-                params
-            });
-            return response.data;
-        } catch (error) {
-            const axiosError = error as AxiosError;
-            throw new {{ name | sanitize }}APIError(
-                axiosError.message,
-                axiosError.response?.status,
-                axiosError.response?.data
-            );
-        }
-    }
-    {% endfor %}
+    {% if fragments is defined %}{{ fragments | join }}{% else %}{% for endpoint in endpoints %}{% include "typescript_method.ts.j2" %}{% endfor %}{% endif %}
 }
 """
 
@@ -230,28 +559,587 @@ def sanitize_camel_case(text: str) -> str:
         return parts[0]
     return parts[0] + ''.join(p.capitalize() for p in parts[1:])
 
+# Model classes generated from the spec's component schemas; shared by every Python SDK layout
+PYTHON_MODELS_TEMPLATE = """
+import sys
+from dataclasses import dataclass
+
+# Slotted dataclasses (Python 3.10+) drop the per-instance __dict__
+_DATACLASS_OPTIONS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+def _encode(value: Any) -> Any:
+    \"\"\"Turns model instances (and lists/dicts of them) back into JSON-ready data.\"\"\"
+    if hasattr(value, "to_dict"):
+        return value.to_dict()
+    if isinstance(value, list):
+        return [_encode(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _encode(v) for k, v in value.items()}
+    return value
+{% for model in models %}
+
+@dataclass(**_DATACLASS_OPTIONS)
+class {{ model.name }}:
+    \"\"\"{{ model.description or model.schema_name }}\"\"\"
+    {% for f in model.fields %}
+    {{ f.attr }}: {% if f.required %}{{ f.annotation }}{% else %}Optional[{{ f.annotation }}] = None{% endif %}
+    {% endfor %}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> {{ model.name }}:
+        return cls(
+            {% for f in model.fields %}
+            {{ f.attr }}={{ f.decode }},
+            {% endfor %}
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {
+            {% for f in model.fields %}
+            {{ f.key_literal }}: _encode(self.{{ f.attr }}),
+            {% endfor %}
+        }
+        return {k: v for k, v in data.items() if v is not None}
+{% endfor %}
+"""
+
+PYTHON_PACKAGE_MODELS_TEMPLATE = """
+# Generated by Doc2SDK
+# API: {{ name }} v{{ version }}
+
+from __future__ import annotations
+from typing import Optional, Dict, Any, List
+{% include "python_models.py.j2" %}
+"""
+
+# Runtime helpers behind the generated iter_* methods (see app/generators/pagination.py)
+PYTHON_PAGINATION_TEMPLATE = """
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+def _dig(data: Any, keys: List[str]) -> Any:
+    for key in keys:
+        if not isinstance(data, dict):
+            return None
+        data = data.get(key)
+    return data
+
+def _next_page_params(page: Any, items: List[Any], params: Dict[str, Any], pagination: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    \"\"\"Query params for the page after `page`, or None when it was the last one.\"\"\"
+    if not items:
+        return None
+    param = pagination["param"]
+    if pagination["style"] == "cursor":
+        cursor = _dig(page, pagination["next"])
+        if isinstance(cursor, str) and cursor.startswith(("http://", "https://", "/")):
+            # Some APIs return the next page as a link; take the cursor out of it
+            cursor = (parse_qs(urlsplit(cursor).query).get(param) or [None])[0]
+        return {**params, param: cursor} if cursor else None
+    size = params.get(pagination["size_param"]) if pagination["size_param"] else None
+    if size and len(items) < int(size):
+        return None
+    if pagination["style"] == "offset":
+        return {**params, param: int(params.get(param) or 0) + len(items)}
+    return {**params, param: int(params.get(param) or 1) + 1}
+
+def _iter_pages(fetch: Callable[[Dict[str, Any]], Any], params: Dict[str, Any], pagination: Dict[str, Any], decode: Optional[Callable[[Any], Any]] = None) -> Iterator[Any]:
+    \"\"\"Yields items page by page; only the current and the prefetched page are held in memory.\"\"\"
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        future = pool.submit(fetch, params)
+        while future is not None:
+            page = future.result()
+            items = _dig(page, pagination["items"]) or []
+            params = _next_page_params(page, items, params, pagination)
+            # Request the next page before handing out this one
+            future = pool.submit(fetch, params) if params is not None else None
+            for item in items:
+                yield decode(item) if decode else item
+            page = items = None
+
+async def _aiter_pages(fetch: Callable[[Dict[str, Any]], Awaitable[Any]], params: Dict[str, Any], pagination: Dict[str, Any], decode: Optional[Callable[[Any], Any]] = None) -> AsyncIterator[Any]:
+    \"\"\"Async counterpart of _iter_pages; the next page is an in-flight task.\"\"\"
+    import asyncio
+    task = asyncio.ensure_future(fetch(params))
+    try:
+        while task is not None:
+            page = await task
+            items = _dig(page, pagination["items"]) or []
+            params = _next_page_params(page, items, params, pagination)
+            task = asyncio.ensure_future(fetch(params)) if params is not None else None
+            for item in items:
+                yield decode(item) if decode else item
+            page = items = None
+    finally:
+        if task is not None and not task.done():
+            task.cancel()
+"""
+
+# --- Packaged (multi-file) SDK templates: one module per tag, loaded lazily ---
+
+PYTHON_PACKAGE_BASE_TEMPLATE = """
+# Generated by Doc2SDK
+# API: {{ name }} v{{ version }}
+
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Optional
+import httpx
+{% include "python_pagination.py.j2" %}
+
+class {{ error_class }}(Exception):
+    \"\"\"Base exception for {{ name }} API errors\"\"\"
+    def __init__(self, message: str, status_code: int, response: Dict):
+        self.message = message
+        self.status_code = status_code
+        self.response = response
+        super().__init__(self.message)
+
+class BaseResource:
+    def __init__(self, client: httpx.Client, models: bool = False):
+        self.client = client
+        self.models = models
+"""
+
+PYTHON_PACKAGE_RESOURCE_TEMPLATE = """
+# Generated by Doc2SDK
+# API: {{ name }} v{{ version }} ({{ tag }} endpoints)
+
+from __future__ import annotations
+from typing import Optional, Dict, Any, List, Union, Iterator
+import httpx
+from .._base import BaseResource, {{ error_class }}, _iter_pages
+from ..models import *
+from ..models import _encode
+
+class {{ resource_class }}(BaseResource):
+    \"\"\"{{ tag }} endpoints\"\"\"
+    {% for endpoint in endpoints %}{% include "python_method.py.j2" %}{% endfor %}
+"""
+
+PYTHON_PACKAGE_CLIENT_TEMPLATE = """
+# Generated by Doc2SDK
+# API: {{ name }} v{{ version }}
+# Generated: {{ generated_at }}
+
+import importlib
+import httpx
+from ._base import {{ error_class }}
+
+# attribute -> (module under .resources, class); modules are imported on first access
+_RESOURCES = {
+{% for r in resources %}    "{{ r.attr }}": ("{{ r.module }}", "{{ r.class_name }}"),
+{% endfor %}}
+
+class {{ client_class }}:
+    \"\"\"
+    {{ name }} API Client. Resources ({{ resources | map(attribute='attr') | join(', ') }})
+    are loaded lazily, so importing the SDK stays fast for large APIs.
+    \"\"\"
+
+    def __init__(
+        self,
+        api_key: str = None,
+        base_url: str = "{{ base_url }}",
+        timeout: int = 30,
+        models: bool = False
+    ):
+        self.api_key = api_key
+        self.base_url = base_url
+        self.timeout = timeout
+        # Decode responses into the classes in .models instead of dicts
+        self.models = models
+
+        headers = {
+            "Content-Type": "application/json",
+            "User-Agent": "Doc2SDK-SDK/1.0"
+        }
+        if api_key:
+            {% if authentication.type == 'bearer' %}
+            headers["Authorization"] = f"Bearer {api_key}"
+            {% elif authentication.type == 'apiKey' %}
+            headers["{{ authentication.name }}"] = api_key
+            {% else %}
+            pass
+            {% endif %}
+
+        self.client = httpx.Client(
+            base_url=base_url,
+            timeout=timeout,
+            headers=headers
+        )
+
+    def __getattr__(self, attr: str):
+        target = _RESOURCES.get(attr)
+        if target is None:
+            raise AttributeError(f"{type(self).__name__!r} has no attribute {attr!r}")
+        module = importlib.import_module(f"{__package__}.resources.{target[0]}")
+        resource = getattr(module, target[1])(self.client, self.models)
+        setattr(self, attr, resource)
+        return resource
+
+    def __dir__(self):
+        return list(super().__dir__()) + list(_RESOURCES)
+
+    def close(self):
+        self.client.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+"""
+
+PYTHON_PACKAGE_INIT_TEMPLATE = """
+# Generated by Doc2SDK
+# API: {{ name }} v{{ version }}
+
+from .client import {{ client_class }}
+from ._base import {{ error_class }}
+
+__all__ = ["{{ client_class }}", "{{ error_class }}"]
+"""
+
+PYTHON_PACKAGE_PYPROJECT_TEMPLATE = """
+[project]
+name = "{{ package_name | replace('_', '-') }}"
+version = "{{ version }}"
+description = "{{ name }} SDK generated by Doc2SDK"
+requires-python = ">=3.8"
+dependencies = ["httpx"]
+"""
+
+TYPESCRIPT_PACKAGE_BASE_TEMPLATE = """
+/**
+ * Generated by Doc2SDK
+ * API: {{ name }} v{{ version }}
+ */
+
+import { AxiosInstance } from 'axios';
+{% include "typescript_pagination.ts.j2" %}
+export class {{ name | sanitize }}APIError extends Error {
+    constructor(
+        public message: string,
+        public statusCode?: number,
+        public response?: any
+    ) {
+        super(message);
+        this.name = '{{ name | sanitize }}APIError';
+    }
+}
+
+export class BaseResource {
+    constructor(protected client: AxiosInstance) {}
+}
+"""
+
+TYPESCRIPT_PACKAGE_RESOURCE_TEMPLATE = """
+/**
+ * Generated by Doc2SDK
+ * API: {{ name }} v{{ version }} ({{ tag }} endpoints)
+ */
+
+import { AxiosError } from 'axios';
+import { BaseResource, {{ name | sanitize }}APIError, iterPages } from '../base';
+
+export class {{ resource_class }} extends BaseResource {
+    {% for endpoint in endpoints %}{% include "typescript_method.ts.j2" %}{% endfor %}
+}
+"""
+
+TYPESCRIPT_PACKAGE_INDEX_TEMPLATE = """
+/**
+ * Generated by Doc2SDK
+ * API: {{ name }} v{{ version }}
+ * Generated: {{ generated_at }}
+ */
+
+import axios, { AxiosInstance } from 'axios';
+{% for r in resources %}import { {{ r.class_name }} } from './resources/{{ r.module }}';
+{% endfor %}
+export { {{ name | sanitize }}APIError } from './base';
+
+export interface {{ name | sanitize }}Config {
+    apiKey?: string;
+    baseUrl?: string;
+    timeout?: number;
+}
+
+export class {{ name | sanitize }}Client {
+    private client: AxiosInstance;
+{% for r in resources %}    private _{{ r.attr }}?: {{ r.class_name }};
+{% endfor %}
+    constructor(config: {{ name | sanitize }}Config = {}) {
+        const {
+            apiKey,
+            baseUrl = "{{ base_url }}",
+            timeout = 30000
+        } = config;
+
+        const headers: Record<string, string> = {
+            'Content-Type': 'application/json',
+            'User-Agent': 'Doc2SDK-SDK/1.0'
+        };
+
+        if (apiKey) {
+            {% if authentication.type == 'bearer' %}
+            headers['Authorization'] = `Bearer ${apiKey}`;
+            {% elif authentication.type == 'apiKey' %}
+            headers['{{ authentication.name }}'] = apiKey;
+            {% endif %}
+        }
+
+        this.client = axios.create({
+            baseURL: baseUrl,
+            timeout,
+            headers
+        });
+    }
+{% for r in resources %}
+    /** {{ r.tag }} endpoints (created on first access) */
+    get {{ r.attr }}(): {{ r.class_name }} {
+        return (this._{{ r.attr }} ??= new {{ r.class_name }}(this.client));
+    }
+{% endfor %}}
+"""
+
+TYPESCRIPT_PACKAGE_JSON_TEMPLATE = """
+{
+  "name": "{{ package_name | replace('_', '-') }}",
+  "version": "{{ version }}",
+  "description": "{{ name }} SDK generated by Doc2SDK",
+  "main": "src/index.ts",
+  "dependencies": {
+    "axios": "^1.6.0"
+  }
+}
+"""
+
+TEMPLATES = {
+    "python_method.py.j2": PYTHON_METHOD_TEMPLATE,
+    "python_models.py.j2": PYTHON_MODELS_TEMPLATE,
+    "python_pagination.py.j2": PYTHON_PAGINATION_TEMPLATE,
+    "python_sdk.py.j2": PYTHON_SDK_TEMPLATE,
+    "python_async_method.py.j2": PYTHON_ASYNC_METHOD_TEMPLATE,
+    "python_async_sdk.py.j2": PYTHON_ASYNC_SDK_TEMPLATE,
+    "typescript_method.ts.j2": TYPESCRIPT_METHOD_TEMPLATE,
+    "typescript_pagination.ts.j2": TYPESCRIPT_PAGINATION_TEMPLATE,
+    "typescript_sdk.ts.j2": TYPESCRIPT_SDK_TEMPLATE,
+    "package/python/_base.py.j2": PYTHON_PACKAGE_BASE_TEMPLATE,
+    "package/python/resource.py.j2": PYTHON_PACKAGE_RESOURCE_TEMPLATE,
+    "package/python/client.py.j2": PYTHON_PACKAGE_CLIENT_TEMPLATE,
+    "package/python/models.py.j2": PYTHON_PACKAGE_MODELS_TEMPLATE,
+    "package/python/__init__.py.j2": PYTHON_PACKAGE_INIT_TEMPLATE,
+    "package/python/pyproject.toml.j2": PYTHON_PACKAGE_PYPROJECT_TEMPLATE,
+    "package/typescript/base.ts.j2": TYPESCRIPT_PACKAGE_BASE_TEMPLATE,
+    "package/typescript/resource.ts.j2": TYPESCRIPT_PACKAGE_RESOURCE_TEMPLATE,
+    "package/typescript/index.ts.j2": TYPESCRIPT_PACKAGE_INDEX_TEMPLATE,
+    "package/typescript/package.json.j2": TYPESCRIPT_PACKAGE_JSON_TEMPLATE,
+}
+
+LANGUAGE_TEMPLATES = {
+    "python": "python_sdk.py.j2",
+    "python-async": "python_async_sdk.py.j2",
+    "typescript": "typescript_sdk.ts.j2",
+    "ts": "typescript_sdk.ts.j2",
+}
+
+# Per-endpoint fragment template of each single-file SDK (incremental regeneration)
+METHOD_TEMPLATES = {
+    "python_sdk.py.j2": "python_method.py.j2",
+    "python_async_sdk.py.j2": "python_async_method.py.j2",
+    "typescript_sdk.ts.j2": "typescript_method.ts.j2",
+}
+
+
+def _digest(value: Any) -> str:
+    return hashlib.sha256(json.dumps(value, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def endpoint_id(endpoint: Any) -> str:
+    return f"{endpoint.method} {endpoint.path}"
+
+
+def endpoint_hash(endpoint: Any) -> str:
+    # model_dump_json is serialized in pydantic-core; a sorted json.dumps of model_dump() costs ~3x more
+    return hashlib.sha256(endpoint.model_dump_json().encode("utf-8")).hexdigest()
+
+
+def diff_manifests(previous: Dict[str, str], current: Dict[str, str]) -> Dict[str, Any]:
+    """Endpoint ids added / removed / changed between two {id: endpoint hash} manifests."""
+    return {
+        "added": sorted(k for k in current if k not in previous),
+        "removed": sorted(k for k in previous if k not in current),
+        "changed": sorted(k for k in current if k in previous and previous[k] != current[k]),
+        "unchanged": sum(1 for k in current if previous.get(k) == current[k]),
+    }
+
 class CodeGenerator:
-    def __init__(self):
-        self.env = jinja2.Environment()
+    def __init__(
+        self,
+        autoescape: bool = False,
+        trim_blocks: bool = False,
+        lstrip_blocks: bool = False,
+        bytecode_cache_dir: Optional[str] = None,
+        fragment_cache: Optional[ResultCache] = None,
+    ):
+        # Templates are compiled once per process and kept in the environment's cache;
+        # the bytecode cache lets new workers skip lexing/compiling entirely.
+        bytecode_cache_dir = bytecode_cache_dir or os.getenv("JINJA_BYTECODE_CACHE_DIR")
+        if bytecode_cache_dir:
+            os.makedirs(bytecode_cache_dir, exist_ok=True)
+        self.env = jinja2.Environment(
+            loader=jinja2.DictLoader(TEMPLATES),
+            bytecode_cache=jinja2.FileSystemBytecodeCache(bytecode_cache_dir),
+            autoescape=autoescape,
+            trim_blocks=trim_blocks,
+            lstrip_blocks=lstrip_blocks,
+            auto_reload=False,
+        )
         self.env.filters['sanitize'] = sanitize_identifier
         self.env.filters['sanitize_ts'] = sanitize_camel_case
+        self.env.filters['py_type'] = python_type
+        self._fragment_cache = fragment_cache
+        # Assembled SDKs by spec digest: regenerating an unchanged spec skips context building and rendering
+        self._assembled = LRUCache(max_entries=int(os.getenv("SDK_ASSEMBLED_CACHE_ENTRIES", 32)), max_bytes=256 * 1024 * 1024)
+        # Template source is part of every fragment key: editing a method template invalidates its fragments
+        self._template_versions = {name: _digest([GENERATOR_VERSION, TEMPLATES[name]]) for name in METHOD_TEMPLATES.values()}
 
-    def generate_sdk(self, spec: NormalizedAPISpec, language: str = "python") -> str:
-        if language.lower() == "python":
-            template = self.env.from_string(PYTHON_SDK_TEMPLATE)
-        elif language.lower() == "typescript" or language.lower() == "ts":
-            template = self.env.from_string(TYPESCRIPT_SDK_TEMPLATE)
-        else:
+    @property
+    def fragment_cache(self) -> ResultCache:
+        if self._fragment_cache is None:
+            self._fragment_cache = get_fragment_cache()
+        return self._fragment_cache
+
+    def precompile(self):
+        """Compiles every template up front (called from the app lifespan)."""
+        for name in TEMPLATES:
+            self.env.get_template(name)
+
+    def get_template(self, language: str) -> jinja2.Template:
+        name = LANGUAGE_TEMPLATES.get(language.lower())
+        if name is None:
             raise ValueError(f"Language {language} not supported")
+        return self.env.get_template(name)
 
-        return template.render(
+    @staticmethod
+    def schema_context(spec: NormalizedAPISpec) -> Dict[str, Any]:
+        """Model classes from component schemas, per-endpoint response decoders and pagination."""
+        client = spec.name.replace(' ', '')
+        builder = ModelBuilder(spec.schemas, reserved=(client + "Client", client + "AsyncClient", client + "APIError"))
+        return dict(
+            models=builder.models(),
+            decoders=builder.response_decoders(spec.endpoints),
+            paginations=PaginationDetector(builder).detect_all(spec.endpoints),
+        )
+
+    @classmethod
+    def _context(cls, spec: NormalizedAPISpec) -> Dict[str, Any]:
+        return dict(
             name=spec.name,
+            error_class=spec.name.replace(' ', '') + "APIError",
             version=spec.version,
             base_url=spec.base_url,
             authentication=spec.authentication,
             endpoints=spec.endpoints,
-            generated_at=datetime.datetime.utcnow().isoformat()
+            generated_at=datetime.datetime.utcnow().isoformat(),
+            **cls.schema_context(spec)
         )
 
+    def generate_sdk(self, spec: NormalizedAPISpec, language: str = "python") -> str:
+        template = self.get_template(language)
+        return template.render(**self._context(spec))
+
+    def generate_sdk_incremental(
+        self,
+        spec: NormalizedAPISpec,
+        language: str = "python",
+        previous: Optional[Dict[str, str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Same output as generate_sdk, assembled from per-endpoint method
+        fragments. A fragment is keyed by the endpoint's hash, its response
+        decoder / pagination, the method template version and the client
+        names, so after a spec change only the affected methods are
+        re-rendered. previous is the manifest of the last run ({endpoint id:
+        endpoint hash}); the result holds the new manifest and the
+        added / removed / changed endpoint ids.
+
+        Every call still hashes each endpoint (the manifest is what tells
+        changed from unchanged). A spec whose digest was assembled before is
+        served from memory. Otherwise the schema context (models, decoders,
+        pagination) is rebuilt and the file re-assembled, so the cost stays
+        linear in the endpoint count with a much smaller constant than a full
+        render.
+        """
+        template = self.get_template(language)
+        method_template = METHOD_TEMPLATES[template.name]
+        version = self._template_versions[method_template]
+        manifest = {endpoint_id(endpoint): endpoint_hash(endpoint) for endpoint in spec.endpoints}
+        header = spec.model_dump(exclude={"endpoints", "schemas"})
+        spec_digest = _digest([version, language.lower(), header, _digest(spec.schemas), list(manifest.items())])
+
+        assembled = self._assembled.get(spec_digest)
+        if assembled is not None:
+            return {
+                "code": assembled,
+                "manifest": manifest,
+                "changes": diff_manifests(previous or {}, manifest),
+                "rendered": 0,
+                "reused": len(spec.endpoints),
+            }
+
+        context = self._context(spec)
+        shared = {"name": context["name"], "error_class": context["error_class"]}
+        shared_digest = _digest(shared)
+
+        fragments: List[str] = []
+        rendered = 0
+        for endpoint in spec.endpoints:
+            key = endpoint_id(endpoint)
+            decoder = context["decoders"].get(key)
+            pagination = context["paginations"].get(key)
+            parts = [version, shared_digest, manifest[key], _digest(decoder) if decoder else "", _digest(pagination) if pagination else ""]
+            cache_key = "fragment:" + hashlib.sha256(":".join(parts).encode("utf-8")).hexdigest()
+            cached = self.fragment_cache.get(cache_key)
+            if cached is None:
+                code = self.env.get_template(method_template).render(
+                    endpoint=endpoint,
+                    decoders={key: decoder} if decoder else {},
+                    paginations={key: pagination} if pagination else {},
+                    **shared
+                )
+                self.fragment_cache.set(cache_key, {"code": code})
+                rendered += 1
+            else:
+                code = cached["code"]
+            fragments.append(code)
+
+        code = template.render(fragments=fragments, **context)
+        self._assembled.set(spec_digest, code, size=len(code))
+        return {
+            "code": code,
+            "manifest": manifest,
+            "changes": diff_manifests(previous or {}, manifest),
+            "rendered": rendered,
+            "reused": len(fragments) - rendered,
+        }
+
+    def generate_sdk_stream(self, spec: NormalizedAPISpec, language: str = "python", chunk_size: int = 16 * 1024) -> Iterator[str]:
+        """
+        Renders incrementally with template.generate(), yielding ~chunk_size
+        pieces so the full SDK source never has to exist as one string.
+        """
+        template = self.get_template(language)
+        buffer: List[str] = []
+        buffered = 0
+        for piece in template.generate(**self._context(spec)):
+            buffer.append(piece)
+            buffered += len(piece)
+            if buffered >= chunk_size:
+                yield "".join(buffer)
+                buffer = []
+                buffered = 0
+        if buffer:
+            yield "".join(buffer)
+
     def generate_python_sdk(self, spec: NormalizedAPISpec) -> str:
         return self.generate_sdk(spec, "python")
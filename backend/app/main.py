@@ -2,14 +2,37 @@ from dotenv import load_dotenv
 import os
 load_dotenv()
 
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from .core.http import HTTPClientRegistry
 from .routers import unified
+from .generators.package_gen import shutdown_render_pool
+from .services.model_resolver import get_model_resolver
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Pooled outbound HTTP clients shared by the scraper and the playground
+    app.state.http_clients = HTTPClientRegistry.from_env()
+    # Compile SDK templates before the first request instead of on it
+    unified.code_generator.precompile()
+    # Resolve the Gemini model in the background: startup doesn't wait on the network
+    warmup = asyncio.ensure_future(get_model_resolver().ensure())
+    yield
+    warmup.cancel()
+    try:
+        await warmup
+    except asyncio.CancelledError:
+        pass
+    await app.state.http_clients.aclose()
+    shutdown_render_pool()
 
 app = FastAPI(
     title="Doc2SDK MVP API",
     description="AI-Powered API-to-SDK generator (Stateless)",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS configuration
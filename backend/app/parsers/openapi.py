@@ -1,7 +1,17 @@
+import io
+import os
 import json
 import yaml
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterator, List, Optional, Tuple, Union
 from pydantic import BaseModel
+from .refs import SchemaGraph
+
+try:
+    import ijson
+except ImportError:  # optional: without it JSON specs are loaded in one piece
+    ijson = None
+
+HTTP_METHODS = ["GET", "POST", "PUT", "DELETE", "PATCH", "OPTIONS", "HEAD"]
 
 class APIEndpointSchema(BaseModel):
     method: str
@@ -20,26 +30,96 @@ class NormalizedAPISpec(BaseModel):
     description: str = ""
     authentication: Dict[str, Any] = {}
     endpoints: List[APIEndpointSchema] = []
+    # Named component schemas (refs kept intact) for model generation
+    schemas: Dict[str, Any] = {}
 
 class OpenAPIParser:
-    def parse(self, raw_content: str) -> NormalizedAPISpec:
+    def parse(self, raw_content: Union[str, bytes], base_dir: Optional[str] = None) -> NormalizedAPISpec:
+        """
+        Parses OpenAPI/Swagger specification (JSON or YAML).
+        base_dir enables relative-file $refs (e.g. "common.yaml#/Pet").
         """
-        Parses OpenAPI/Swagger specification (JSON or YAML)
+        header, path_items = self._load(raw_content)
+        normalized = self._parse_header(header)
+        graph = SchemaGraph(header, base_dir=base_dir)
+        normalized.schemas = graph.schemas
+        for endpoint in self._iter_endpoints(header, path_items, graph):
+            normalized.endpoints.append(endpoint)
+        return normalized
+
+    def parse_file(self, path: str) -> NormalizedAPISpec:
+        with open(path, "rb") as f:
+            return self.parse(f.read(), base_dir=os.path.dirname(os.path.abspath(path)))
+
+    def iter_endpoints(self, raw_content: Union[str, bytes], base_dir: Optional[str] = None) -> Iterator[APIEndpointSchema]:
         """
+        Yields endpoints one at a time. For JSON specs with ijson installed the
+        `paths` object is streamed, so the whole document is never held as a
+        dict; peak memory is bounded by the largest single path item.
+        """
+        header, path_items = self._load(raw_content)
+        self._validate(header)
+        yield from self._iter_endpoints(header, path_items, SchemaGraph(header, base_dir=base_dir))
+
+    def parse_header(self, raw_content: Union[str, bytes]) -> NormalizedAPISpec:
+        """Spec metadata (name, version, base URL, auth) without endpoints."""
+        header, _ = self._load(raw_content)
+        return self._parse_header(header)
+
+    def _load(self, raw_content: Union[str, bytes]) -> Tuple[Dict[str, Any], Iterator[Tuple[str, Dict[str, Any]]]]:
+        """Returns (everything except `paths`, iterator over (path, path_item))."""
+        data = raw_content.encode("utf-8") if isinstance(raw_content, str) else raw_content
+        if ijson is not None and data[:1024].lstrip()[:1] == b"{":
+            try:
+                header = self._stream_header(data)
+                return header, ijson.kvitems(io.BytesIO(data), "paths", use_float=True)
+            except ijson.JSONError:
+                pass
+
         try:
-            spec = json.loads(raw_content)
+            spec = json.loads(data)
         except json.JSONDecodeError:
             try:
-                spec = yaml.safe_load(raw_content)
+                spec = yaml.safe_load(data)
             except yaml.YAMLError:
                 raise ValueError("Invalid OpenAPI specification: must be JSON or YAML")
 
+        if not isinstance(spec, dict):
+            raise ValueError("Not a valid OpenAPI/Swagger specification")
+        paths = spec.pop("paths", None) or {}
+        return spec, iter(paths.items())
+
+    @staticmethod
+    def _stream_header(data: bytes) -> Dict[str, Any]:
+        """Builds every top-level member except `paths` from the event stream."""
+        header: Dict[str, Any] = {}
+        key = None
+        builder = None
+        for prefix, event, value in ijson.parse(io.BytesIO(data), use_float=True):
+            if prefix == "":
+                if event == "map_key" or event == "end_map":
+                    if builder is not None:
+                        header[key] = builder.value
+                    key = value
+                    builder = None if value == "paths" else ijson.ObjectBuilder()
+                elif event != "start_map":
+                    raise ValueError("Not a valid OpenAPI/Swagger specification")
+                continue
+            if builder is not None:
+                builder.event(event, value)
+        return header
+
+    @staticmethod
+    def _validate(spec: Dict[str, Any]):
         if not spec or "openapi" not in spec and "swagger" not in spec:
             raise ValueError("Not a valid OpenAPI/Swagger specification")
 
+    def _parse_header(self, spec: Dict[str, Any]) -> NormalizedAPISpec:
+        self._validate(spec)
+
         normalized = NormalizedAPISpec(
             name=spec.get("info", {}).get("title", "Unknown API"),
-            version=spec.get("info", {}).get("version", "1.0.0"),
+            version=str(spec.get("info", {}).get("version", "1.0.0")),
             description=spec.get("info", {}).get("description", ""),
         )
 
@@ -64,33 +144,42 @@ class OpenAPIParser:
                 "in": scheme.get("in"),
             }
 
-        # Endpoints
-        paths = spec.get("paths", {})
-        for path, methods in paths.items():
+        return normalized
+
+    def _iter_endpoints(
+        self,
+        spec: Dict[str, Any],
+        path_items: Iterator[Tuple[str, Dict[str, Any]]],
+        graph: SchemaGraph,
+    ) -> Iterator[APIEndpointSchema]:
+        # Swagger 2.0 uses a top-level `parameters` *definitions* object; only a list applies to every operation
+        shared_params = spec.get("parameters", [])
+        if not isinstance(shared_params, list):
+            shared_params = []
+
+        for path, methods in path_items:
             for method, details in methods.items():
-                if method.upper() not in ["GET", "POST", "PUT", "DELETE", "PATCH", "OPTIONS", "HEAD"]:
+                if method.upper() not in HTTP_METHODS:
                     continue
-                
+
                 endpoint = APIEndpointSchema(
                     method=method.upper(),
                     path=path,
                     summary=details.get("summary", ""),
                     description=details.get("description", ""),
                     tags=details.get("tags", []),
-                    responses=details.get("responses", {}),
+                    responses=graph.resolve(details.get("responses", {})),
                 )
-                
+
                 # Parameters
-                all_params = details.get("parameters", []) + spec.get("parameters", []) # This is a bit simplified
-                endpoint.parameters = self._parse_parameters(all_params)
-                
+                all_params = details.get("parameters", []) + shared_params # This is a bit simplified
+                endpoint.parameters = self._parse_parameters(graph.resolve(all_params))
+
                 # Request Body
                 if "requestBody" in details:
-                    endpoint.request_body = details["requestBody"]
-                
-                normalized.endpoints.append(endpoint)
+                    endpoint.request_body = graph.resolve(details["requestBody"])
 
-        return normalized
+                yield endpoint
 
     def _parse_parameters(self, params: List[Dict[str, Any]]) -> Dict[str, Any]:
         parsed = {"path": [], "query": [], "header": [], "cookie": []}
@@ -0,0 +1,119 @@
+import re
+from typing import Any, Dict, List, Tuple
+from urllib.parse import urlsplit
+
+_VARIABLE = re.compile(r"\{\{\s*([^}\s]+)\s*\}\}")
+
+
+def _text(value: Any) -> str:
+    if isinstance(value, dict):
+        return value.get("content", "") or ""
+    return value or ""
+
+
+def _substitute(value: str, variables: Dict[str, str]) -> str:
+    return _VARIABLE.sub(lambda m: variables.get(m.group(1), m.group(0)), value)
+
+
+def _split_url(url: Any, variables: Dict[str, str]) -> Tuple[str, str, List[Dict[str, Any]]]:
+    """(origin, path, query items) of a Postman request URL (string or object form)."""
+    if isinstance(url, str):
+        url = {"raw": url}
+    url = url or {}
+    query = [q for q in url.get("query") or [] if isinstance(q, dict) and q.get("key") and not q.get("disabled")]
+
+    if url.get("path") is not None:
+        segments = url["path"] if isinstance(url["path"], list) else str(url["path"]).strip("/").split("/")
+        path = "/" + "/".join(s if isinstance(s, str) else s.get("value", "") for s in segments)
+        host = url.get("host") or []
+        host = ".".join(host) if isinstance(host, list) else str(host)
+        protocol = url.get("protocol")
+        origin = _substitute(f"{protocol}://{host}" if protocol else host, variables)
+    else:
+        raw = _substitute(url.get("raw", "").split("?", 1)[0], variables)
+        parts = urlsplit(raw if "://" in raw else f"//{raw}")
+        origin = f"{parts.scheme}://{parts.netloc}" if parts.scheme else parts.netloc
+        path = parts.path or "/"
+
+    # :id and {{id}} path segments become OpenAPI {id} templates
+    path = re.sub(r"/:([A-Za-z_][\w-]*)", r"/{\1}", path)
+    path = _VARIABLE.sub(lambda m: "{" + m.group(1) + "}", path)
+    return origin, path, query
+
+
+def _walk(items: List[Dict[str, Any]], tags: List[str]):
+    for item in items or []:
+        if "request" in item:
+            yield item, tags
+        elif "item" in item:
+            yield from _walk(item["item"], tags + [item.get("name", "")])
+
+
+def postman_to_openapi(collection: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Converts a Postman collection (v2.0/v2.1, as served by Postman documenter
+    pages) to a minimal OpenAPI 3 document so it can go through OpenAPIParser.
+    Folders become tags; collection variables fill in the server URL.
+    """
+    collection = collection.get("collection", collection)
+    info = collection.get("info") or {}
+    variables = {v.get("key"): str(v.get("value", "")) for v in collection.get("variable") or [] if isinstance(v, dict) and v.get("key")}
+
+    paths: Dict[str, Dict[str, Any]] = {}
+    servers: List[str] = []
+    for item, tags in _walk(collection.get("item"), []):
+        request = item["request"]
+        if isinstance(request, str):
+            request = {"method": "GET", "url": request}
+        origin, path, query = _split_url(request.get("url"), variables)
+        if origin and origin not in servers:
+            servers.append(origin)
+
+        parameters = [
+            {"name": name, "in": "path", "required": True, "schema": {"type": "string"}}
+            for name in re.findall(r"\{([^}]+)\}", path)
+        ]
+        parameters += [
+            {"name": q["key"], "in": "query", "required": False, "schema": {"type": "string"}, "description": _text(q.get("description"))}
+            for q in query
+        ]
+        parameters += [
+            {"name": h["key"], "in": "header", "required": False, "schema": {"type": "string"}}
+            for h in request.get("header") or []
+            if isinstance(h, dict) and h.get("key") and not h.get("disabled") and h["key"].lower() not in ("content-type", "accept", "authorization")
+        ]
+
+        operation: Dict[str, Any] = {
+            "summary": item.get("name", ""),
+            "description": _text(request.get("description")),
+            "tags": [t for t in tags[:1] if t],
+            "parameters": parameters,
+            "responses": {"200": {"description": "Success"}},
+        }
+        body = request.get("body") or {}
+        if body.get("mode") == "raw" and body.get("raw"):
+            operation["requestBody"] = {"content": {"application/json": {"example": body["raw"]}}}
+
+        method = str(request.get("method", "GET")).lower()
+        paths.setdefault(path, {})[method] = operation
+
+    spec: Dict[str, Any] = {
+        "openapi": "3.0.0",
+        "info": {"title": info.get("name", "Postman Collection"), "version": str(info.get("version") or "1.0.0"), "description": _text(info.get("description"))},
+        "paths": paths,
+    }
+    if servers:
+        spec["servers"] = [{"url": url} for url in servers]
+    auth = (collection.get("auth") or {}).get("type")
+    if auth in ("bearer", "apikey", "basic"):
+        scheme = {"bearer": {"type": "http", "scheme": "bearer"}, "basic": {"type": "http", "scheme": "basic"}, "apikey": {"type": "apiKey", "in": "header", "name": "X-API-Key"}}[auth]
+        spec["components"] = {"securitySchemes": {auth: scheme}}
+    return spec
+
+
+def is_postman_collection(document: Any) -> bool:
+    if not isinstance(document, dict):
+        return False
+    collection = document.get("collection", document)
+    schema = (collection.get("info") or {}).get("schema", "") if isinstance(collection, dict) else ""
+    return "getpostman.com" in schema or ("info" in collection and "item" in collection and "_postman_id" in (collection.get("info") or {}))
@@ -0,0 +1,117 @@
+import os
+import json
+import yaml
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import unquote
+
+
+class RefResolutionError(ValueError):
+    pass
+
+
+def _decode_pointer(pointer: str) -> List[str]:
+    if not pointer or pointer == "/":
+        return []
+    if not pointer.startswith("/"):
+        raise RefResolutionError(f"Unsupported JSON pointer: {pointer}")
+    return [unquote(p).replace("~1", "/").replace("~0", "~") for p in pointer[1:].split("/")]
+
+
+class SchemaGraph:
+    """
+    Indexed view of a spec's reusable components with a memoized $ref
+    resolver. Built once per document: named schemas are looked up in O(1)
+    and every distinct $ref is resolved at most once, so specs with thousands
+    of shared schemas don't degrade into repeated recursive walks.
+
+    Cyclic references are left as {"$ref": ...} at the point where the cycle
+    closes. Relative-file refs ("common.yaml#/Pet") are loaded from base_dir
+    when one is given and never escape it; otherwise they are left as-is.
+    """
+
+    def __init__(self, document: Dict[str, Any], base_dir: Optional[str] = None):
+        self.document = document
+        self.base_dir = os.path.realpath(base_dir) if base_dir else None
+        components = document.get("components") or {}
+        # OpenAPI 3 keeps schemas under components; Swagger 2 under definitions
+        self.schemas: Dict[str, Any] = dict(components.get("schemas") or document.get("definitions") or {})
+        self._documents: Dict[str, Dict[str, Any]] = {"": document}
+        self._resolved: Dict[Tuple[str, str], Any] = {}
+        self._in_progress: set = set()
+
+    def get(self, name: str) -> Optional[Dict[str, Any]]:
+        return self.schemas.get(name)
+
+    @staticmethod
+    def ref_name(ref: str) -> str:
+        """'#/components/schemas/Pet' -> 'Pet'"""
+        return ref.rsplit("/", 1)[-1]
+
+    def _load_document(self, file_ref: str) -> Dict[str, Any]:
+        if file_ref in self._documents:
+            return self._documents[file_ref]
+        if self.base_dir is None:
+            raise RefResolutionError(f"External ref {file_ref} needs a base directory")
+        path = os.path.realpath(os.path.join(self.base_dir, file_ref))
+        if os.path.commonpath([path, self.base_dir]) != self.base_dir:
+            raise RefResolutionError(f"External ref {file_ref} escapes the spec directory")
+        with open(path, "rb") as f:
+            raw = f.read()
+        try:
+            doc = json.loads(raw)
+        except json.JSONDecodeError:
+            doc = yaml.safe_load(raw)
+        self._documents[file_ref] = doc
+        return doc
+
+    def lookup(self, ref: str, current_file: str = "") -> Tuple[Any, str, str]:
+        """Returns (raw target node, file it lives in, pointer) without resolving inside it."""
+        file_part, _, pointer = ref.partition("#")
+        file_ref = os.path.normpath(os.path.join(os.path.dirname(current_file), file_part)) if file_part else current_file
+        node: Any = self._load_document(file_ref)
+        for token in _decode_pointer(pointer):
+            if isinstance(node, list):
+                node = node[int(token)]
+            elif isinstance(node, dict) and token in node:
+                node = node[token]
+            else:
+                raise RefResolutionError(f"Unresolvable $ref: {ref}")
+        return node, file_ref, pointer
+
+    def resolve(self, node: Any, current_file: str = "") -> Any:
+        """Returns node with every resolvable $ref replaced by its (memoized) target."""
+        if isinstance(node, list):
+            return [self.resolve(item, current_file) for item in node]
+        if not isinstance(node, dict):
+            return node
+
+        ref = node.get("$ref")
+        if isinstance(ref, str):
+            return self._resolve_ref(ref, node, current_file)
+        return {k: self.resolve(v, current_file) for k, v in node.items()}
+
+    def _resolve_ref(self, ref: str, node: Dict[str, Any], current_file: str) -> Any:
+        try:
+            target, target_file, pointer = self.lookup(ref, current_file)
+        except (RefResolutionError, OSError, ValueError, IndexError) as e:
+            print(f"DEBUG: Leaving $ref unresolved ({str(e)})")
+            return node
+
+        key = (target_file, pointer)
+        if key in self._resolved:
+            return self._resolved[key]
+        if key in self._in_progress:
+            # Cycle: keep the pointer so consumers can refer to the type by name
+            return {"$ref": ref}
+
+        self._in_progress.add(key)
+        try:
+            resolved = self.resolve(target, target_file)
+        finally:
+            self._in_progress.discard(key)
+
+        if isinstance(resolved, dict) and ("/schemas/" in pointer or pointer.startswith("/definitions/")):
+            # Keep the component name so code generation can name the type
+            resolved = {**resolved, "x-schema-name": self.ref_name(pointer)}
+        self._resolved[key] = resolved
+        return resolved
@@ -1,69 +1,190 @@
-from fastapi import APIRouter, HTTPException
+import time
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from .. import schemas
 from ..services.scraper import ScraperService
-from ..services.llm_parser import LLMParserService
+from ..services.pipeline import get_pipeline
+from ..services.jobs import job_queue
 from ..services.translator import TranslationService
-from ..generators.sdk_gen import CodeGenerator
-from ..parsers.openapi import NormalizedAPISpec, OpenAPIParser
-import httpx
-from typing import Any
+from ..services.llm_client import cancel_on_disconnect
+from ..services.playground import get_playground_proxy, get_playground_recorder, upstream_url
+from ..services.load_test import BatchRunner
+from ..generators.package_gen import PackageGenerator
+from ..parsers.openapi import NormalizedAPISpec
+from ..core.http import HTTPClientRegistry, get_http_clients
+from ..core.streaming import event_stream_response
+from ..core.singleflight import build_single_flight
 
 router = APIRouter()
-parser_service = LLMParserService()
-code_generator = CodeGenerator()
+pipeline = get_pipeline()
+parser_service = pipeline.parser_service
+code_generator = pipeline.code_generator
+package_generator = PackageGenerator(code_generator)
 translator_service = TranslationService()
+result_cache = pipeline.result_cache
+# Identical concurrent /generate requests share one scrape + LLM call
+generate_flight = build_single_flight()
 
 @router.post("/generate", response_model=schemas.GenerateResponse)
-async def generate_sdk(request: schemas.GenerateRequest):
+async def generate_sdk(request: schemas.GenerateRequest, http_request: Request, clients: HTTPClientRegistry = Depends(get_http_clients)):
     try:
-        # 1. Scrape
-        cleaned_text = await ScraperService.scrape(request.source_url)
-        
-        spec_dict = {}
-        spec = None
-        
-        # 2. Parse
-        if cleaned_text.startswith("RAW_SPEC_JSON:"):
-            # Use deterministic parser for raw specs
-            raw_content = cleaned_text.replace("RAW_SPEC_JSON:\n", "", 1)
-            parser = OpenAPIParser()
-            # This returns a NormalizedAPISpec object directly
-            spec = parser.parse(raw_content)
-            # Add metadata
-            spec_dict = spec.dict()
-            spec_dict["source"] = "direct_openapi_parser"
-            spec_dict["is_mock"] = False
-        else:
-            # Use LLM for unstructured text
-            spec_dict = await parser_service.parse_docs(cleaned_text)
-            # Normalize for generator
-            spec = NormalizedAPISpec(**spec_dict)
-        
-        # 4. Generate Python SDK
-        sdk_code = code_generator.generate_python_sdk(spec)
-        
-        return schemas.GenerateResponse(
-            name=spec.name,
-            version=spec.version,
-            spec=spec_dict,
-            sdk_code=sdk_code,
-            is_mock=spec_dict.get("is_mock", False),
-            source=spec_dict.get("source")
-        )
+        key = pipeline.request_key(request)
+        # The shared run ignores any single client's disconnect; it is cancelled once every caller has left
+        shared = generate_flight.do(key, lambda: pipeline.generate(request, clients))
+        return await cancel_on_disconnect(http_request, shared)
     except Exception as e:
         print(f"Error during generation: {e}")
         import traceback
         traceback.print_exc()
         raise HTTPException(status_code=400, detail=str(e))
 
-@router.post("/playground/execute", response_model=schemas.ExecuteResponse)
-async def execute_api_call(request: schemas.ExecuteRequest):
-    async with httpx.AsyncClient() as client:
-        # Construct URL
-        url = request.base_url.rstrip("/") + "/" + request.path.lstrip("/")
-        
+@router.post("/generate/stream")
+async def generate_sdk_stream(
+    request: schemas.GenerateRequest,
+    http_request: Request,
+    format: str = "ndjson",
+    language: str = "python",
+    clients: HTTPClientRegistry = Depends(get_http_clients),
+):
+    """
+    Streams generation as NDJSON (or SSE with ?format=sse) events:
+    status -> spec (metadata) -> endpoint* -> sdk* (source chunks) -> done.
+    The SDK is rendered with template.generate(), so memory stays flat
+    regardless of spec size.
+    """
+    if format not in ("ndjson", "sse"):
+        raise HTTPException(status_code=400, detail=f"Unsupported stream format: {format}")
+    try:
+        code_generator.get_template(language)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    async def events():
+        yield {"type": "status", "stage": "fetching"}
         try:
-            response = await client.request(
+            if request.crawl:
+                yield {"type": "status", "stage": "crawling"}
+                spec, meta = await pipeline.crawl_spec(request, clients, http_request)
+            else:
+                fetched = await pipeline.fetch(request.source_url, clients)
+                cached = await result_cache.aget(pipeline.cache_key(fetched))
+                if cached is not None:
+                    spec = NormalizedAPISpec(**cached["spec"])
+                    meta = {"source": cached.get("source"), "is_mock": cached.get("is_mock", False)}
+                else:
+                    yield {"type": "status", "stage": "parsing"}
+                    spec, meta = await pipeline.parse_fetched(fetched, http_request)
+        except Exception as e:
+            print(f"Error during streaming generation: {e}")
+            yield {"type": "error", "detail": str(e)}
+            return
+
+        yield {"type": "spec", **spec.model_dump(exclude={"endpoints"}), **meta, "endpoint_count": len(spec.endpoints)}
+        for endpoint in spec.endpoints:
+            yield {"type": "endpoint", "endpoint": endpoint.model_dump()}
+
+        yield {"type": "status", "stage": "generating", "language": language}
+        for chunk in code_generator.generate_sdk_stream(spec, language):
+            yield {"type": "sdk", "chunk": chunk}
+            # Rendering is synchronous; give other requests a turn between chunks
+            await asyncio.sleep(0)
+        yield {"type": "done"}
+
+    return event_stream_response(events(), format)
+
+@router.post("/generate/package")
+async def generate_sdk_package(
+    request: schemas.GenerateRequest,
+    http_request: Request,
+    language: str = "python",
+    clients: HTTPClientRegistry = Depends(get_http_clients),
+):
+    """
+    Returns the SDK as a zip of an installable package with one module per
+    tag. Resource modules are loaded lazily by the generated client.
+    """
+    try:
+        spec = await pipeline.resolve_spec(request, clients, http_request)
+        # Rendering + zipping is CPU-bound; keep it off the event loop
+        archive = await asyncio.to_thread(package_generator.build_zip, spec, language)
+    except Exception as e:
+        print(f"Error during package generation: {e}")
+        raise HTTPException(status_code=400, detail=str(e))
+
+    filename = f"{package_generator.package_name(spec)}-{language.lower()}.zip"
+    return Response(
+        content=archive,
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+@router.post("/jobs", response_model=schemas.JobSubmitResponse, status_code=202)
+async def submit_generation_job(request: schemas.GenerateRequest):
+    """Queues scrape -> parse -> generate on the worker pool; poll /jobs/{job_id} for progress."""
+    try:
+        # Publishing to the broker is blocking I/O
+        return await asyncio.to_thread(job_queue.submit, request)
+    except Exception as e:
+        print(f"Error submitting generation job: {e}")
+        raise HTTPException(status_code=503, detail=f"Job queue unavailable: {str(e)}")
+
+async def _job_status(job_id: str):
+    status = await asyncio.to_thread(job_queue.status, job_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job: {job_id}")
+    return status
+
+@router.get("/jobs/{job_id}", response_model=schemas.JobStatusResponse)
+async def get_generation_job(job_id: str):
+    return await _job_status(job_id)
+
+@router.get("/jobs/{job_id}/result", response_model=schemas.GenerateResponse)
+async def get_generation_job_result(job_id: str):
+    status = await _job_status(job_id)
+    if status["state"] == "failed":
+        raise HTTPException(status_code=400, detail=status.get("error"))
+    result = await asyncio.to_thread(job_queue.result, job_id)
+    if result is None:
+        raise HTTPException(status_code=409, detail=f"Job is {status['state']} ({status['stage']})")
+    return result
+
+@router.get("/cache/stats")
+async def cache_stats():
+    return {
+        **result_cache.stats(),
+        "translations": translator_service.cache.stats(),
+        "coalescing": generate_flight.stats(),
+        "playground": get_playground_recorder().stats(),
+    }
+
+@router.post("/playground/execute", response_model=schemas.ExecuteResponse)
+async def execute_api_call(request: schemas.ExecuteRequest, http_request: Request, response: Response, clients: HTTPClientRegistry = Depends(get_http_clients)):
+    if request.stream:
+        # Pass-through: upstream status, headers and body chunks as they arrive
+        return await get_playground_proxy().forward(request, clients, translator_service if request.translate else None)
+
+    # Opt-in record/replay: identical calls are answered from the recording (the store is only built once used)
+    recorder = get_playground_recorder()
+    mode = recorder.mode(request)
+    key = recorder.key(request) if mode != "off" else None
+    if key is not None:
+        recorded = await recorder.lookup(key)
+        if recorded is not None:
+            # Stored as it was returned (already translated when translate is on)
+            response.headers["X-Playground-Cache"] = "HIT"
+            response.headers["X-Playground-Cache-Age"] = str(int(time.time() - recorded["recorded_at"]))
+            return schemas.ExecuteResponse(status_code=recorded["status_code"], response=recorded["data"])
+        if mode == "replay":
+            raise HTTPException(status_code=404, detail="No recorded response for this request (replay-only mode)")
+        response.headers["X-Playground-Cache"] = "MISS"
+
+    client = clients.get("playground")
+    # Construct URL
+    url = upstream_url(request)
+    
+    try:
+        async with clients.host_slot(url):
+            upstream = await client.request(
                 method=request.method,
                 url=url,
                 params=request.params,
@@ -71,18 +192,38 @@ async def execute_api_call(request: schemas.ExecuteRequest):
                 json=request.json_body,
                 timeout=30.0
             )
-            
-            # Identify if response is JSON
-            try:
-                raw_data = response.json()
-                # Translate data strings to English
-                data = await translator_service.translate_response(raw_data)
-            except:
-                data = response.text
-
-            return schemas.ExecuteResponse(
-                status_code=response.status_code,
-                response=data
-            )
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Request failed: {str(e)}")
+
+    # Identify if response is JSON
+    try:
+        data, is_json = upstream.json(), True
+    except ValueError:
+        data, is_json = upstream.text, False
+    recordable = True
+    if is_json and request.translate is not False:
+        # Translate data strings to English
+        try:
+            data = await cancel_on_disconnect(http_request, translator_service.translate_response(data))
         except Exception as e:
-            raise HTTPException(status_code=400, detail=f"Request failed: {str(e)}")
+            print(f"DEBUG: Playground translation failed, returning original: {str(e)}")
+            # The key says "translated"; recording the raw body would replay it as such
+            recordable = False
+    if key is not None and recordable:
+        await recorder.record(key, upstream.status_code, data, is_json)
+    return schemas.ExecuteResponse(status_code=upstream.status_code, response=data)
+
+@router.post("/playground/batch")
+async def execute_batch(request: schemas.BatchExecuteRequest, format: str = "ndjson", clients: HTTPClientRegistry = Depends(get_http_clients)):
+    """
+    Runs a request template over parameter sets (or count times) with a
+    worker pool and streams progress events, then a result event with
+    p50/p95/p99 latencies, a histogram, throughput and error breakdown.
+    """
+    if format not in ("ndjson", "sse"):
+        raise HTTPException(status_code=400, detail=f"Unsupported stream format: {format}")
+    try:
+        runner = BatchRunner(clients.get("playground-batch"), request)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return event_stream_response(runner.run(), format)
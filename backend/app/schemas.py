@@ -1,8 +1,18 @@
-from pydantic import BaseModel
+import os
+from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
 
+# Server-side ceilings for crawl mode; requests above them are rejected with 422
+CRAWL_MAX_PAGES = int(os.getenv("CRAWL_MAX_PAGES", 200))
+CRAWL_MAX_DEPTH = int(os.getenv("CRAWL_MAX_DEPTH", 5))
+
 class GenerateRequest(BaseModel):
     source_url: str
+    # Crawl mode: follow same-origin doc links under source_url
+    crawl: bool = False
+    max_pages: int = Field(25, ge=1, le=CRAWL_MAX_PAGES)
+    # 0 crawls only source_url itself
+    max_depth: int = Field(2, ge=0, le=CRAWL_MAX_DEPTH)
 
 class GenerateResponse(BaseModel):
     name: str
@@ -11,6 +21,20 @@ class GenerateResponse(BaseModel):
     sdk_code: str
     is_mock: bool = False
     source: Optional[str] = None
+    # Endpoints added / removed / changed since the last generation of the same request (URL + crawl options); None on the first
+    changes: Optional[Dict[str, Any]] = None
+
+class JobSubmitResponse(BaseModel):
+    job_id: str
+    # True when an identical job was already queued/running and this request joined it
+    deduplicated: bool = False
+
+class JobStatusResponse(BaseModel):
+    job_id: str
+    state: str  # queued | running | succeeded | failed
+    stage: str
+    progress: int = 0
+    error: Optional[str] = None
 
 class ExecuteRequest(BaseModel):
     base_url: str
@@ -19,7 +43,31 @@ class ExecuteRequest(BaseModel):
     params: Optional[Dict[str, Any]] = None
     headers: Optional[Dict[str, Any]] = None
     json_body: Optional[Dict[str, Any]] = None
+    # Pass the upstream response through as it arrives instead of wrapping it in ExecuteResponse
+    stream: bool = False
+    # Translate JSON bodies to English; defaults to on when buffered, off when streaming
+    translate: Optional[bool] = None
+    # Record/replay of upstream responses: off | record | replay (replay-only); default PLAYGROUND_RECORD_MODE
+    record_mode: Optional[str] = None
+    # Also record/replay non-idempotent methods (POST, PUT, PATCH, DELETE)
+    record_unsafe: bool = False
 
 class ExecuteResponse(BaseModel):
     status_code: int
     response: Any
+
+class ParameterSet(BaseModel):
+    # Values for {placeholders} in the template path
+    path_params: Dict[str, Any] = {}
+    # Merged over the template's params / headers; json_body replaces it
+    params: Optional[Dict[str, Any]] = None
+    headers: Optional[Dict[str, Any]] = None
+    json_body: Optional[Dict[str, Any]] = None
+
+class BatchExecuteRequest(BaseModel):
+    request: ExecuteRequest
+    # One request per set (cycled when count is larger); omitted -> the template as-is
+    parameter_sets: List[ParameterSet] = []
+    # Lower bounds here (422); BatchRunner enforces the PLAYGROUND_BATCH_* upper caps (400)
+    count: Optional[int] = Field(None, ge=1)
+    concurrency: int = Field(10, ge=1)
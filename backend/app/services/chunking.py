@@ -0,0 +1,143 @@
+import re
+from typing import Any, Dict, List, Tuple
+
+# Rough chars-per-token ratio for English docs; good enough for budgeting prompts
+CHARS_PER_TOKEN = 4
+
+_HEADING_RE = re.compile(r"^### .+ ###$", re.MULTILINE)
+# Boundaries tried, coarsest first, inside a section too large for one chunk:
+# paragraphs, then lines (plain get_text output has no blank lines), then words
+_BOUNDARIES = [r"(\n\s*\n)", r"(\n)", r"(\s+)"]
+
+
+def _split_sections(text: str) -> List[str]:
+    """Splits on `### heading ###` lines; without any, the whole text is one section."""
+    starts = [m.start() for m in _HEADING_RE.finditer(text)]
+    if not starts:
+        return [text]
+    if starts[0] != 0:
+        starts.insert(0, 0)
+    starts.append(len(text))
+    return [text[a:b] for a, b in zip(starts, starts[1:]) if text[a:b].strip()]
+
+
+def _split_oversized(section: str, max_chars: int, level: int = 0) -> List[str]:
+    """Packs the section's pieces at the coarsest boundary that fits; hard cuts only as a last resort."""
+    if level == len(_BOUNDARIES):
+        return [section[i:i + max_chars] for i in range(0, len(section), max_chars)]
+    pieces: List[str] = []
+    current = ""
+    for part in re.split(_BOUNDARIES[level], section):
+        if len(part) > max_chars:
+            if current:
+                pieces.append(current)
+                current = ""
+            pieces.extend(_split_oversized(part, max_chars, level + 1))
+        elif len(current) + len(part) > max_chars:
+            pieces.append(current)
+            current = part
+        else:
+            current += part
+    if current.strip():
+        pieces.append(current)
+    return pieces
+
+
+def split_into_chunks(text: str, max_tokens: int) -> List[str]:
+    """
+    Packs heading-delimited sections greedily into chunks of at most
+    max_tokens (estimated). Sections are only cut when a single one exceeds
+    the budget, and then on paragraph, line or word boundaries; text without
+    heading markers is packed the same way.
+    """
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    if len(text) <= max_chars:
+        return [text]
+
+    chunks: List[str] = []
+    current = ""
+    for section in _split_sections(text):
+        if len(section) > max_chars:
+            if current:
+                chunks.append(current)
+                current = ""
+            chunks.extend(_split_oversized(section, max_chars))
+        elif len(current) + len(section) > max_chars:
+            chunks.append(current)
+            current = section
+        else:
+            current += section
+    if current.strip():
+        chunks.append(current)
+    return chunks
+
+
+def _endpoint_key(endpoint: Dict[str, Any]) -> Tuple[str, str]:
+    method = str(endpoint.get("method", "GET")).upper()
+    path = str(endpoint.get("path", "")).strip()
+    path = re.sub(r"\{[^}]*\}", "{}", path).rstrip("/") or "/"
+    return method, path
+
+
+def _merge_endpoint(target: Dict[str, Any], other: Dict[str, Any]):
+    for field in ("summary", "description", "request_body"):
+        if not target.get(field) and other.get(field):
+            target[field] = other[field]
+
+    params = dict(target.get("parameters") or {})
+    for location, items in (other.get("parameters") or {}).items():
+        existing = list(params.get(location) or [])
+        names = {p.get("name") for p in existing if isinstance(p, dict)}
+        for p in items or []:
+            if isinstance(p, dict) and p.get("name") not in names:
+                existing.append(p)
+                names.add(p.get("name"))
+        params[location] = existing
+    target["parameters"] = params
+
+    responses = dict(other.get("responses") or {})
+    responses.update(target.get("responses") or {})
+    target["responses"] = responses
+
+
+def merge_partial_specs(partials: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Reduces per-chunk extractions into a single spec dict. Top-level fields
+    come from the first chunk that has them; endpoints are deduplicated on
+    (method, path) with parameters and responses unioned.
+    """
+    merged: Dict[str, Any] = {
+        "name": "",
+        "version": "",
+        "base_url": "",
+        "description": "",
+        "authentication": {},
+        "endpoints": [],
+    }
+    by_key: Dict[Tuple[str, str], Dict[str, Any]] = {}
+
+    for partial in partials:
+        if not isinstance(partial, dict):
+            continue
+        for field in ("name", "version", "base_url", "description"):
+            if not merged[field] and partial.get(field):
+                merged[field] = partial[field]
+        auth = partial.get("authentication") or {}
+        if auth.get("type") not in (None, "none") and merged["authentication"].get("type") in (None, "none"):
+            merged["authentication"] = auth
+        elif not merged["authentication"] and auth:
+            merged["authentication"] = auth
+
+        for endpoint in partial.get("endpoints") or []:
+            if not isinstance(endpoint, dict) or not endpoint.get("path"):
+                continue
+            key = _endpoint_key(endpoint)
+            if key in by_key:
+                _merge_endpoint(by_key[key], endpoint)
+            else:
+                by_key[key] = dict(endpoint)
+                merged["endpoints"].append(by_key[key])
+
+    merged["name"] = merged["name"] or "Extracted API"
+    merged["version"] = merged["version"] or "1.0.0"
+    return merged
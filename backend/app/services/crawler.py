@@ -0,0 +1,177 @@
+import os
+import asyncio
+import hashlib
+from dataclasses import dataclass
+from typing import AsyncIterator, List, Optional, Set, Tuple
+from urllib.parse import urldefrag, urljoin, urlsplit, urlunsplit
+from urllib.robotparser import RobotFileParser
+from bs4 import BeautifulSoup, SoupStrainer
+from ..core.http import HTTPClientRegistry
+from .scraper import INLINE_CLEAN_LIMIT, ScraperService
+
+_DONE = object()
+
+
+@dataclass
+class CrawledPage:
+    url: str
+    depth: int
+    digest: str
+    text: str
+
+
+def canonicalize_url(url: str) -> str:
+    """Lowercases scheme/host, drops fragments and default ports, trims trailing slashes."""
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    netloc = parts.netloc.lower()
+    if (scheme == "http" and netloc.endswith(":80")) or (scheme == "https" and netloc.endswith(":443")):
+        netloc = netloc.rsplit(":", 1)[0]
+    path = parts.path or "/"
+    if len(path) > 1:
+        path = path.rstrip("/")
+    return urlunsplit((scheme, netloc, path, parts.query, ""))
+
+
+class DocCrawler:
+    """
+    Breadth-first crawler for multi-page documentation. Follows same-origin
+    links under the start URL's directory with a fixed-size worker pool and
+    yields pages as soon as they are fetched, so parsing can overlap the crawl.
+    """
+
+    def __init__(
+        self,
+        clients: HTTPClientRegistry,
+        concurrency: Optional[int] = None,
+        max_pages: int = 25,
+        max_depth: int = 2,
+        respect_robots: bool = True,
+        user_agent: str = "Doc2SDK-Crawler/1.0",
+    ):
+        self.clients = clients
+        self.concurrency = concurrency or int(os.getenv("CRAWL_CONCURRENCY", 8))
+        self.max_pages = max_pages
+        self.max_depth = max_depth
+        self.respect_robots = respect_robots
+        self.user_agent = user_agent
+        self._robots: Optional[RobotFileParser] = None
+
+    @staticmethod
+    def _scope(start_url: str) -> Tuple[str, str]:
+        # Scope is the start URL's directory: /docs/ and /docs/intro both scope to /docs/
+        path = urlsplit(start_url).path or "/"
+        prefix = path if path.endswith("/") else path.rsplit("/", 1)[0] + "/"
+        origin = urlsplit(canonicalize_url(start_url))
+        return f"{origin.scheme}://{origin.netloc}", prefix
+
+    async def _load_robots(self, origin: str):
+        robots = RobotFileParser()
+        try:
+            response = await self.clients.get("scraper").get(f"{origin}/robots.txt", timeout=10.0)
+            if response.status_code >= 400:
+                robots.allow_all = True
+            else:
+                robots.parse(response.text.splitlines())
+        except Exception as e:
+            print(f"DEBUG: Could not load robots.txt for {origin}: {str(e)}")
+            robots.allow_all = True
+        self._robots = robots
+
+    def _allowed(self, url: str) -> bool:
+        if not self.respect_robots or self._robots is None:
+            return True
+        return self._robots.can_fetch(self.user_agent, url)
+
+    @staticmethod
+    def extract_links(html: str, base_url: str) -> List[str]:
+        links = []
+        for a in BeautifulSoup(html, "html.parser", parse_only=SoupStrainer("a")).find_all("a", href=True):
+            href = a["href"].strip()
+            if href.startswith(("mailto:", "javascript:", "tel:", "#")):
+                continue
+            links.append(urljoin(base_url, href))
+        return links
+
+    @staticmethod
+    async def extract_links_async(html: str, base_url: str) -> List[str]:
+        """extract_links in a worker thread for large pages, like ScraperService.clean_html_async."""
+        if len(html) < INLINE_CLEAN_LIMIT:
+            return DocCrawler.extract_links(html, base_url)
+        return await asyncio.to_thread(DocCrawler.extract_links, html, base_url)
+
+    async def _fetch(self, url: str) -> Tuple[Optional[str], str]:
+        client = self.clients.get("scraper")
+        async with self.clients.host_slot(url):
+            response = await client.get(url, headers={"User-Agent": self.user_agent})
+        response.raise_for_status()
+        if "html" not in response.headers.get("content-type", "text/html").lower():
+            return None, ""
+        return response.text, str(response.url)
+
+    async def crawl(self, start_url: str) -> AsyncIterator[CrawledPage]:
+        origin, prefix = self._scope(start_url)
+        if self.respect_robots:
+            await self._load_robots(origin)
+
+        queue: asyncio.Queue = asyncio.Queue()
+        results: asyncio.Queue = asyncio.Queue()
+        seen_urls: Set[str] = {canonicalize_url(start_url)}
+        seen_digests: Set[str] = set()
+        scheduled = 1
+        # Fetch the URLs as written (relative links depend on trailing slashes); dedup on canonical form
+        queue.put_nowait((urldefrag(start_url)[0], 0))
+
+        def in_scope(url: str) -> bool:
+            return canonicalize_url(url).startswith(origin + "/") and urlsplit(url).path.startswith(prefix)
+
+        async def worker():
+            nonlocal scheduled
+            while True:
+                url, depth = await queue.get()
+                try:
+                    if not self._allowed(url):
+                        continue
+                    html, final_url = await self._fetch(url)
+                    if html is None:
+                        continue
+                    digest = hashlib.sha256(html.encode("utf-8")).hexdigest()
+                    if digest in seen_digests:
+                        continue
+                    seen_digests.add(digest)
+
+                    if depth < self.max_depth:
+                        for link in await self.extract_links_async(html, final_url or url):
+                            link = urldefrag(link)[0]
+                            canonical = canonicalize_url(link)
+                            if scheduled >= self.max_pages:
+                                break
+                            if canonical in seen_urls or not in_scope(link):
+                                continue
+                            seen_urls.add(canonical)
+                            scheduled += 1
+                            queue.put_nowait((link, depth + 1))
+
+                    text = await ScraperService.clean_html_async(html)
+                    await results.put(CrawledPage(url=url, depth=depth, digest=digest, text=text))
+                except Exception as e:
+                    print(f"DEBUG: Crawl failed for {url}: {str(e)}")
+                finally:
+                    queue.task_done()
+
+        async def finisher():
+            await queue.join()
+            await results.put(_DONE)
+
+        tasks = [asyncio.ensure_future(worker()) for _ in range(self.concurrency)]
+        tasks.append(asyncio.ensure_future(finisher()))
+        try:
+            while True:
+                page = await results.get()
+                if page is _DONE:
+                    break
+                yield page
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
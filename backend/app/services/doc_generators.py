@@ -0,0 +1,159 @@
+import re
+import json
+import html as html_lib
+from dataclasses import dataclass
+from typing import Any, Optional
+from urllib.parse import urljoin
+
+# Cheap markers checked before any of the patterns below run
+_MARKERS = re.compile(
+    r"swagger-ui|SwaggerUIBundle|<redoc\b|Redoc\.init|__redoc_state|<elements-api\b|<rapi-doc\b|getpostman\.com",
+    re.IGNORECASE,
+)
+
+_ATTR = r"""\s*=\s*(?:"([^"]*)"|'([^']*)')"""
+_REDOC_TAG = re.compile(r"<redoc\b[^>]*?\bspec-url" + _ATTR, re.IGNORECASE)
+_RAPIDOC_TAG = re.compile(r"<rapi-doc\b[^>]*?\bspec-url" + _ATTR, re.IGNORECASE)
+_ELEMENTS_URL = re.compile(r"<elements-api\b[^>]*?\bapiDescriptionUrl" + _ATTR, re.IGNORECASE)
+_ELEMENTS_DOCUMENT = re.compile(r"<elements-api\b[^>]*?\bapiDescriptionDocument" + _ATTR, re.IGNORECASE)
+_REDOC_INIT = re.compile(r"Redoc\.init\(\s*([\"'`])([^\"'`]+)\1")
+_REDOC_INIT_INLINE = re.compile(r"Redoc\.init\(\s*\{")
+_REDOC_STATE = re.compile(r"__redoc_state\s*=\s*\{")
+_SWAGGER_URL = re.compile(r"""(?<![\w.])url\s*:\s*(["'`])([^"'`]+)\1""")
+_SWAGGER_CONFIG_URL = re.compile(r"""configUrl\s*:\s*(["'`])([^"'`]+)\1""")
+_SWAGGER_SPEC = re.compile(r"""(?<![\w.])spec\s*:\s*\{""")
+_SWAGGER_INITIALIZER = re.compile(r"""<script\b[^>]*?\bsrc\s*=\s*["']([^"']*swagger-initializer[^"']*)["']""", re.IGNORECASE)
+_POSTMAN_VIEW = re.compile(r"documenter\.getpostman\.com/view/(\d+)/(\w+)")
+_POSTMAN_API = re.compile(r"documenter\.gw\.postman\.com/api/collections/(\d+)/(\w+)")
+_POSTMAN_IDS = re.compile(r"""["']?ownerId["']?\s*:\s*["']?(\d+)["']?\s*,\s*["']?publishedId["']?\s*:\s*["'](\w+)["']""")
+
+POSTMAN_COLLECTION_URL = "https://documenter.gw.postman.com/api/collections/{owner}/{published}?segregateAuth=true&versionTag=latest"
+
+
+@dataclass
+class EmbeddedSpec:
+    """
+    Where a rendered docs page keeps its machine-readable spec. Exactly one
+    of url / document is set; kind says how to read what they point at:
+    "openapi" (JSON/YAML spec), "postman" (collection JSON), "script"
+    (Swagger UI initializer to search again) or "swagger-config" (JSON with
+    url / urls).
+    """
+    generator: str
+    kind: str = "openapi"
+    url: Optional[str] = None
+    document: Optional[bytes] = None
+
+
+def _balanced_object(text: str, start: int) -> Optional[str]:
+    """The {...} literal starting at text[start], honouring quoted strings."""
+    depth = 0
+    quote = None
+    i = start
+    while i < len(text):
+        ch = text[i]
+        if quote:
+            if ch == "\\":
+                i += 1
+            elif ch == quote:
+                quote = None
+        elif ch in "\"'`":
+            quote = ch
+        elif ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+        i += 1
+    return None
+
+
+def _json_at(text: str, match: Optional[re.Match]) -> Optional[Any]:
+    """Parses the object literal ending the match; None for JS that isn't plain JSON."""
+    if match is None:
+        return None
+    literal = _balanced_object(text, match.end() - 1)
+    if literal is None:
+        return None
+    try:
+        return json.loads(literal)
+    except ValueError:
+        return None
+
+
+def _attr(match: re.Match) -> str:
+    return html_lib.unescape(match.group(1) if match.group(1) is not None else match.group(2))
+
+
+def _document(value: Any) -> bytes:
+    return json.dumps(value).encode("utf-8")
+
+
+def _postman(owner: str, published: str) -> EmbeddedSpec:
+    return EmbeddedSpec("postman", kind="postman", url=POSTMAN_COLLECTION_URL.format(owner=owner, published=published))
+
+
+def find_in_swagger_script(text: str, base_url: str) -> Optional[EmbeddedSpec]:
+    """Swagger UI config: inline `spec: {...}`, `url` / `urls[0].url`, or a springdoc-style `configUrl`."""
+    spec = _json_at(text, _SWAGGER_SPEC.search(text))
+    if isinstance(spec, dict):
+        return EmbeddedSpec("swagger-ui", document=_document(spec))
+    match = _SWAGGER_URL.search(text)
+    if match:
+        return EmbeddedSpec("swagger-ui", url=urljoin(base_url, match.group(2)))
+    match = _SWAGGER_CONFIG_URL.search(text)
+    if match:
+        return EmbeddedSpec("swagger-ui", kind="swagger-config", url=urljoin(base_url, match.group(2)))
+    return None
+
+
+def find_embedded_spec(html: str, page_url: str) -> Optional[EmbeddedSpec]:
+    """
+    Recognises pages rendered by Swagger UI, Redoc, Stoplight Elements,
+    RapiDoc and Postman documenter, and returns where their spec lives.
+    Pure regex over the raw HTML: no DOM is built, so misses cost microseconds.
+    """
+    match = _POSTMAN_VIEW.search(page_url)
+    if match:
+        return _postman(*match.groups())
+    if not _MARKERS.search(html):
+        return None
+
+    for pattern, generator in ((_REDOC_TAG, "redoc"), (_ELEMENTS_URL, "stoplight"), (_RAPIDOC_TAG, "rapidoc")):
+        match = pattern.search(html)
+        if match and _attr(match).strip():
+            return EmbeddedSpec(generator, url=urljoin(page_url, _attr(match).strip()))
+
+    match = _ELEMENTS_DOCUMENT.search(html)
+    if match and _attr(match).strip():
+        return EmbeddedSpec("stoplight", document=_attr(match).encode("utf-8"))
+
+    state = _json_at(html, _REDOC_STATE.search(html))
+    if isinstance(state, dict) and isinstance((state.get("spec") or {}).get("data"), dict):
+        return EmbeddedSpec("redoc", document=_document(state["spec"]["data"]))
+    match = _REDOC_INIT.search(html)
+    if match:
+        return EmbeddedSpec("redoc", url=urljoin(page_url, match.group(2)))
+    spec = _json_at(html, _REDOC_INIT_INLINE.search(html))
+    if isinstance(spec, dict):
+        return EmbeddedSpec("redoc", document=_document(spec))
+
+    for pattern in (_POSTMAN_API, _POSTMAN_IDS, _POSTMAN_VIEW):
+        match = pattern.search(html)
+        if match:
+            return _postman(*match.groups())
+
+    if re.search(r"swagger-ui|SwaggerUIBundle", html, re.IGNORECASE):
+        bundle = html.find("SwaggerUIBundle(")
+        found = find_in_swagger_script(html[bundle:], page_url) if bundle != -1 else None
+        if found:
+            return found
+        # Swagger UI >= 4 keeps its config in a separate initializer script
+        match = _SWAGGER_INITIALIZER.search(html)
+        if match:
+            return EmbeddedSpec("swagger-ui", kind="script", url=urljoin(page_url, match.group(1)))
+        if "swagger-ui-bundle" in html:
+            # Stock dist layout: the initializer sits next to index.html
+            return EmbeddedSpec("swagger-ui", kind="script", url=urljoin(page_url, "swagger-initializer.js"))
+    return None
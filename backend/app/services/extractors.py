@@ -0,0 +1,198 @@
+import os
+import re
+import importlib.util
+from typing import Any, Callable, Iterator, List, Optional, Union
+
+SKIP_TAGS = {"script", "style", "nav", "footer", "aside", "header", "iframe", "svg", "noscript", "template"}
+HEADING_TAGS = {"h1", "h2", "h3", "h4", "h5", "h6"}
+BLOCK_TAGS = {
+    "p", "div", "section", "article", "main", "body", "ul", "ol", "li", "dl", "dt", "dd",
+    "blockquote", "br", "hr", "tr", "form", "fieldset", "figure", "figcaption", "details", "summary",
+}
+
+
+def _squash(text: str) -> str:
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def format_table(rows: List[List[str]]) -> str:
+    rows = [r for r in rows if any(cell for cell in r)]
+    if not rows:
+        return ""
+    width = max(len(r) for r in rows)
+    rows = [r + [""] * (width - len(r)) for r in rows]
+    lines = ["| " + " | ".join(cell.replace("|", "\\|") for cell in r) + " |" for r in rows]
+    lines.insert(1, "|" + " --- |" * width)
+    return "\n".join(lines)
+
+
+class MarkdownWalker:
+    """
+    Single-pass HTML -> markdown-ish text. Headings become `### text ###`
+    (the boundary format the chunker splits on), <pre> becomes fenced code,
+    tables become pipe tables. Works on any tree through three accessors so
+    the BeautifulSoup and lxml backends share the same output.
+    """
+
+    def __init__(
+        self,
+        tag_of: Callable[[Any], Optional[str]],
+        contents_of: Callable[[Any], Iterator[Union[str, Any]]],
+        text_of: Callable[[Any], str],
+    ):
+        self.tag_of = tag_of
+        self.contents_of = contents_of
+        self.text_of = text_of
+
+    def render(self, root: Any) -> str:
+        self._blocks: List[str] = []
+        self._inline: List[str] = []
+        self._walk(root)
+        self._flush()
+        return "\n".join(self._blocks)
+
+    def _flush(self, prefix: str = ""):
+        text = _squash("".join(self._inline))
+        self._inline = []
+        if text:
+            self._blocks.append(prefix + text)
+
+    def _walk(self, node: Any):
+        for item in self.contents_of(node):
+            if isinstance(item, str):
+                self._inline.append(item)
+                continue
+
+            tag = self.tag_of(item)
+            if tag is None or tag in SKIP_TAGS:
+                continue
+            if tag in HEADING_TAGS:
+                self._flush()
+                heading = _squash(self.text_of(item))
+                if heading:
+                    self._blocks.append(f"\n### {heading} ###")
+            elif tag == "pre":
+                self._flush()
+                code = self.text_of(item).strip("\n")
+                if code.strip():
+                    self._blocks.append(f"```\n{code}\n```")
+            elif tag == "code":
+                self._inline.append(f"`{self.text_of(item).strip()}`")
+            elif tag == "table":
+                self._flush()
+                table = format_table(self._table_rows(item))
+                if table:
+                    self._blocks.append(table)
+            elif tag in BLOCK_TAGS:
+                self._flush()
+                self._walk(item)
+                self._flush(prefix="- " if tag == "li" else "")
+            else:
+                self._walk(item)
+
+    def _table_rows(self, table: Any) -> List[List[str]]:
+        rows: List[List[str]] = []
+
+        def visit(node: Any):
+            for child in self.contents_of(node):
+                if isinstance(child, str):
+                    continue
+                tag = self.tag_of(child)
+                if tag == "tr":
+                    rows.append([
+                        _squash(self.text_of(c))
+                        for c in self.contents_of(child)
+                        if not isinstance(c, str) and self.tag_of(c) in ("td", "th")
+                    ])
+                elif tag in ("thead", "tbody", "tfoot"):
+                    visit(child)
+
+        visit(table)
+        return rows
+
+
+class SoupExtractor:
+    """Pure-Python backend (BeautifulSoup + html.parser); always available."""
+
+    name = "soup"
+
+    def __init__(self):
+        from bs4 import NavigableString, Comment
+
+        def contents_of(node):
+            for child in node.children:
+                if isinstance(child, Comment):
+                    continue
+                if isinstance(child, NavigableString):
+                    yield str(child)
+                else:
+                    yield child
+
+        self._accessors = (lambda node: node.name, contents_of, lambda node: node.get_text())
+
+    def extract(self, html: str) -> str:
+        from bs4 import BeautifulSoup
+
+        soup = BeautifulSoup(html, "html.parser")
+        root = soup.find("main") or soup.find("article") or soup.find("body") or soup
+        # Walkers hold per-render state, so each call gets its own (extract runs in worker threads)
+        return MarkdownWalker(*self._accessors).render(root)
+
+
+class LxmlExtractor:
+    """C-based backend built on lxml.html; several times faster on large pages."""
+
+    name = "lxml"
+
+    def __init__(self):
+        def tag_of(node):
+            # Comments and processing instructions have a non-string tag
+            return node.tag.lower() if isinstance(node.tag, str) else None
+
+        def contents_of(node):
+            if node.text:
+                yield node.text
+            for child in node:
+                yield child
+                if child.tail:
+                    yield child.tail
+
+        self._accessors = (tag_of, contents_of, lambda node: node.text_content())
+
+    def extract(self, html: str) -> str:
+        import lxml.html
+
+        if not html.strip():
+            return ""
+        try:
+            tree = lxml.html.document_fromstring(html)
+        except Exception:
+            # lxml rejects str input carrying an XML encoding declaration
+            tree = lxml.html.document_fromstring(html.encode("utf-8"))
+        root = tree.find(".//main")
+        if root is None:
+            root = tree.find(".//article")
+        if root is None:
+            root = tree.find(".//body")
+        if root is None:
+            root = tree
+        return MarkdownWalker(*self._accessors).render(root)
+
+
+_EXTRACTORS = {"soup": SoupExtractor, "lxml": LxmlExtractor}
+_instances = {}
+
+
+def get_extractor(name: Optional[str] = None):
+    """
+    Returns the extractor named by HTML_EXTRACTOR (auto|lxml|soup). "auto"
+    picks lxml when it is installed and falls back to BeautifulSoup.
+    """
+    name = (name or os.getenv("HTML_EXTRACTOR", "auto")).lower()
+    if name == "auto":
+        name = "lxml" if importlib.util.find_spec("lxml") is not None else "soup"
+    if name not in _EXTRACTORS:
+        raise ValueError(f"Unknown HTML extractor: {name}")
+    if name not in _instances:
+        _instances[name] = _EXTRACTORS[name]()
+    return _instances[name]
@@ -0,0 +1,202 @@
+import os
+import time
+import uuid
+import asyncio
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+from celery import Celery
+from celery.result import AsyncResult
+from .. import schemas
+from .pipeline import GenerationPipeline, get_pipeline
+from ..core.http import HTTPClientRegistry
+
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379")
+
+celery_app = Celery(
+    "doc2sdk",
+    broker=os.getenv("JOB_BROKER_URL", REDIS_URL),
+    backend=os.getenv("JOB_RESULT_BACKEND", REDIS_URL),
+)
+celery_app.conf.update(
+    task_serializer="json",
+    result_serializer="json",
+    accept_content=["json"],
+    task_track_started=True,
+    result_expires=int(os.getenv("JOB_RESULT_TTL", 3600)),
+    # Generation jobs are long: take one at a time and re-queue if the worker dies mid-job
+    worker_prefetch_multiplier=1,
+    task_acks_late=True,
+    task_always_eager=os.getenv("JOB_ALWAYS_EAGER", "").lower() in ("1", "true"),
+    task_store_eager_result=True,
+)
+
+# Rough completion per pipeline stage, reported while a job runs
+STAGE_PROGRESS = {"queued": 0, "fetching": 10, "crawling": 20, "parsing": 40, "generating": 80, "done": 100}
+JOB_STATES = {"PENDING": "queued", "STARTED": "running", "PROGRESS": "running", "RETRY": "queued", "SUCCESS": "succeeded", "FAILURE": "failed", "REVOKED": "failed"}
+
+# Overridable in tests (e.g. a registry on an httpx.MockTransport)
+clients_factory = HTTPClientRegistry.from_env
+
+
+class InflightRegistry:
+    """
+    dedup key -> job id for jobs that are queued or running, so identical
+    submissions join the existing job. Also remembers every submitted job id
+    for known_ttl (the result lifetime), since Celery reports unknown ids as
+    PENDING. Uses Redis (SET NX) when the broker is Redis (shared by every
+    API worker), in-process dicts otherwise.
+    """
+
+    def __init__(
+        self,
+        redis_url: Optional[str] = None,
+        ttl: float = 900,
+        prefix: str = "doc2sdk:job:inflight:",
+        known_ttl: float = 3600,
+        known_prefix: str = "doc2sdk:job:known:",
+    ):
+        self.ttl = ttl
+        self.prefix = prefix
+        self.known_ttl = known_ttl
+        self.known_prefix = known_prefix
+        self._redis = None
+        self._local: Dict[str, Any] = {}
+        # job id -> expiry; one TTL for all, so insertion order is expiry order
+        self._known: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+        if redis_url:
+            import redis
+            self._redis = redis.Redis.from_url(redis_url, decode_responses=True)
+
+    def claim(self, key: str, job_id: str) -> Optional[str]:
+        """Registers job_id for key; returns the already running job's id instead if there is one."""
+        if self._redis is not None:
+            if self._redis.set(self.prefix + key, job_id, nx=True, ex=int(self.ttl)):
+                return None
+            return self._redis.get(self.prefix + key)
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is not None and entry[1] > time.monotonic():
+                return entry[0]
+            self._local[key] = (job_id, time.monotonic() + self.ttl)
+            return None
+
+    def remember(self, job_id: str):
+        if self._redis is not None:
+            self._redis.set(self.known_prefix + job_id, "1", ex=int(self.known_ttl))
+            return
+        now = time.monotonic()
+        with self._lock:
+            while self._known and next(iter(self._known.values())) < now:
+                self._known.popitem(last=False)
+            self._known[job_id] = now + self.known_ttl
+
+    def known(self, job_id: str) -> bool:
+        if self._redis is not None:
+            return bool(self._redis.exists(self.known_prefix + job_id))
+        with self._lock:
+            expires_at = self._known.get(job_id)
+            return expires_at is not None and expires_at > time.monotonic()
+
+    def release(self, key: str, job_id: str):
+        if self._redis is not None:
+            # Only the owner clears the key (a stale job must not drop a newer claim)
+            if self._redis.get(self.prefix + key) == job_id:
+                self._redis.delete(self.prefix + key)
+            return
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is not None and entry[0] == job_id:
+                del self._local[key]
+
+
+class JobQueue:
+    """Submits generation jobs to the Celery workers and reports their status/results."""
+
+    def __init__(self, celery: Celery = celery_app, registry: Optional[InflightRegistry] = None):
+        self.celery = celery
+        self._registry = registry
+
+    @property
+    def registry(self) -> InflightRegistry:
+        if self._registry is None:
+            broker = str(self.celery.conf.broker_url or "")
+            ttl = float(os.getenv("JOB_DEDUP_TTL", 900))
+            self._registry = InflightRegistry(
+                broker if broker.startswith(("redis://", "rediss://")) else None,
+                ttl=ttl,
+                known_ttl=float(self.celery.conf.result_expires or 3600),
+            )
+        return self._registry
+
+    @staticmethod
+    def dedup_key(request: schemas.GenerateRequest) -> str:
+        return GenerationPipeline.request_key(request)
+
+    def submit(self, request: schemas.GenerateRequest) -> Dict[str, Any]:
+        key = self.dedup_key(request)
+        job_id = str(uuid.uuid4())
+        existing = self.registry.claim(key, job_id)
+        if existing:
+            return {"job_id": existing, "deduplicated": True}
+        self.registry.remember(job_id)
+        try:
+            generate_sdk_job.apply_async(args=[request.model_dump(), key], task_id=job_id)
+        except Exception:
+            self.registry.release(key, job_id)
+            raise
+        return {"job_id": job_id, "deduplicated": False}
+
+    def status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """None for ids this queue never handed out (Celery would call them PENDING forever)."""
+        result = AsyncResult(job_id, app=self.celery)
+        if result.state == "PENDING" and not self.registry.known(job_id):
+            return None
+        state = JOB_STATES.get(result.state, result.state.lower())
+        info = result.info if isinstance(result.info, dict) else {}
+        stage = "done" if state == "succeeded" else info.get("stage", "queued")
+        status = {"job_id": job_id, "state": state, "stage": stage, "progress": STAGE_PROGRESS.get(stage, 0)}
+        if state == "failed":
+            status["error"] = str(result.result)
+        return status
+
+    def result(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """The GenerateResponse dict of a finished job, or None while it is not done."""
+        result = AsyncResult(job_id, app=self.celery)
+        if result.state != "SUCCESS":
+            return None
+        return result.get(timeout=1)
+
+
+job_queue = JobQueue()
+
+_loops = threading.local()
+
+
+def _run(coroutine):
+    # One long-lived loop per worker thread: asyncio primitives shared by the
+    # services (e.g. the LLM semaphore) must not hop between event loops
+    loop = getattr(_loops, "loop", None)
+    if loop is None:
+        loop = _loops.loop = asyncio.new_event_loop()
+    return loop.run_until_complete(coroutine)
+
+
+async def _generate(payload: Dict[str, Any], progress) -> Dict[str, Any]:
+    async with clients_factory() as clients:
+        result = await get_pipeline().generate(schemas.GenerateRequest(**payload), clients, progress=progress)
+    return result.model_dump()
+
+
+@celery_app.task(bind=True, name="doc2sdk.generate")
+def generate_sdk_job(self, payload: Dict[str, Any], dedup_key: Optional[str] = None) -> Dict[str, Any]:
+    """scrape -> parse -> generate on a worker; progress is published as PROGRESS state meta."""
+    def progress(stage: str):
+        self.update_state(state="PROGRESS", meta={"stage": stage})
+
+    try:
+        return _run(_generate(payload, progress))
+    finally:
+        if dedup_key:
+            job_queue.registry.release(dedup_key, self.request.id)
@@ -0,0 +1,111 @@
+import os
+import asyncio
+import functools
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Dict, Optional
+from starlette.requests import Request
+
+
+class LLMTimeoutError(Exception):
+    pass
+
+
+class ClientDisconnectedError(Exception):
+    pass
+
+
+class LLMClient:
+    """
+    Async gateway for Gemini calls. Uses the SDK's generate_content_async when
+    the model provides it and falls back to a bounded thread pool otherwise,
+    so the event loop is never blocked by an LLM round-trip. A semaphore per
+    event loop (API loop, job worker loops) caps in-flight generations and
+    every call has a timeout. A timed-out blocking call keeps running in its
+    thread, so its slot is only given back once that thread is done: the cap
+    never admits more calls than there are free threads.
+    """
+
+    def __init__(self, max_concurrency: int = 16, timeout: float = 120.0):
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="llm")
+
+    @classmethod
+    def from_env(cls) -> "LLMClient":
+        return cls(
+            max_concurrency=int(os.getenv("LLM_MAX_CONCURRENCY", 16)),
+            timeout=float(os.getenv("LLM_TIMEOUT", 120.0)),
+        )
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        return semaphore
+
+    @staticmethod
+    def _release(loop: asyncio.AbstractEventLoop, semaphore: asyncio.Semaphore):
+        try:
+            loop.call_soon_threadsafe(semaphore.release)
+        except RuntimeError:
+            # The loop is closed; its semaphore went with it
+            pass
+
+    async def generate(
+        self,
+        model: Any,
+        prompt: str,
+        generation_config: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+    ) -> Any:
+        timeout = timeout if timeout is not None else self.timeout
+        semaphore = self._semaphore()
+        await semaphore.acquire()
+        if hasattr(model, "generate_content_async"):
+            try:
+                return await asyncio.wait_for(model.generate_content_async(prompt, generation_config=generation_config), timeout)
+            except asyncio.TimeoutError:
+                raise LLMTimeoutError(f"LLM call timed out after {timeout:.0f}s")
+            finally:
+                semaphore.release()
+
+        loop = asyncio.get_running_loop()
+        try:
+            future = self._executor.submit(functools.partial(model.generate_content, prompt, generation_config=generation_config))
+        except BaseException:
+            semaphore.release()
+            raise
+        # Released when the thread finishes, not when we stop waiting for it
+        future.add_done_callback(lambda _: self._release(loop, semaphore))
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except asyncio.TimeoutError:
+            raise LLMTimeoutError(f"LLM call timed out after {timeout:.0f}s")
+
+
+async def cancel_on_disconnect(request: Optional[Request], awaitable: Awaitable[Any], poll_interval: float = 0.5) -> Any:
+    """
+    Runs awaitable while watching the HTTP connection; if the client goes
+    away the work is cancelled instead of finishing for nobody. Without a
+    request (background jobs) the awaitable simply runs to completion.
+    """
+    if request is None:
+        return await awaitable
+    task = asyncio.ensure_future(awaitable)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=poll_interval)
+            if done:
+                return task.result()
+            if await request.is_disconnected():
+                task.cancel()
+                raise ClientDisconnectedError("Client disconnected before the request completed")
+    finally:
+        if not task.done():
+            task.cancel()
+
+
+llm_client = LLMClient.from_env()
@@ -1,49 +1,45 @@
 import os
 import json
-import google.generativeai as genai
-from typing import Dict, Any, Optional
+import asyncio
+from typing import AsyncIterable, Dict, Any, List, Optional
 from dotenv import load_dotenv
+from .llm_client import llm_client
+from .model_resolver import ModelResolver, get_model_resolver
+from .chunking import split_into_chunks, merge_partial_specs
 
 load_dotenv()
 
 class LLMParserService:
-    def __init__(self):
-        self.model = None
-        self.model_name = None
-        self._initialize_model()
+    def __init__(self, resolver: Optional[ModelResolver] = None):
+        # Model discovery is deferred to first use and shared with the translator
+        self.resolver = resolver or get_model_resolver()
+        self._model = None
+        self._model_name = None
+        # Documents larger than this (estimated tokens) are extracted chunk-by-chunk
+        self.chunk_tokens = int(os.getenv("LLM_CHUNK_TOKENS", 8000))
 
-    def _initialize_model(self):
-        api_key = os.getenv("GEMINI_API_KEY")
-        if not api_key or api_key == "your_gemini_api_key_here":
-            self.model = None
-            return
+    @property
+    def model(self):
+        return self._model or self.resolver.model
 
-        try:
-            genai.configure(api_key=api_key)
-            # Find the best available gemini model
-            models = [m.name for m in genai.list_models() if "gemini" in m.name]
-            
-            # Preference order
-            preferred = ["models/gemini-2.0-flash", "models/gemini-1.5-flash", "models/gemini-1.5-pro", "models/gemini-pro"]
-            for p in preferred:
-                if p in models:
-                    self.model_name = p
-                    break
-            
-            if not self.model_name and models:
-                self.model_name = models[0]
-                
-            if self.model_name:
-                self.model = genai.GenerativeModel(self.model_name)
-                print(f"DEBUG: Initialized with model: {self.model_name}")
-        except Exception as e:
-            print(f"DEBUG: Failed to initialize Gemini model: {str(e)}")
-            self.model = None
+    async def ensure_model(self):
+        """Resolves the shared model off the event loop unless one was set explicitly."""
+        if self._model is None:
+            await self.resolver.ensure()
 
-    async def parse_docs(self, cleaned_text: str) -> Dict[str, Any]:
-        if not self.model:
-            self._initialize_model()
+    @model.setter
+    def model(self, model):
+        self._model = model
+
+    @property
+    def model_name(self) -> Optional[str]:
+        return self._model_name or self.resolver.model_name
 
+    @model_name.setter
+    def model_name(self, name: Optional[str]):
+        self._model_name = name
+
+    async def parse_docs(self, cleaned_text: str) -> Dict[str, Any]:
         # 1. Spec-First Bypass: If scraper found a raw JSON spec, parse it directly
         if "RAW_SPEC_JSON:" in cleaned_text:
             try:
@@ -89,8 +85,68 @@ class LLMParserService:
                 print(f"DEBUG: Direct extraction failed: {str(e)}")
 
         # 2. LLM Parsing with Gemini
+        await self.ensure_model()
+        if not self.model:
+            raise Exception("AI service unavailable: No Gemini model initialized. Please check your GEMINI_API_KEY.")
+
+        chunks = split_into_chunks(cleaned_text, self.chunk_tokens)
+        if len(chunks) == 1:
+            return await self._extract(cleaned_text)
+
+        # Map-reduce: extract every chunk concurrently (bounded by llm_client), then merge
+        print(f"DEBUG: Extracting {len(chunks)} chunks in parallel")
+        results = await asyncio.gather(
+            *(self._extract(chunk, part=(i + 1, len(chunks))) for i, chunk in enumerate(chunks)),
+            return_exceptions=True,
+        )
+        return self._merge_results(results)
+
+    async def parse_pages(self, pages: AsyncIterable[str]) -> Dict[str, Any]:
+        """
+        Extracts a spec from a stream of page texts (e.g. DocCrawler output).
+        Extraction of each page starts as soon as it arrives.
+        """
+        await self.ensure_model()
+        if not self.model:
+            raise Exception("AI service unavailable: No Gemini model initialized. Please check your GEMINI_API_KEY.")
+
+        tasks = []
+        try:
+            async for text in pages:
+                for chunk in split_into_chunks(text, self.chunk_tokens):
+                    tasks.append(asyncio.ensure_future(self._extract(chunk, part=(len(tasks) + 1, "several"))))
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+
+        if not tasks:
+            raise Exception("No documentation pages could be fetched")
+        print(f"DEBUG: Extracting {len(tasks)} crawled chunks")
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        return self._merge_results(results)
+
+    def _merge_results(self, results: List[Any]) -> Dict[str, Any]:
+        partials = [r for r in results if not isinstance(r, BaseException)]
+        if not partials:
+            raise results[0]
+        if len(partials) < len(results):
+            print(f"DEBUG: {len(results) - len(partials)} of {len(results)} chunks failed to extract")
+
+        merged = merge_partial_specs(partials)
+        return {**merged, "source": f"gemini_{self.model_name.split('/')[-1]}", "is_mock": False}
+
+    async def _extract(self, cleaned_text: str, part: Optional[tuple] = None) -> Dict[str, Any]:
+        section_note = ""
+        if part:
+            section_note = (
+                f"NOTE: This is section {part[0]} of {part[1]} of a larger document. "
+                "Extract only what appears in this section; leave unknown top-level fields empty."
+            )
+
         prompt = f"""
         You are an expert API architect. Your goal is to extract a structured API specification from the provided documentation text.
+        {section_note}
         
         INSTRUCTIONS:
         1. Extract all API endpoints, methods (GET, POST, etc.), paths, and parameters.
@@ -132,11 +188,9 @@ class LLMParserService:
         }}
         """
 
-        if not self.model:
-            raise Exception("AI service unavailable: No Gemini model initialized. Please check your GEMINI_API_KEY.")
-
         try:
-            response = self.model.generate_content(
+            response = await llm_client.generate(
+                self.model,
                 prompt,
                 generation_config={"response_mime_type": "application/json"},
             )
@@ -0,0 +1,159 @@
+import os
+import time
+import asyncio
+from collections import Counter
+from typing import Any, AsyncIterator, Dict, List, Optional
+import httpx
+from .. import schemas
+from .playground import upstream_url
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is open-ended
+LATENCY_BUCKETS_MS = [5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+
+
+def percentile(sorted_values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
+
+
+class BatchStats:
+    """Running latency / error aggregates of a batch."""
+
+    def __init__(self, total: int):
+        self.total = total
+        self.started = time.perf_counter()
+        self.latencies_ms: List[float] = []
+        self.statuses: Counter = Counter()
+        self.errors: Counter = Counter()
+
+    @property
+    def completed(self) -> int:
+        return len(self.latencies_ms)
+
+    def add(self, latency_ms: float, status: Optional[int], error: Optional[str]):
+        self.latencies_ms.append(latency_ms)
+        if status is not None:
+            self.statuses[status] += 1
+        if error is not None:
+            self.errors[error] += 1
+
+    def progress(self) -> Dict[str, Any]:
+        elapsed = time.perf_counter() - self.started
+        return {
+            "type": "progress",
+            "completed": self.completed,
+            "total": self.total,
+            "errors": sum(self.errors.values()),
+            "elapsed_s": round(elapsed, 3),
+            "throughput_rps": round(self.completed / elapsed, 2) if elapsed else 0.0,
+        }
+
+    def summary(self) -> Dict[str, Any]:
+        latencies = sorted(self.latencies_ms)
+        histogram = Counter()
+        for value in latencies:
+            bucket = next((f"<={b}ms" for b in LATENCY_BUCKETS_MS if value <= b), f">{LATENCY_BUCKETS_MS[-1]}ms")
+            histogram[bucket] += 1
+        labels = [f"<={b}ms" for b in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]}ms"]
+        return {
+            **self.progress(),
+            "type": "result",
+            "latency_ms": {
+                "min": round(latencies[0], 3) if latencies else None,
+                "p50": percentile(latencies, 50),
+                "p95": percentile(latencies, 95),
+                "p99": percentile(latencies, 99),
+                "max": round(latencies[-1], 3) if latencies else None,
+                "mean": round(sum(latencies) / len(latencies), 3) if latencies else None,
+            },
+            "histogram": [{"bucket": label, "count": histogram[label]} for label in labels],
+            "status_codes": {str(code): n for code, n in sorted(self.statuses.items())},
+            "error_breakdown": dict(self.errors.most_common()),
+        }
+
+
+class BatchRunner:
+    """
+    Fires a request template (filled from parameter sets) count times with
+    a fixed pool of asyncio workers over the dedicated "playground-batch"
+    client (its own connection pool, see HTTPClientRegistry), and
+    yields progress events followed by a latency/throughput summary. Any
+    non-2xx status counts as an error, keyed by status; transport failures
+    are keyed by exception type.
+    """
+
+    def __init__(self, client: httpx.AsyncClient, batch: schemas.BatchExecuteRequest, progress_interval: float = 0.5):
+        self.client = client
+        self.batch = batch
+        self.progress_interval = progress_interval
+        self.max_requests = int(os.getenv("PLAYGROUND_BATCH_MAX_REQUESTS", 1000))
+        # No more workers than the batch pool has connections (PLAYGROUND_BATCH_MAX_CONNECTIONS)
+        self.max_concurrency = int(os.getenv("PLAYGROUND_BATCH_MAX_CONCURRENCY", 20))
+        self.timeout = float(os.getenv("PLAYGROUND_BATCH_TIMEOUT", 30.0))
+        self.total = batch.count or max(1, len(batch.parameter_sets))
+        self.concurrency = max(1, min(batch.concurrency, self.max_concurrency, self.total))
+        if self.total > self.max_requests:
+            raise ValueError(f"Batch of {self.total} requests exceeds the limit of {self.max_requests}")
+
+    def build(self, index: int) -> httpx.Request:
+        template = self.batch.request
+        sets = self.batch.parameter_sets
+        values = sets[index % len(sets)] if sets else schemas.ParameterSet()
+        path = template.path.format(**values.path_params) if values.path_params else template.path
+        return self.client.build_request(
+            method=template.method,
+            url=upstream_url(template, path),
+            params={**(template.params or {}), **(values.params or {})} or None,
+            headers={**(template.headers or {}), **(values.headers or {})} or None,
+            json=values.json_body if values.json_body is not None else template.json_body,
+            timeout=self.timeout,
+        )
+
+    async def _send(self, index: int) -> Dict[str, Any]:
+        status = None
+        error = None
+        start = time.perf_counter()
+        try:
+            # Latency includes reading the full body, as a client would see it
+            response = await self.client.send(self.build(index))
+            status = response.status_code
+            if status >= 400:
+                error = f"HTTP {status}"
+        except Exception as e:
+            error = type(e).__name__
+        return {"latency_ms": round((time.perf_counter() - start) * 1000, 3), "status": status, "error": error}
+
+    async def run(self) -> AsyncIterator[Dict[str, Any]]:
+        indexes: asyncio.Queue = asyncio.Queue()
+        for index in range(self.total):
+            indexes.put_nowait(index)
+        results: asyncio.Queue = asyncio.Queue()
+
+        async def worker():
+            while True:
+                try:
+                    index = indexes.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                await results.put(await self._send(index))
+
+        stats = BatchStats(self.total)
+        yield {"type": "status", "stage": "running", "total": self.total, "concurrency": self.concurrency}
+        workers = [asyncio.create_task(worker()) for _ in range(self.concurrency)]
+        try:
+            last_progress = time.perf_counter()
+            while stats.completed < self.total:
+                result = await results.get()
+                stats.add(result["latency_ms"], result["status"], result["error"])
+                if time.perf_counter() - last_progress >= self.progress_interval:
+                    last_progress = time.perf_counter()
+                    yield stats.progress()
+            yield stats.summary()
+        finally:
+            # Client went away (or we're done): stop firing requests
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
@@ -0,0 +1,300 @@
+import json
+import random
+import asyncio
+import argparse
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import unquote
+from ..parsers.openapi import APIEndpointSchema, NormalizedAPISpec
+
+# Synthesized values for string formats; anything else gets a placeholder string
+FORMAT_EXAMPLES = {
+    "date-time": "2024-01-01T00:00:00Z",
+    "date": "2024-01-01",
+    "uuid": "00000000-0000-4000-8000-000000000000",
+    "email": "user@example.com",
+    "uri": "https://example.com",
+    "url": "https://example.com",
+    "hostname": "example.com",
+    "ipv4": "127.0.0.1",
+    "byte": "ZXhhbXBsZQ==",
+}
+MAX_DEPTH = 6
+# Ceiling for the per-request X-Mock-Latency override
+MAX_LATENCY_MS = 60_000
+
+
+class _Node:
+    __slots__ = ("literals", "param", "endpoints")
+
+    def __init__(self):
+        self.literals: Dict[str, "_Node"] = {}
+        self.param: Optional["_Node"] = None
+        # METHOD -> (route payload, the template's {param} names in order) for templates ending at this node.
+        # Names live with the route: /pets/{id} and /pets/{petId}/toys share one param node
+        self.endpoints: Dict[str, Tuple[Any, List[str]]] = {}
+
+
+class RouteTrie:
+    """
+    Path-template router: one trie level per path segment, literal segments
+    preferred over {param} segments (with backtracking), so matching costs
+    O(segments) regardless of how many routes the spec has.
+    """
+
+    def __init__(self):
+        self.root = _Node()
+
+    @staticmethod
+    def _segments(path: str) -> List[str]:
+        return [s for s in path.split("/") if s]
+
+    def insert(self, method: str, template: str, payload: Any):
+        node = self.root
+        names: List[str] = []
+        for segment in self._segments(template):
+            if segment.startswith("{") and segment.endswith("}"):
+                if node.param is None:
+                    node.param = _Node()
+                names.append(segment[1:-1])
+                node = node.param
+            else:
+                node = node.literals.setdefault(segment, _Node())
+        node.endpoints[method.upper()] = (payload, names)
+
+    def match(self, method: str, path: str) -> Tuple[Optional[Any], Dict[str, str], bool]:
+        """(payload, path params, path exists) -- a known path with no such method is a 405."""
+        segments = [unquote(s) for s in self._segments(path)]
+        values: List[str] = []
+        node = self._walk(self.root, segments, 0, values)
+        if node is None:
+            return None, {}, False
+        route = node.endpoints.get(method.upper())
+        if route is None:
+            return None, {}, True
+        payload, names = route
+        return payload, dict(zip(names, values)), True
+
+    def allowed(self, path: str) -> List[str]:
+        """Methods routed for path (the Allow header of a 405)."""
+        node = self._walk(self.root, [unquote(s) for s in self._segments(path)], 0, [])
+        return sorted(node.endpoints) if node is not None else []
+
+    def _walk(self, node: _Node, segments: List[str], i: int, values: List[str]) -> Optional[_Node]:
+        if i == len(segments):
+            return node if node.endpoints else None
+        child = node.literals.get(segments[i])
+        if child is not None:
+            found = self._walk(child, segments, i + 1, values)
+            if found is not None:
+                return found
+        if node.param is not None:
+            values.append(segments[i])
+            found = self._walk(node.param, segments, i + 1, values)
+            if found is not None:
+                return found
+            values.pop()
+        return None
+
+
+class ResponseSynthesizer:
+    """Example-or-synthesized bodies from response schemas (component $refs resolved by name)."""
+
+    def __init__(self, schemas: Dict[str, Any], array_items: int = 2):
+        self.schemas = schemas
+        self.array_items = array_items
+
+    def example(self, schema: Any, depth: int = 0) -> Any:
+        if not isinstance(schema, dict) or depth > MAX_DEPTH:
+            return None
+        if "$ref" in schema:
+            return self.example(self.schemas.get(schema["$ref"].rsplit("/", 1)[-1]), depth + 1)
+        for key in ("example", "default"):
+            if key in schema:
+                return schema[key]
+        if schema.get("enum"):
+            return schema["enum"][0]
+        for key in ("allOf", "oneOf", "anyOf"):
+            if schema.get(key):
+                if key != "allOf":
+                    return self.example(schema[key][0], depth + 1)
+                merged: Dict[str, Any] = {}
+                for part in schema[key]:
+                    value = self.example(part, depth + 1)
+                    if isinstance(value, dict):
+                        merged.update(value)
+                return merged
+
+        kind = schema.get("type")
+        if isinstance(kind, list):
+            kind = next((k for k in kind if k != "null"), None)
+        if kind == "object" or (kind is None and "properties" in schema):
+            return {name: self.example(prop, depth + 1) for name, prop in (schema.get("properties") or {}).items()}
+        if kind == "array":
+            item = self.example(schema.get("items"), depth + 1)
+            return [item for _ in range(self.array_items)]
+        if kind == "integer":
+            return int(schema.get("minimum", 1))
+        if kind == "number":
+            return float(schema.get("minimum", 1.5))
+        if kind == "boolean":
+            return True
+        if kind == "string":
+            return FORMAT_EXAMPLES.get(schema.get("format"), "string")
+        return None
+
+    def response(self, responses: Dict[str, Any], status: Optional[str] = None) -> Tuple[int, Any]:
+        """(status code, body) for the requested documented status, else the first 2xx."""
+        by_code = {str(c): r for c, r in responses.items()}
+        if status is None:
+            status = next((c for c in sorted(by_code) if c.startswith("2")), None)
+        if status is None:
+            return 200, None
+        code = int(status) if status.isdigit() else 200
+        response = by_code.get(status)
+        if not isinstance(response, dict):
+            return code, None
+        if "examples" in response and isinstance(response["examples"], dict):  # Swagger 2
+            for media_type, example in response["examples"].items():
+                if "json" in media_type:
+                    return code, example
+        if "schema" in response:
+            return code, self.example(response["schema"])
+        for media_type, content in (response.get("content") or {}).items():
+            if not isinstance(content, dict):
+                continue
+            if "example" in content:
+                return code, content["example"]
+            examples = content.get("examples")
+            if isinstance(examples, dict) and examples:
+                first = next(iter(examples.values()))
+                return code, first.get("value") if isinstance(first, dict) else first
+            if "schema" in content:
+                return code, self.example(content["schema"])
+        return code, None
+
+
+class MockServer:
+    """
+    Raw ASGI app serving a NormalizedAPISpec. Routes live in a RouteTrie and
+    every 2xx body is synthesized and JSON-encoded once at build time, so a
+    request costs a trie walk and a send. Optional latency (fixed + jitter)
+    and random error injection; per request, X-Mock-Status selects another
+    documented response and X-Mock-Latency (ms) overrides the delay.
+    """
+
+    def __init__(
+        self,
+        spec: NormalizedAPISpec,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 500,
+        seed: Optional[int] = None,
+    ):
+        self.spec = spec
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.random = random.Random(seed)
+        self.synthesizer = ResponseSynthesizer(spec.schemas)
+        self.routes = RouteTrie()
+        self.requests = 0
+        for endpoint in spec.endpoints:
+            self.routes.insert(endpoint.method, endpoint.path, self._compile(endpoint))
+        self._error_body = json.dumps({"error": "injected", "message": "Mock server error injection"}).encode("utf-8")
+
+    def _compile(self, endpoint: APIEndpointSchema) -> Dict[str, Any]:
+        status, body = self.synthesizer.response(endpoint.responses or {})
+        return {"endpoint": endpoint, "status": status, "body": self._encode(status, body)}
+
+    @staticmethod
+    def _encode(status: int, body: Any) -> bytes:
+        if body is None or status == 204:
+            return b""
+        return json.dumps(body, separators=(",", ":")).encode("utf-8")
+
+    async def _send(self, send, status: int, body: bytes, extra_headers: Optional[List[Tuple[bytes, bytes]]] = None):
+        headers = [(b"content-length", str(len(body)).encode())]
+        if body:
+            headers.append((b"content-type", b"application/json"))
+        if extra_headers:
+            headers.extend(extra_headers)
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+
+    async def _detail(self, send, status: int, detail: str, extra_headers: Optional[List[Tuple[bytes, bytes]]] = None):
+        await self._send(send, status, json.dumps({"detail": detail}).encode("utf-8"), extra_headers)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            while True:
+                message = await receive()
+                if message["type"] == "lifespan.startup":
+                    await send({"type": "lifespan.startup.complete"})
+                elif message["type"] == "lifespan.shutdown":
+                    await send({"type": "lifespan.shutdown.complete"})
+                    return
+        if scope["type"] != "http":
+            return
+
+        self.requests += 1
+        headers = {k.decode("latin-1").lower(): v.decode("latin-1") for k, v in scope.get("headers", [])}
+        latency = self.latency_ms + (self.random.uniform(0, self.jitter_ms) if self.jitter_ms else 0.0)
+        if "x-mock-latency" in headers:
+            try:
+                latency = float(headers["x-mock-latency"])
+            except ValueError:
+                latency = -1.0
+            if not 0 <= latency <= MAX_LATENCY_MS:
+                return await self._detail(send, 400, f"X-Mock-Latency must be a number of ms between 0 and {MAX_LATENCY_MS}")
+        forced = headers.get("x-mock-status")
+        if forced is not None and not (forced.strip().isdigit() and 100 <= int(forced) <= 599):
+            return await self._detail(send, 400, "X-Mock-Status must be an HTTP status code")
+        if latency > 0:
+            await asyncio.sleep(latency / 1000)
+
+        route, _, known = self.routes.match(scope["method"], scope["path"])
+        if route is None:
+            if known:
+                allow = ", ".join(self.routes.allowed(scope["path"])).encode("latin-1")
+                return await self._detail(send, 405, "Method Not Allowed", [(b"allow", allow)])
+            return await self._detail(send, 404, "Not Found")
+        if self.error_rate and self.random.random() < self.error_rate:
+            return await self._send(send, self.error_status, self._error_body)
+
+        if forced is not None:
+            forced = forced.strip()
+            status, body = self.synthesizer.response(route["endpoint"].responses or {}, forced)
+            return await self._send(send, status, self._encode(status, body))
+        await self._send(send, route["status"], route["body"])
+
+
+def build_mock_app(spec: NormalizedAPISpec, **options) -> MockServer:
+    return MockServer(spec, **options)
+
+
+def main():
+    from ..parsers.openapi import OpenAPIParser
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Serve an OpenAPI spec as a local mock API")
+    parser.add_argument("spec", help="OpenAPI/Swagger file (JSON or YAML)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    app = build_mock_app(
+        OpenAPIParser().parse_file(args.spec),
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+    )
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning", access_log=False)
+
+
+if __name__ == "__main__":
+    main()
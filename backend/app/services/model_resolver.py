@@ -0,0 +1,150 @@
+import os
+import json
+import time
+import asyncio
+import hashlib
+import weakref
+import threading
+from typing import Any, Dict, Optional, Tuple
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Preference order when discovering which Gemini model the key can use
+PREFERRED_MODELS = ["models/gemini-2.0-flash", "models/gemini-1.5-flash", "models/gemini-1.5-pro", "models/gemini-pro"]
+
+
+def _api_key() -> Optional[str]:
+    api_key = os.getenv("GEMINI_API_KEY")
+    if not api_key or api_key == "your_gemini_api_key_here":
+        return None
+    return api_key
+
+
+class ModelResolver:
+    """
+    Resolves the Gemini model once per process, on first use, and shares it
+    between the parser and the translator. The discovered name is persisted
+    to disk (keyed by a hash of the API key) so restarts skip list_models;
+    failed lookups are not retried more often than retry_interval.
+    GEMINI_MODEL pins the model and skips discovery entirely.
+
+    Async callers await ensure(), which runs the (blocking) lookup in a
+    worker thread; model / model_name are non-blocking snapshots of whatever
+    has been resolved for the current key so far.
+    """
+
+    def __init__(self, cache_path: Optional[str] = None, ttl: Optional[float] = None, retry_interval: Optional[float] = None):
+        self.cache_path = cache_path or os.getenv("GEMINI_MODEL_CACHE", ".doc2sdk_cache/gemini_model.json")
+        self.ttl = ttl if ttl is not None else float(os.getenv("GEMINI_MODEL_CACHE_TTL", 24 * 3600))
+        self.retry_interval = retry_interval if retry_interval is not None else float(os.getenv("GEMINI_MODEL_RETRY_INTERVAL", 60))
+        self._lock = threading.Lock()
+        # One asyncio.Lock per event loop (API loop, job worker loops)
+        self._async_locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock]" = weakref.WeakKeyDictionary()
+        self._key_hash: Optional[str] = None
+        self._model_name: Optional[str] = None
+        self._model: Any = None
+        self._failed_at: Optional[float] = None
+
+    @staticmethod
+    def _current_key() -> Tuple[Optional[str], Optional[str]]:
+        api_key = _api_key()
+        if api_key is None:
+            return None, None
+        return api_key, hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+
+    @property
+    def model_name(self) -> Optional[str]:
+        _, key_hash = self._current_key()
+        return self._model_name if key_hash is not None and key_hash == self._key_hash else None
+
+    @property
+    def model(self) -> Any:
+        _, key_hash = self._current_key()
+        return self._model if key_hash is not None and key_hash == self._key_hash else None
+
+    def _settled(self, key_hash: Optional[str]) -> bool:
+        """Nothing to do right now: no key, already resolved, or inside the retry back-off."""
+        if key_hash is None:
+            return True
+        if key_hash != self._key_hash:
+            return False
+        if self._model is not None:
+            return True
+        return self._failed_at is not None and time.monotonic() - self._failed_at < self.retry_interval
+
+    async def ensure(self) -> Any:
+        """Resolves the model off the event loop if needed; returns it (None when unavailable)."""
+        _, key_hash = self._current_key()
+        if not self._settled(key_hash):
+            loop = asyncio.get_running_loop()
+            lock = self._async_locks.get(loop)
+            if lock is None:
+                lock = self._async_locks[loop] = asyncio.Lock()
+            async with lock:
+                if not self._settled(key_hash):
+                    await asyncio.to_thread(self.resolve)
+        return self.model
+
+    def resolve(self):
+        """Blocking resolution (may call list_models); use ensure() from async code."""
+        api_key, key_hash = self._current_key()
+        if api_key is None:
+            return
+        with self._lock:
+            if key_hash != self._key_hash:
+                # Key changed (or first use): forget everything resolved for the old one
+                self._key_hash, self._model_name, self._model, self._failed_at = key_hash, None, None, None
+            if self._settled(key_hash):
+                return
+            try:
+                import google.generativeai as genai
+                genai.configure(api_key=api_key)
+                name = os.getenv("GEMINI_MODEL") or self._read_cache(key_hash) or self._discover(genai, key_hash)
+                if not name:
+                    self._failed_at = time.monotonic()
+                    return
+                self._model = genai.GenerativeModel(name)
+                self._model_name = name
+                self._failed_at = None
+                print(f"DEBUG: Initialized with model: {name}")
+            except Exception as e:
+                print(f"DEBUG: Failed to initialize Gemini model: {str(e)}")
+                self._failed_at = time.monotonic()
+
+    def _discover(self, genai, key_hash: str) -> Optional[str]:
+        models = [m.name for m in genai.list_models() if "gemini" in m.name]
+        name = next((p for p in PREFERRED_MODELS if p in models), models[0] if models else None)
+        if name:
+            self._write_cache(key_hash, name)
+        return name
+
+    def _read_cache(self, key_hash: str) -> Optional[str]:
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                entry: Dict[str, Any] = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.get("key") != key_hash or time.time() - entry.get("resolved_at", 0) > self.ttl:
+            return None
+        return entry.get("model")
+
+    def _write_cache(self, key_hash: str, name: str):
+        try:
+            os.makedirs(os.path.dirname(self.cache_path) or ".", exist_ok=True)
+            tmp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"key": key_hash, "model": name, "resolved_at": time.time()}, f)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            print(f"DEBUG: Could not persist Gemini model choice: {str(e)}")
+
+
+_resolver: Optional[ModelResolver] = None
+
+
+def get_model_resolver() -> ModelResolver:
+    global _resolver
+    if _resolver is None:
+        _resolver = ModelResolver()
+    return _resolver
@@ -0,0 +1,200 @@
+import os
+import json
+import hashlib
+import asyncio
+from typing import Any, Callable, Dict, Optional, Tuple
+from fastapi import Request
+from .. import schemas
+from .scraper import FetchResult, ScraperService
+from .crawler import DocCrawler, canonicalize_url
+from .llm_parser import LLMParserService
+from .llm_client import cancel_on_disconnect
+from ..generators.sdk_gen import CodeGenerator, GENERATOR_VERSION, diff_manifests
+from ..parsers.openapi import NormalizedAPISpec, OpenAPIParser
+from ..core.cache import ResultCache, get_result_cache, make_cache_key
+from ..core.http import HTTPClientRegistry
+
+ProgressCallback = Callable[[str], None]
+CRAWL_CACHE_TTL = float(os.getenv("CRAWL_CACHE_TTL", 900))
+
+
+class GenerationPipeline:
+    """
+    scrape -> parse -> generate, shared by the HTTP endpoints and the
+    background job worker. http_request is optional: when given, LLM work is
+    cancelled if that client disconnects.
+    """
+
+    def __init__(
+        self,
+        parser_service: Optional[LLMParserService] = None,
+        code_generator: Optional[CodeGenerator] = None,
+        result_cache: Optional[ResultCache] = None,
+    ):
+        self.parser_service = parser_service or LLMParserService()
+        self.code_generator = code_generator or CodeGenerator()
+        self.result_cache = result_cache or get_result_cache()
+
+    @staticmethod
+    def request_key(request: schemas.GenerateRequest) -> str:
+        """Identity of a generation request: normalized source URL, crawl options, generator version."""
+        payload = {**request.model_dump(), "source_url": canonicalize_url(request.source_url), "generator": GENERATOR_VERSION}
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def parser_path(self, is_raw_spec: bool) -> str:
+        """Cache-key component; call after parser_service.ensure_model() so model_name is settled."""
+        return "openapi" if is_raw_spec else f"llm:{self.parser_service.model_name}"
+
+    async def fetch(self, url: str, clients: HTTPClientRegistry) -> FetchResult:
+        """Conditional fetch that only reuses stored specs from the current parser path."""
+        await self.parser_service.ensure_model()
+        return await ScraperService.fetch(url, clients=clients, llm_parser=self.parser_path(False))
+
+    def cache_key(self, fetched: FetchResult) -> str:
+        """Keyed on document content, parser path and generator version."""
+        return make_cache_key(fetched.digest, self.parser_path(fetched.is_raw_spec), GENERATOR_VERSION)
+
+    async def parse_fetched(self, fetched: FetchResult, http_request: Optional[Request] = None) -> Tuple[NormalizedAPISpec, Dict[str, Any]]:
+        """Turns a fetched document into a normalized spec plus its source/is_mock metadata."""
+        if fetched.spec is not None:
+            # Document unchanged since the last fetch: reuse its normalized spec
+            spec = NormalizedAPISpec(**fetched.spec)
+            return spec, {"source": fetched.spec.get("source"), "is_mock": fetched.spec.get("is_mock", False)}
+        if fetched.is_raw_spec:
+            # Use deterministic parser for raw specs
+            parser = OpenAPIParser()
+            try:
+                # Raw body bytes go straight to the (streaming) parser
+                spec = parser.parse(fetched.body)
+            except Exception as e:
+                if fetched.page_html is None:
+                    raise
+                # A docs-generator page pointed at something OpenAPIParser rejects: read the page instead
+                print(f"DEBUG: {fetched.generator} spec from {fetched.url} did not parse ({str(e)}); using the page text")
+                await self._use_page(fetched)
+                cached = await self.result_cache.aget(self.cache_key(fetched))
+                if cached is not None:
+                    return NormalizedAPISpec(**cached["spec"]), {"source": cached.get("source"), "is_mock": cached.get("is_mock", False)}
+            else:
+                source = f"{fetched.generator}_embedded_spec" if fetched.generator else "direct_openapi_parser"
+                return spec, {"source": source, "is_mock": False}
+        # Use LLM for unstructured text
+        spec_dict = await cancel_on_disconnect(http_request, self.parser_service.parse_docs(fetched.text))
+        # Normalize for generator
+        spec = NormalizedAPISpec(**spec_dict)
+        return spec, {"source": spec_dict.get("source"), "is_mock": spec_dict.get("is_mock", False)}
+
+    @staticmethod
+    async def _use_page(fetched: FetchResult):
+        """Turns an embedded-spec FetchResult back into its docs page, for LLM extraction."""
+        fetched.text = await ScraperService.clean_html_async(fetched.page_html)
+        fetched.digest = fetched.page_digest
+        fetched.is_raw_spec, fetched.body, fetched.generator = False, None, None
+        fetched.page_html = fetched.page_digest = None
+
+    async def crawl_spec(self, request: schemas.GenerateRequest, clients: HTTPClientRegistry, http_request: Optional[Request] = None) -> Tuple[NormalizedAPISpec, Dict[str, Any]]:
+        """Multi-page docs: pages stream from the crawler straight into LLM extraction."""
+        crawler = DocCrawler(clients, max_pages=request.max_pages, max_depth=request.max_depth)
+        pages = (page.text async for page in crawler.crawl(request.source_url))
+        spec_dict = await cancel_on_disconnect(http_request, self.parser_service.parse_pages(pages))
+        spec = NormalizedAPISpec(**spec_dict)
+        return spec, {"source": spec_dict.get("source"), "is_mock": spec_dict.get("is_mock", False)}
+
+    async def resolve_spec(self, request: schemas.GenerateRequest, clients: HTTPClientRegistry, http_request: Optional[Request] = None) -> NormalizedAPISpec:
+        """Crawl, or fetch + parse, reusing a cached result for unchanged documents."""
+        if request.crawl:
+            spec, _ = await self.crawl_spec(request, clients, http_request)
+            return spec
+        fetched = await self.fetch(request.source_url, clients)
+        cached = await self.result_cache.aget(self.cache_key(fetched))
+        if cached is not None:
+            return NormalizedAPISpec(**cached["spec"])
+        spec, _ = await self.parse_fetched(fetched, http_request)
+        return spec
+
+    async def generate(
+        self,
+        request: schemas.GenerateRequest,
+        clients: HTTPClientRegistry,
+        http_request: Optional[Request] = None,
+        progress: Optional[ProgressCallback] = None,
+    ) -> schemas.GenerateResponse:
+        progress = progress or (lambda stage: None)
+        # Manifests are per request (URL + crawl options), so a crawl and a single-page run don't diff each other
+        manifest_key = "manifest:" + self.request_key(request)
+        if request.crawl:
+            await self.parser_service.ensure_model()
+            # Crawls span many documents, so they're keyed on the request (plus model) with a short TTL
+            cache_key = f"crawl:{self.request_key(request)}:{self.parser_path(False)}"
+            cached = await self.result_cache.aget(cache_key)
+            if cached is not None:
+                return await asyncio.to_thread(self._cached_response, cached, manifest_key)
+            progress("crawling")
+            spec, meta = await self.crawl_spec(request, clients, http_request)
+            progress("generating")
+            result, manifest = await asyncio.to_thread(self._response, spec, {**spec.model_dump(), **meta}, manifest_key)
+            await self.result_cache.aset(cache_key, self._cache_entry(result, manifest), ttl=CRAWL_CACHE_TTL)
+            return result
+
+        # 1. Scrape (conditional: unchanged documents come back with their stored spec)
+        progress("fetching")
+        fetched = await self.fetch(request.source_url, clients)
+
+        cached = await self.result_cache.aget(self.cache_key(fetched))
+        if cached is not None:
+            return await asyncio.to_thread(self._cached_response, cached, manifest_key)
+
+        # 2. Parse
+        progress("parsing")
+        spec, meta = await self.parse_fetched(fetched, http_request)
+        spec_dict = {**spec.model_dump(), **meta}
+        ScraperService.remember_spec(request.source_url, fetched.digest, spec_dict, self.parser_path(fetched.is_raw_spec))
+
+        # 3. Generate Python SDK
+        progress("generating")
+        # Hashing / assembly is linear in the endpoint count; keep it off the event loop
+        result, manifest = await asyncio.to_thread(self._response, spec, spec_dict, manifest_key)
+        # Re-keyed: parse_fetched may have fallen back from an embedded spec to the page
+        await self.result_cache.aset(self.cache_key(fetched), self._cache_entry(result, manifest))
+        return result
+
+    @staticmethod
+    def _cache_entry(result: schemas.GenerateResponse, manifest: Dict[str, str]) -> Dict[str, Any]:
+        # changes is relative to the run that produced it; the manifest lets a hit diff against its own request's last run
+        return {**result.model_dump(exclude={"changes"}), "manifest": manifest}
+
+    def _changes(self, manifest_key: str, manifest: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        """Diff against the previous run of the same request (None on the first) and remember this run."""
+        fragments = self.code_generator.fragment_cache
+        previous = fragments.get(manifest_key)
+        fragments.set(manifest_key, {"endpoints": manifest})
+        return diff_manifests(previous["endpoints"], manifest) if previous else None
+
+    def _cached_response(self, cached: Dict[str, Any], manifest_key: str) -> schemas.GenerateResponse:
+        manifest = cached.get("manifest")
+        response = {k: v for k, v in cached.items() if k not in ("manifest", "changes")}
+        return schemas.GenerateResponse(**response, changes=self._changes(manifest_key, manifest) if manifest is not None else None)
+
+    def _response(self, spec: NormalizedAPISpec, spec_dict: Dict[str, Any], manifest_key: str) -> Tuple[schemas.GenerateResponse, Dict[str, str]]:
+        # Re-renders only endpoints whose fragments aren't cached
+        result = self.code_generator.generate_sdk_incremental(spec, "python")
+        response = schemas.GenerateResponse(
+            name=spec.name,
+            version=spec.version,
+            spec=spec_dict,
+            sdk_code=result["code"],
+            is_mock=spec_dict.get("is_mock", False),
+            source=spec_dict.get("source"),
+            changes=self._changes(manifest_key, result["manifest"]),
+        )
+        return response, result["manifest"]
+
+_pipeline: Optional[GenerationPipeline] = None
+
+
+def get_pipeline() -> GenerationPipeline:
+    """Process-wide pipeline shared by the API routes and background jobs."""
+    global _pipeline
+    if _pipeline is None:
+        _pipeline = GenerationPipeline()
+    return _pipeline
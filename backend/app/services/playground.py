@@ -0,0 +1,247 @@
+import os
+import json
+import time
+import hashlib
+from typing import Any, AsyncIterator, Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+import httpx
+from fastapi import HTTPException
+from fastapi.responses import Response, StreamingResponse
+from .. import schemas
+from ..core.cache import ResultCache, get_playground_cache
+from ..core.http import HTTPClientRegistry
+
+# Connection-level headers that must not be forwarded by a proxy (RFC 9110 7.6.1)
+HOP_BY_HOP = {
+    "connection", "keep-alive", "proxy-authenticate", "proxy-authorization",
+    "te", "trailer", "transfer-encoding", "upgrade",
+}
+
+
+class StreamAborted(Exception):
+    """
+    Raised from a pass-through body to abort the client connection, so a
+    truncated stream can't be mistaken for a complete (cleanly terminated) one.
+    """
+
+
+def upstream_url(request: schemas.ExecuteRequest, path: Optional[str] = None) -> str:
+    return request.base_url.rstrip("/") + "/" + (path if path is not None else request.path).lstrip("/")
+
+
+class PlaygroundProxy:
+    """
+    Pass-through mode for /playground/execute: the upstream status, headers
+    and body chunks are forwarded as they arrive instead of being buffered
+    into an ExecuteResponse. Bodies are capped at max_body_bytes and the
+    stream is dropped when upstream sends nothing for idle_timeout seconds;
+    both abort the client connection mid-body rather than ending it cleanly.
+    Translation runs only when asked for, on JSON bodies that fit in
+    translate_max_bytes.
+    """
+
+    def __init__(
+        self,
+        max_body_bytes: int = 50 * 1024 * 1024,
+        idle_timeout: float = 30.0,
+        connect_timeout: float = 10.0,
+        translate_max_bytes: int = 1024 * 1024,
+    ):
+        self.max_body_bytes = max_body_bytes
+        self.idle_timeout = idle_timeout
+        self.connect_timeout = connect_timeout
+        self.translate_max_bytes = translate_max_bytes
+
+    @classmethod
+    def from_env(cls) -> "PlaygroundProxy":
+        return cls(
+            max_body_bytes=int(os.getenv("PLAYGROUND_MAX_BODY_BYTES", 50 * 1024 * 1024)),
+            idle_timeout=float(os.getenv("PLAYGROUND_IDLE_TIMEOUT", 30.0)),
+            connect_timeout=float(os.getenv("PLAYGROUND_CONNECT_TIMEOUT", 10.0)),
+            translate_max_bytes=int(os.getenv("PLAYGROUND_TRANSLATE_MAX_BYTES", 1024 * 1024)),
+        )
+
+    @staticmethod
+    def _headers(response: httpx.Response, drop_length: bool = False) -> Dict[str, str]:
+        headers = {k: v for k, v in response.headers.items() if k.lower() not in HOP_BY_HOP}
+        if drop_length:
+            headers.pop("content-length", None)
+        return headers
+
+    async def forward(self, request: schemas.ExecuteRequest, clients: HTTPClientRegistry, translator=None) -> Response:
+        client = clients.get("playground")
+        upstream = client.build_request(
+            method=request.method,
+            url=upstream_url(request),
+            params=request.params,
+            headers=request.headers,
+            json=request.json_body,
+            # read is per chunk, so it acts as the idle timeout of the stream
+            timeout=httpx.Timeout(self.idle_timeout, connect=self.connect_timeout),
+        )
+        try:
+            # The host slot covers connect + headers only; a long-lived feed must not hold it
+            async with clients.host_slot(str(upstream.url)):
+                response = await client.send(upstream, stream=True)
+        except httpx.HTTPError as e:
+            raise HTTPException(status_code=502, detail=f"Request failed: {str(e)}")
+
+        declared = response.headers.get("content-length")
+        if declared and declared.isdigit() and int(declared) > self.max_body_bytes:
+            await response.aclose()
+            raise HTTPException(status_code=413, detail=f"Upstream body of {declared} bytes exceeds the {self.max_body_bytes} byte limit")
+
+        if translator is None or "json" not in response.headers.get("content-type", ""):
+            return StreamingResponse(
+                self._body(response.aiter_raw(), response),
+                status_code=response.status_code,
+                headers=self._headers(response),
+            )
+
+        # Translation needs the decoded body; whatever is forwarded from here on is decoded too
+        chunks = response.aiter_bytes()
+        prefix, complete = await self._read_bounded(chunks, response)
+        headers = self._headers(response, drop_length=True)
+        headers.pop("content-encoding", None)
+        if complete:
+            return await self._translated(response.status_code, headers, prefix, translator)
+        return StreamingResponse(self._body(chunks, response, prefix), status_code=response.status_code, headers=headers)
+
+    async def _read_bounded(self, body: AsyncIterator[bytes], response: httpx.Response):
+        """Reads up to translate_max_bytes; (bytes read, whether that was the whole body)."""
+        chunks = []
+        size = 0
+        try:
+            async for chunk in body:
+                chunks.append(chunk)
+                size += len(chunk)
+                if size > self.translate_max_bytes:
+                    return b"".join(chunks), False
+        except httpx.HTTPError:
+            await response.aclose()
+            raise HTTPException(status_code=504, detail="Upstream stalled before the body was complete")
+        await response.aclose()
+        return b"".join(chunks), True
+
+    @staticmethod
+    async def _translated(status_code: int, headers: Dict[str, str], body: bytes, translator) -> Response:
+        try:
+            data = json.loads(body)
+        except ValueError:
+            return Response(body, status_code=status_code, headers=headers)
+        translated = await translator.translate_response(data)
+        return Response(
+            json.dumps(translated, ensure_ascii=False).encode("utf-8"),
+            status_code=status_code,
+            headers={**headers, "content-type": "application/json"},
+        )
+
+    async def _body(self, chunks: AsyncIterator[bytes], response: httpx.Response, prefix: bytes = b"") -> AsyncIterator[bytes]:
+        sent = len(prefix)
+        try:
+            if prefix:
+                yield prefix
+            async for chunk in chunks:
+                sent += len(chunk)
+                if sent > self.max_body_bytes:
+                    print(f"DEBUG: Playground proxy cut {response.url} at {self.max_body_bytes} bytes")
+                    raise StreamAborted(f"Upstream body exceeds the {self.max_body_bytes} byte limit")
+                yield chunk
+        except httpx.ReadTimeout:
+            print(f"DEBUG: Playground proxy closed {response.url}: idle for {self.idle_timeout}s")
+            raise StreamAborted(f"Upstream idle for {self.idle_timeout}s")
+        finally:
+            await response.aclose()
+
+
+RECORD_MODES = ("off", "record", "replay")
+# Per-call noise left out of the key; every other request header (cookies, any credential) is part of it
+VOLATILE_HEADERS = {
+    "user-agent", "date", "content-length", "request-id", "x-request-id", "x-correlation-id", "traceparent", "tracestate",
+}
+# Methods recorded without asking; replaying anything else means a repeated call never reaches upstream
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+class PlaygroundRecorder:
+    """
+    Opt-in record/replay of buffered playground calls. "record" replays a
+    recorded response when there is one and records misses; "replay" never
+    goes upstream (offline demos, CI). Only GET/HEAD/OPTIONS take part
+    unless the call sets record_unsafe. Recordings are keyed by method,
+    normalized URL + sorted query, every request header except
+    VOLATILE_HEADERS (hashed, so credentials aren't stored), a hash of the
+    JSON body and whether the response is translated; they live in a local
+    LRU in front of a TTL-bounded disk store, built on first use so the
+    store doesn't exist until a call asks for recording.
+    """
+
+    def __init__(self, cache: Optional[ResultCache] = None, default_mode: Optional[str] = None):
+        self._cache = cache
+        self.default_mode = (default_mode or os.getenv("PLAYGROUND_RECORD_MODE", "off")).lower()
+
+    @property
+    def cache(self) -> ResultCache:
+        if self._cache is None:
+            self._cache = get_playground_cache()
+        return self._cache
+
+    def stats(self) -> Optional[Dict[str, Any]]:
+        """Cache stats, or None while nothing has been recorded or replayed."""
+        return self._cache.stats() if self._cache is not None else None
+
+    def mode(self, request: schemas.ExecuteRequest) -> str:
+        mode = (request.record_mode or self.default_mode).lower()
+        if mode not in RECORD_MODES:
+            raise HTTPException(status_code=400, detail=f"Unknown record_mode: {mode}")
+        if mode != "off" and request.method.upper() not in SAFE_METHODS and not request.record_unsafe:
+            if mode == "replay":
+                raise HTTPException(status_code=404, detail=f"{request.method.upper()} calls are only replayed with record_unsafe set")
+            return "off"
+        return mode
+
+    @staticmethod
+    def key(request: schemas.ExecuteRequest) -> str:
+        parts = urlsplit(upstream_url(request))
+        scheme = parts.scheme.lower()
+        netloc = parts.netloc.lower()
+        if (scheme == "http" and netloc.endswith(":80")) or (scheme == "https" and netloc.endswith(":443")):
+            netloc = netloc.rsplit(":", 1)[0]
+        query = parse_qsl(parts.query, keep_blank_values=True)
+        query += [(k, str(v)) for k, v in (request.params or {}).items()]
+        headers = {k.lower(): str(v) for k, v in (request.headers or {}).items() if k.lower() not in VOLATILE_HEADERS}
+        identity = {
+            "method": request.method.upper(),
+            "url": urlunsplit((scheme, netloc, parts.path or "/", urlencode(sorted(query)), "")),
+            "headers": sorted(headers.items()),
+            "body": hashlib.sha256(json.dumps(request.json_body, sort_keys=True).encode("utf-8")).hexdigest(),
+            # Recordings hold the response as returned, so translated and raw bodies are separate entries
+            "translate": request.translate is not False,
+        }
+        return "playground:" + hashlib.sha256(json.dumps(identity, sort_keys=True).encode("utf-8")).hexdigest()
+
+    async def lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        return await self.cache.aget(key)
+
+    async def record(self, key: str, status_code: int, data: Any, is_json: bool):
+        # Server errors are transient; replaying them would pin a bad response
+        if status_code < 500:
+            await self.cache.aset(key, {"status_code": status_code, "data": data, "is_json": is_json, "recorded_at": time.time()})
+
+
+_proxy: Optional[PlaygroundProxy] = None
+_recorder: Optional[PlaygroundRecorder] = None
+
+
+def get_playground_proxy() -> PlaygroundProxy:
+    global _proxy
+    if _proxy is None:
+        _proxy = PlaygroundProxy.from_env()
+    return _proxy
+
+
+def get_playground_recorder() -> PlaygroundRecorder:
+    global _recorder
+    if _recorder is None:
+        _recorder = PlaygroundRecorder()
+    return _recorder
@@ -1,75 +1,295 @@
-import httpx
-from bs4 import BeautifulSoup
+import os
+import json
+import hashlib
 import re
+import asyncio
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+from urllib.parse import urljoin
+from ..core.cache import DiskCache, LRUCache
+from ..core.http import HTTPClientRegistry
+from .extractors import get_extractor
+from .doc_generators import EmbeddedSpec, find_embedded_spec, find_in_swagger_script
+from ..parsers.postman import is_postman_collection, postman_to_openapi
+
+# Pages smaller than this are cleaned inline; thread hand-off costs more than it saves
+INLINE_CLEAN_LIMIT = 64 * 1024
+# Initializer script -> swagger-config -> spec is the longest chain seen in practice
+MAX_EMBEDDED_HOPS = 3
+# A linked document is only taken for a spec when its head looks like one (not a JS bundle)
+_SPEC_HEAD = re.compile(rb'''\A\s*\{.*?["'](?:openapi|swagger)["']\s*:|^(?:openapi|swagger)\s*:''', re.DOTALL | re.MULTILINE)
+
+
+@dataclass
+class FetchResult:
+    url: str
+    digest: str
+    is_raw_spec: bool
+    text: Optional[str] = None
+    # Raw spec bytes (JSON/YAML), handed to OpenAPIParser as-is
+    body: Optional[bytes] = None
+    not_modified: bool = False
+    # Normalized spec stored from a previous run; set only when the document is unchanged
+    spec: Optional[Dict[str, Any]] = None
+    # Docs generator (swagger-ui, redoc, ...) whose page carried the spec in body
+    generator: Optional[str] = None
+    # The docs page itself (and its digest) when body came from a generator, for LLM fallback
+    page_html: Optional[str] = None
+    page_digest: Optional[str] = None
+
+
+class FetchValidatorStore:
+    """
+    Remembers ETag / Last-Modified / body digest per URL together with the
+    normalized spec that was produced from that body and the parser path
+    ("openapi" or "llm:<model>") that produced it. Records live in a bounded
+    in-memory LRU and, if SCRAPER_VALIDATOR_DIR is set, on disk so nightly
+    refreshes survive restarts.
+    """
+
+    def __init__(self, directory: Optional[str] = None, ttl: float = 30 * 24 * 3600, max_entries: int = 1024, max_bytes: int = 64 * 1024 * 1024):
+        self._records = LRUCache(max_entries=max_entries, max_bytes=max_bytes, ttl=ttl)
+        self._disk = DiskCache(directory, ttl=ttl) if directory else None
+
+    @classmethod
+    def from_env(cls) -> "FetchValidatorStore":
+        return cls(
+            os.getenv("SCRAPER_VALIDATOR_DIR"),
+            max_entries=int(os.getenv("SCRAPER_VALIDATOR_MAX_ENTRIES", 1024)),
+            max_bytes=int(os.getenv("SCRAPER_VALIDATOR_MAX_BYTES", 64 * 1024 * 1024)),
+        )
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def reusable(record: Optional[Dict[str, Any]], llm_parser: Optional[str]) -> bool:
+        """Whether the record's spec came from the parser path this body would take now."""
+        if not record or record.get("spec") is None:
+            return False
+        expected = "openapi" if record.get("is_raw_spec") else llm_parser
+        return expected is not None and record.get("parser") == expected
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        record = self._records.get(url)
+        if record is None and self._disk is not None:
+            payload = self._disk.get(self._key(url))
+            if payload is not None:
+                record = json.loads(payload)
+                self._records.set(url, record, size=len(payload))
+        return record
+
+    def put(self, url: str, record: Dict[str, Any]):
+        payload = json.dumps(record, default=str)
+        self._records.set(url, record, size=len(payload))
+        if self._disk is not None:
+            self._disk.set(self._key(url), payload)
+
 
 class ScraperService:
+    validators = FetchValidatorStore.from_env()
+
     @staticmethod
-    async def scrape(url: str) -> str:
-        async with httpx.AsyncClient(follow_redirects=True) as client:
+    async def scrape(url: str, clients: Optional[HTTPClientRegistry] = None) -> str:
+        result = await ScraperService.fetch(url, conditional=False, clients=clients)
+        if result.is_raw_spec:
+            return f"RAW_SPEC_JSON:\n{result.body.decode('utf-8', errors='replace')}"
+        return result.text
+
+    @staticmethod
+    async def fetch(
+        url: str,
+        conditional: bool = True,
+        clients: Optional[HTTPClientRegistry] = None,
+        llm_parser: Optional[str] = None,
+    ) -> FetchResult:
+        """
+        Fetches a documentation URL. With conditional=True, validators from
+        the last successful parse are sent, and a 304 or an identical body
+        digest returns the stored normalized spec instead of the text.
+        Specs extracted by the LLM are only reused when llm_parser (the
+        current "llm:<model>" path) produced them.
+        Pass the app's shared client registry to reuse pooled connections.
+        """
+        if clients is None:
+            async with HTTPClientRegistry() as clients:
+                return await ScraperService.fetch(url, conditional, clients, llm_parser)
+
+        record = ScraperService.validators.get(url) if conditional else None
+        reusable = FetchValidatorStore.reusable(record, llm_parser)
+        headers = {}
+        if reusable:
+            if record.get("etag"):
+                headers["If-None-Match"] = record["etag"]
+            if record.get("last_modified"):
+                headers["If-Modified-Since"] = record["last_modified"]
+
+        client = clients.get("scraper")
+        try:
+            async with clients.host_slot(url):
+                response = await client.get(url, headers=headers, timeout=30.0)
+            if response.status_code == 304 and headers:
+                return FetchResult(
+                    url=url,
+                    digest=record["digest"],
+                    is_raw_spec=record["is_raw_spec"],
+                    not_modified=True,
+                    spec=record["spec"],
+                )
+            response.raise_for_status()
+
+            body = response.content
+            # Direct detection of API specs (JSON/YAML)
+            content_type = response.headers.get("content-type", "").lower()
+            is_raw_spec = (
+                "application/json" in content_type
+                or "yaml" in content_type
+                or url.split("?", 1)[0].endswith((".json", ".yaml", ".yml"))
+            )
+            validators = {"etag": response.headers.get("etag"), "last_modified": response.headers.get("last-modified")}
+
+            # Rendered Swagger UI / Redoc / Stoplight / Postman pages: use their spec, skip the LLM
+            generator = None
+            page_digest = hashlib.sha256(body).hexdigest()
+            embedded = None if is_raw_spec else await ScraperService.find_embedded_async(response.text, url)
+            if embedded is not None:
+                try:
+                    spec_body = await ScraperService.fetch_embedded(embedded, clients)
+                except Exception as e:
+                    print(f"DEBUG: Could not resolve {embedded.generator} spec on {url}: {str(e)}")
+                    spec_body = None
+                if spec_body is not None:
+                    print(f"DEBUG: Found {embedded.generator} spec on {url}")
+                    body, is_raw_spec, generator = spec_body, True, embedded.generator
+                    if embedded.url:
+                        # The page's validators say nothing about a linked spec; rely on the digest
+                        validators = {"etag": None, "last_modified": None}
+            digest = hashlib.sha256(body).hexdigest()
+
+            if conditional:
+                unchanged = reusable and record.get("digest") == digest
+                ScraperService.validators.put(url, {
+                    **validators,
+                    "digest": digest,
+                    "is_raw_spec": is_raw_spec,
+                    "spec": record["spec"] if unchanged else None,
+                    "parser": record.get("parser") if unchanged else None,
+                })
+                if unchanged:
+                    return FetchResult(
+                        url=url,
+                        digest=digest,
+                        is_raw_spec=is_raw_spec,
+                        not_modified=True,
+                        spec=record["spec"],
+                        generator=generator,
+                    )
+
+            if is_raw_spec:
+                return FetchResult(
+                    url=url,
+                    digest=digest,
+                    is_raw_spec=True,
+                    body=body,
+                    generator=generator,
+                    page_html=response.text if generator else None,
+                    page_digest=page_digest if generator else None,
+                )
+
+            html = response.text
+        except Exception as e:
+            raise ValueError(f"Failed to fetch documentation from {url}: {str(e)}")
+
+        return FetchResult(
+            url=url,
+            digest=digest,
+            is_raw_spec=False,
+            text=await ScraperService.clean_html_async(html),
+        )
+
+    @staticmethod
+    async def fetch_embedded(embedded: EmbeddedSpec, clients: HTTPClientRegistry) -> Optional[bytes]:
+        """
+        Follows an EmbeddedSpec to the spec bytes (Postman collections are
+        converted to OpenAPI). Returns None when it can't be resolved, so the
+        page falls back to LLM extraction; fetch() treats errors the same way.
+        """
+        client = clients.get("scraper")
+        for _ in range(MAX_EMBEDDED_HOPS + 1):
+            if embedded.document is not None:
+                return embedded.document
             try:
-                response = await client.get(url, timeout=30.0)
+                async with clients.host_slot(embedded.url):
+                    response = await client.get(embedded.url, timeout=30.0)
                 response.raise_for_status()
-                
-                # Direct detection of API specs (JSON)
-                content_type = response.headers.get("content-type", "").lower()
-                if "application/json" in content_type or url.endswith(".json"):
-                    return f"RAW_SPEC_JSON:\n{response.text}"
-                
-                html = response.text
             except Exception as e:
-                raise ValueError(f"Failed to fetch documentation from {url}: {str(e)}")
-
-        soup = BeautifulSoup(html, 'html.parser')
-
-        # Remove irrelevant elements
-        for element in soup(['script', 'style', 'nav', 'footer', 'aside', 'header', 'iframe']):
-            element.decompose()
-
-        # Extract text and code blocks
-        # We want to preserve structure roughly
-        text_content = []
-        
-        # Helper to process a node
-        def process_node(node):
-            if node.name in ['script', 'style', 'nav', 'footer', 'aside', 'header', 'iframe', 'svg']:
-                return ""
-            
-            text = ""
-            if node.name in ['h1', 'h2', 'h3', 'h4']:
-                text = f"\n\n### {node.get_text().strip()} ###\n"
-            elif node.name in ['pre', 'code']:
-                text = f"\n```\n{node.get_text().strip()}\n```\n"
-            elif node.name == 'table':
-                # Attempt to format table as text
-                rows = []
-                for tr in node.find_all('tr'):
-                    cells = [td.get_text().strip() for td in tr.find_all(['td', 'th'])]
-                    rows.append(" | ".join(cells))
-                text = "\n" + "\n".join(rows) + "\n"
-            elif node.name in ['p', 'li', 'div', 'span']:
-                 # Only add meaningful text
-                 t = node.get_text().strip()
-                 if len(t) > 2: # Reduce noise
-                    text = f"{t}\n"
-            
-            return text
-
-        # Instead of finding specific tags, iterate over main content areas or just body
-        # But to keep it simple and robust, let's target the likely content containers
-        # If we can't find a main container, we fallback to body
-        content_root = soup.find('main') or soup.find('article') or soup.find('body')
-        
-        if content_root:
-            # Get text with separator to preserve some layout
-            # separator=" " might merge too much, so we stick to our manual iteration or use get_text
-            cleaned_text = content_root.get_text(separator="\n", strip=True)
-        else:
-             # Fallback
-             cleaned_text = soup.get_text(separator="\n", strip=True)
+                print(f"DEBUG: Could not fetch {embedded.generator} spec from {embedded.url}: {str(e)}")
+                return None
+
+            if embedded.kind == "script":
+                embedded = find_in_swagger_script(response.text, embedded.url)
+                if embedded is None:
+                    return None
+                continue
+            if embedded.kind in ("swagger-config", "postman"):
+                try:
+                    document = response.json()
+                except ValueError:
+                    return None
+                if embedded.kind == "postman":
+                    return json.dumps(postman_to_openapi(document)).encode("utf-8") if is_postman_collection(document) else None
+                if not isinstance(document, dict):
+                    return None
+                urls = document.get("urls")
+                first = urls[0] if isinstance(urls, list) and urls and isinstance(urls[0], dict) else {}
+                spec_url = document.get("url") or first.get("url")
+                if not isinstance(spec_url, str) or not spec_url.strip():
+                    return None
+                embedded = EmbeddedSpec(embedded.generator, url=urljoin(embedded.url, spec_url))
+                continue
 
+            # The page may point at something that isn't a spec (HTML error page, JS bundle)
+            if _SPEC_HEAD.search(response.content[:4096]):
+                return response.content
+            return None
+        return None
+
+    @staticmethod
+    def remember_spec(url: str, digest: str, spec: Dict[str, Any], parser: str):
+        """Attaches the normalized spec, and the parser path that produced it, to the validators recorded for this body."""
+        record = ScraperService.validators.get(url)
+        if record is None or record.get("digest") != digest:
+            return
+        ScraperService.validators.put(url, {**record, "spec": spec, "parser": parser})
+
+    @staticmethod
+    def clean_html(html: str) -> str:
+        """
+        Converts a docs page to text with headings, code blocks and tables
+        kept as markdown. The backend is chosen by HTML_EXTRACTOR (lxml when
+        installed, BeautifulSoup otherwise).
+        """
+        cleaned_text = get_extractor().extract(html)
         # Post-processing to remove excessive whitespace
         cleaned_text = re.sub(r'\n{3,}', '\n\n', cleaned_text)
-        # remove excessive newlines
-        cleaned_text = re.sub(r'\n{3,}', '\n\n', cleaned_text)
-        
-        return cleaned_text[:50000] # Cap to 50k chars (Balance between depth and speed)
+        # No length cap: LLMParserService splits large documents into chunks
+        return cleaned_text
+
+    @staticmethod
+    async def find_embedded_async(html: str, url: str) -> Optional[EmbeddedSpec]:
+        """
+        find_embedded_spec in a worker thread for large pages: scanning an
+        inline __redoc_state / spec literal is a per-character Python loop,
+        and SSR'd Redoc pages carry specs of several MB.
+        """
+        if len(html) < INLINE_CLEAN_LIMIT:
+            return find_embedded_spec(html, url)
+        return await asyncio.to_thread(find_embedded_spec, html, url)
+
+    @staticmethod
+    async def clean_html_async(html: str) -> str:
+        """Runs clean_html in a worker thread for large pages so the event loop stays responsive."""
+        if len(html) < INLINE_CLEAN_LIMIT:
+            return ScraperService.clean_html(html)
+        return await asyncio.to_thread(ScraperService.clean_html, html)
@@ -1,50 +1,174 @@
 import os
+import re
 import json
-import google.generativeai as genai
-from typing import Any, Dict
-from dotenv import load_dotenv
+import asyncio
+import hashlib
+from typing import Any, Dict, List, Optional, Set
+from .llm_client import llm_client
+from .model_resolver import ModelResolver, get_model_resolver
+from ..core.cache import get_translation_cache
+
+# Values that are data, not prose: URLs, emails, UUIDs, hashes, dates, numbers, codes, identifiers
+_NON_TEXT = re.compile(
+    r"^(?:(?i:[a-z][a-z0-9+.-]*://\S+)"
+    r"|[^@\s]+@[^@\s]+\.\w+"
+    r"|(?i:[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})"
+    r"|(?i:[0-9a-f]{16,})"
+    r"|\d{4}-\d{2}-\d{2}(?:[T ][\d:.]+(?:Z|[+-]\d{2}:?\d{2})?)?"
+    r"|[-+]?[\d.,:/%\s]+"
+    r"|[A-Z0-9_.-]+"
+    r"|[\w.-]*[_/.]\w[\w./-]*"
+    r"|[a-z]+(?:[A-Z][a-z0-9]*)+"
+    r")$",
+    re.UNICODE,
+)
+_WORD = re.compile(r"[^\W\d_]+", re.UNICODE)
+_ENGLISH_WORDS = {
+    "the", "a", "an", "and", "or", "of", "to", "in", "on", "for", "with", "is", "are", "was", "be", "by",
+    "this", "that", "it", "as", "at", "from", "not", "no", "your", "you", "we", "our", "has", "have",
+    "will", "can", "all", "new", "please", "error", "invalid", "found", "success", "failed", "user",
+}
+
+
+def is_translatable(text: str) -> bool:
+    """Human-readable prose worth sending to the model (IDs, URLs, numbers, codes are skipped)."""
+    text = text.strip()
+    return (len(text) > 1 or not text.isascii()) and bool(_WORD.search(text)) and not _NON_TEXT.match(text)
+
+
+def looks_english(text: str) -> bool:
+    """
+    Cheap language check so English strings never reach the model: ASCII-only
+    text made up largely of common English words. A lone word only counts when
+    it is one of them ("Hola" and "Perro" are ASCII too).
+    """
+    if not text.isascii():
+        return False
+    words = [w.lower() for w in _WORD.findall(text)]
+    if not words:
+        return True
+    common = sum(1 for w in words if w in _ENGLISH_WORDS)
+    return common / len(words) >= 0.25
 
-load_dotenv()
 
 class TranslationService:
-    def __init__(self):
-        self.model = None
-        self._initialize_model()
+    """
+    Translates the human-readable strings of API responses to English.
+    Only distinct, non-English prose strings are considered; each is looked
+    up in a persistent cache keyed by its hash, and just the misses are sent
+    to the model in batches before being spliced back into the structure.
+    """
 
-    def _initialize_model(self):
-        api_key = os.getenv("GEMINI_API_KEY")
-        if not api_key or api_key == "your_gemini_api_key_here":
-            return
+    def __init__(self, cache=None, resolver: Optional[ModelResolver] = None):
+        # Same lazily resolved model as the parser (no network work at import)
+        self.resolver = resolver or get_model_resolver()
+        self._model = None
+        self.cache = cache or get_translation_cache()
+        self.batch_size = int(os.getenv("TRANSLATION_BATCH_SIZE", 100))
+        self.batch_chars = int(os.getenv("TRANSLATION_BATCH_CHARS", 8000))
 
-        try:
-            genai.configure(api_key=api_key)
-            self.model = genai.GenerativeModel("models/gemini-2.0-flash")
-        except Exception as e:
-            print(f"DEBUG: Failed to initialize Gemini model for translation: {str(e)}")
+    @property
+    def model(self):
+        return self._model or self.resolver.model
 
-    async def translate_response(self, data: Any) -> Any:
-        """
-        Translates all string values in a JSON-like object to English using AI.
-        """
-        if not self.model or not data:
-            return data
+    @model.setter
+    def model(self, model):
+        self._model = model
+
+    def _cache_key(self, text: str) -> str:
+        return f"{self.resolver.model_name}:{hashlib.sha256(text.encode('utf-8')).hexdigest()}"
+
+    @staticmethod
+    def _collect(data: Any, found: Set[str]):
+        if isinstance(data, str):
+            if is_translatable(data) and not looks_english(data):
+                found.add(data)
+        elif isinstance(data, dict):
+            for value in data.values():
+                TranslationService._collect(value, found)
+        elif isinstance(data, list):
+            for value in data:
+                TranslationService._collect(value, found)
+
+    @staticmethod
+    def _splice(data: Any, translations: Dict[str, str]) -> Any:
+        if isinstance(data, str):
+            return translations.get(data, data)
+        if isinstance(data, dict):
+            return {key: TranslationService._splice(value, translations) for key, value in data.items()}
+        if isinstance(data, list):
+            return [TranslationService._splice(value, translations) for value in data]
+        return data
 
+    def _batches(self, texts: List[str]) -> List[List[str]]:
+        batches: List[List[str]] = [[]]
+        chars = 0
+        for text in texts:
+            if batches[-1] and (len(batches[-1]) >= self.batch_size or chars + len(text) > self.batch_chars):
+                batches.append([])
+                chars = 0
+            batches[-1].append(text)
+            chars += len(text)
+        return batches if batches[0] else []
+
+    async def _translate_batch(self, texts: List[str]) -> Dict[str, str]:
         prompt = f"""
-        You are a translator. Translate all human-readable string values in the following JSON to English. 
-        Keep the keys and structure EXACTLY the same. 
-        Only translate values that are likely to be human-readable text (sentences, titles, names, etc.).
-        Do not translate technical identifiers, IDs, or URLs.
+        You are a translator. Translate each string in the following JSON array to English.
+        Return ONLY a JSON array of the same length, in the same order.
+        Keep names, identifiers and strings that are already English unchanged.
 
-        JSON Data:
-        {json.dumps(data, indent=2)}
+        Strings:
+        {json.dumps(texts, ensure_ascii=False)}
         """
-
         try:
-            response = self.model.generate_content(
+            response = await llm_client.generate(
+                self.model,
                 prompt,
                 generation_config={"response_mime_type": "application/json"},
             )
-            return json.loads(response.text)
+            translated = json.loads(response.text)
         except Exception as e:
-            print(f"DEBUG: Translation failed ({str(e)}). Returning raw data.")
+            print(f"DEBUG: Translation batch of {len(texts)} failed ({str(e)}). Keeping originals.")
+            return {}
+        if not isinstance(translated, list) or len(translated) != len(texts):
+            print(f"DEBUG: Translation batch returned {len(translated) if isinstance(translated, list) else 'no'} items for {len(texts)}. Keeping originals.")
+            return {}
+
+        results = {original: english for original, english in zip(texts, translated) if isinstance(english, str)}
+        await self.cache.aset_many({self._cache_key(original): english for original, english in results.items()})
+        return results
+
+    async def translate_response(self, data: Any) -> Any:
+        """
+        Translates the human-readable string values of a JSON-like object to English.
+        Keys, structure and non-text values are left untouched.
+        """
+        if not data:
+            return data
+        if self._model is None:
+            await self.resolver.ensure()
+        if not self.model:
+            return data
+
+        texts: Set[str] = set()
+        self._collect(data, texts)
+        if not texts:
+            return data
+
+        translations: Dict[str, str] = {}
+        misses = []
+        ordered = sorted(texts)
+        for text, cached in zip(ordered, await self.cache.aget_many([self._cache_key(t) for t in ordered])):
+            if cached is not None:
+                translations[text] = cached
+            else:
+                misses.append(text)
+
+        if misses:
+            print(f"DEBUG: Translating {len(misses)} of {len(texts)} distinct strings")
+            for result in await asyncio.gather(*(self._translate_batch(batch) for batch in self._batches(misses))):
+                translations.update(result)
+
+        if not translations:
             return data
+        return self._splice(data, translations)
@@ -0,0 +1,75 @@
+"""
+Measures SDK template render time for specs of different sizes, comparing
+the old per-request `from_string` compile with the cached template.
+
+Usage (from backend/):
+    python -m benchmarks.bench_codegen
+"""
+import time
+import statistics
+from app.generators.sdk_gen import CodeGenerator, PYTHON_SDK_TEMPLATE, TYPESCRIPT_SDK_TEMPLATE
+from app.parsers.openapi import APIEndpointSchema, NormalizedAPISpec
+
+SIZES = [10, 1_000, 10_000]
+
+
+def make_spec(endpoints: int) -> NormalizedAPISpec:
+    return NormalizedAPISpec(
+        name="Bench API",
+        version="1.0.0",
+        base_url="https://api.example.com",
+        authentication={"type": "bearer"},
+        endpoints=[
+            APIEndpointSchema(
+                method="GET",
+                path=f"/resources{i}/{{id}}",
+                summary=f"Get resource {i}",
+                parameters={"path": [{"name": "id", "type": "str"}], "query": [], "header": []},
+            )
+            for i in range(endpoints)
+        ],
+    )
+
+
+def timed(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def main():
+    generator = CodeGenerator()
+    generator.precompile()
+
+    compile_ms = timed(lambda: (generator.env.from_string(PYTHON_SDK_TEMPLATE), generator.env.from_string(TYPESCRIPT_SDK_TEMPLATE)), 20)
+    print(f"template compile (python + ts), paid per request before caching: {compile_ms:.2f} ms\n")
+
+    print(f"{'endpoints':>10} {'language':>10} {'cached ms':>12} {'uncached ms':>12}")
+    for size in SIZES:
+        spec = make_spec(size)
+        repeat = 20 if size <= 1_000 else 3
+        for language, source in (("python", PYTHON_SDK_TEMPLATE), ("ts", TYPESCRIPT_SDK_TEMPLATE)):
+            cached = timed(lambda: generator.generate_sdk(spec, language), repeat)
+
+            def uncached():
+                generator.env.from_string(source).render(**generator._context(spec))
+
+            print(f"{size:>10} {language:>10} {cached:>12.2f} {timed(uncached, repeat):>12.2f}")
+
+    # Spec refresh where one endpoint changed: fragments of the others are reused
+    print(f"\n{'endpoints':>10} {'full ms':>10} {'incremental ms':>15}")
+    for size in SIZES[1:]:
+        spec = make_spec(size)
+        previous = generator.generate_sdk_incremental(spec)["manifest"]
+        spec.endpoints[0].summary = "Changed"
+        repeat = 5 if size <= 1_000 else 2
+        full = timed(lambda: generator.generate_sdk(spec), repeat)
+        incremental = timed(lambda: generator.generate_sdk_incremental(spec, previous=previous), repeat)
+        print(f"{size:>10} {full:>10.2f} {incremental:>15.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Compares HTML extraction backends on large documentation pages.
+
+Usage (from backend/):
+    python -m benchmarks.bench_extractors [page.html | https://docs.example.com/api ...]
+
+Without arguments a synthetic multi-MB API reference page is used.
+"""
+import sys
+import time
+import statistics
+import httpx
+from app.services.extractors import get_extractor
+
+
+def synthetic_page(endpoints: int = 2000) -> str:
+    sections = []
+    for i in range(endpoints):
+        sections.append(f"""
+        <section id="op-{i}">
+          <h2>Get resource {i}</h2>
+          <p>Retrieves resource <code>{i}</code> by identifier. Supports <a href="#x">filtering</a>.</p>
+          <pre>curl -X GET https://api.example.com/v1/resources/{i} -H "Authorization: Bearer TOKEN"</pre>
+          <table><tr><th>Name</th><th>Type</th><th>Required</th></tr>
+            <tr><td>id</td><td>string</td><td>yes</td></tr>
+            <tr><td>expand</td><td>array</td><td>no</td></tr></table>
+          <div class="note"><span>Rate limited to 100 requests per minute.</span></div>
+        </section>""")
+    return (
+        "<html><head><script>window.__DATA__ = {};</script><style>body{}</style></head><body>"
+        "<nav><ul><li>Home</li></ul></nav><main>" + "".join(sections) + "</main></body></html>"
+    )
+
+
+def load(source: str) -> str:
+    if source.startswith(("http://", "https://")):
+        return httpx.get(source, follow_redirects=True, timeout=60.0).text
+    with open(source, "r", encoding="utf-8", errors="replace") as f:
+        return f.read()
+
+
+def bench(name: str, html: str, repeat: int = 5):
+    extractor = get_extractor(name)
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        text = extractor.extract(html)
+        timings.append(time.perf_counter() - start)
+    print(f"  {name:<5} median {statistics.median(timings) * 1000:8.1f} ms   min {min(timings) * 1000:8.1f} ms   output {len(text):,} chars")
+
+
+def main():
+    pages = [(src, load(src)) for src in sys.argv[1:]] or [("synthetic", synthetic_page())]
+    for label, html in pages:
+        print(f"{label}: {len(html) / 1024 / 1024:.2f} MB")
+        for name in ("soup", "lxml"):
+            try:
+                bench(name, html)
+            except ImportError:
+                print(f"  {name:<5} not installed")
+
+
+if __name__ == "__main__":
+    main()
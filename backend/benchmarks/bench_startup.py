@@ -0,0 +1,51 @@
+"""
+Measures cold import time of app.main (what a worker pays before serving),
+and the cost of the first Gemini model resolution with and without the
+on-disk model cache.
+
+Usage (from backend/):
+    python -m benchmarks.bench_startup
+"""
+import os
+import sys
+import time
+import statistics
+import subprocess
+
+RUNS = 7
+IMPORT_SNIPPET = "import time; t = time.perf_counter(); import app.main; print(time.perf_counter() - t)"
+
+
+def import_ms(env) -> float:
+    timings = []
+    for _ in range(RUNS):
+        out = subprocess.run([sys.executable, "-c", IMPORT_SNIPPET], env=env, capture_output=True, text=True, check=True)
+        timings.append(float(out.stdout.strip().splitlines()[-1]))
+    return statistics.median(timings) * 1000
+
+
+def resolve_ms(cache_path: str) -> float:
+    from app.services.model_resolver import ModelResolver
+    start = time.perf_counter()
+    ModelResolver(cache_path=cache_path).resolve()
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    env = {**os.environ, "PYTHONDONTWRITEBYTECODE": "1"}
+    print(f"import app.main (median of {RUNS}): {import_ms(env):.1f} ms")
+    # A configured key must not add network work to import
+    print(f"import app.main with GEMINI_API_KEY set: {import_ms({**env, 'GEMINI_API_KEY': 'bench-key'}):.1f} ms")
+
+    if os.getenv("GEMINI_API_KEY"):
+        cache_path = os.path.join(".doc2sdk_cache", "bench_gemini_model.json")
+        if os.path.exists(cache_path):
+            os.remove(cache_path)
+        print(f"first model resolution, list_models: {resolve_ms(cache_path):.1f} ms")
+        print(f"first model resolution, disk cache:  {resolve_ms(cache_path):.1f} ms")
+    else:
+        print("set GEMINI_API_KEY to also time model resolution")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,6 @@
+"""
+Celery entry point for the background worker (docker-compose `worker`):
+
+    celery -A tasks worker --loglevel=info
+"""
+from app.services.jobs import celery_app as app, generate_sdk_job  # noqa: F401
@@ -0,0 +1,66 @@
+import time
+from app.core.cache import LRUCache, DiskCache, ResultCache, make_cache_key
+
+def test_cache_key_depends_on_content_parser_and_version():
+    base = make_cache_key(b"{}", "openapi", "1.0.0")
+    assert base == make_cache_key("{}", "openapi", "1.0.0")
+    assert base != make_cache_key(b"{ }", "openapi", "1.0.0")
+    assert base != make_cache_key(b"{}", "llm:gemini", "1.0.0")
+    assert base != make_cache_key(b"{}", "openapi", "1.0.1")
+
+def test_lru_evicts_by_count_size_and_ttl():
+    cache = LRUCache(max_entries=2, max_bytes=100, ttl=60)
+    cache.set("a", 1, size=10)
+    cache.set("b", 2, size=10)
+    cache.get("a")
+    cache.set("c", 3, size=10)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+
+    cache.set("big", 4, size=95)
+    assert len(cache) == 1 and cache.get("big") == 4
+
+    cache.set("short", 5, size=1, ttl=0.01)
+    time.sleep(0.02)
+    assert cache.get("short") is None
+
+def test_result_cache_promotes_backend_hits(tmp_path):
+    backend = DiskCache(str(tmp_path))
+    warm = ResultCache(backend=backend)
+    warm.set("k", {"name": "API"})
+
+    cold = ResultCache(backend=backend)
+    assert cold.get("missing") is None
+    assert cold.get("k") == {"name": "API"}
+    assert cold.get("k") == {"name": "API"}
+
+    stats = cold.stats()
+    assert stats["misses"] == 1
+    assert stats["backend_hits"] == 1
+    assert stats["local_hits"] == 1
+
+def test_disk_cache_honours_ttl_and_evicts_on_byte_budget(tmp_path):
+    cache = DiskCache(str(tmp_path), max_bytes=250, ttl=60)
+    cache.set("short", "x" * 10, ttl=-1)
+    assert cache.get("short") is None
+
+    for i in range(5):
+        cache.set(f"k{i}", "x" * 100)
+        time.sleep(0.01)
+    # Over budget: trimmed to the low-water mark, oldest first
+    assert cache.get("k4") is not None
+    assert cache.get("k0") is None
+    assert sum(f.stat().st_size for f in tmp_path.iterdir()) <= 250
+
+def test_result_cache_async_accessors(tmp_path):
+    import asyncio
+
+    cache = ResultCache(backend=DiskCache(str(tmp_path)))
+
+    async def run():
+        await cache.aset("k", {"name": "API"}, ttl=60)
+        cache.clear_local()
+        return await cache.aget("k"), await cache.aget("missing")
+
+    assert asyncio.run(run()) == ({"name": "API"}, None)
+    assert cache.stats()["backend_hits"] == 1
@@ -0,0 +1,46 @@
+from app.services.chunking import split_into_chunks, merge_partial_specs
+
+def test_split_respects_heading_boundaries_and_budget():
+    sections = [f"### Section {i} ###\n" + ("word " * 150) + "\n" for i in range(10)]
+    text = "Intro text\n" + "".join(sections)
+    chunks = split_into_chunks(text, max_tokens=400)
+
+    assert len(chunks) > 1
+    assert "".join(chunks) == text
+    assert all(len(c) <= 400 * 4 for c in chunks)
+    assert all(c.startswith("### Section") for c in chunks[1:])
+
+def test_plain_lines_split_on_line_boundaries():
+    # get_text(separator="\n") output: no heading markers, no blank lines
+    lines = [f"GET /resource/{i} returns the resource with id {i}" for i in range(200)]
+    text = "\n".join(lines)
+    chunks = split_into_chunks(text, max_tokens=100)
+
+    assert len(chunks) > 1
+    assert "".join(chunks) == text
+    assert all(len(c) <= 100 * 4 for c in chunks)
+    assert all(c.lstrip("\n").startswith("GET /resource/") for c in chunks)
+
+def test_small_text_is_single_chunk():
+    assert split_into_chunks("short", max_tokens=100) == ["short"]
+
+def test_merge_deduplicates_endpoints():
+    merged = merge_partial_specs([
+        {"name": "Pets", "base_url": "https://api.pets.io", "authentication": {"type": "none"},
+         "endpoints": [{"method": "get", "path": "/pets/{id}", "parameters": {"path": [{"name": "id"}]}}]},
+        {"name": "", "authentication": {"type": "bearer"},
+         "endpoints": [
+             {"method": "GET", "path": "/pets/{petId}/", "summary": "Get pet",
+              "parameters": {"query": [{"name": "expand"}]}, "responses": {"404": {}}},
+             {"method": "POST", "path": "/pets"},
+         ]},
+    ])
+
+    assert merged["name"] == "Pets"
+    assert merged["version"] == "1.0.0"
+    assert merged["authentication"]["type"] == "bearer"
+    assert len(merged["endpoints"]) == 2
+    pet = merged["endpoints"][0]
+    assert pet["summary"] == "Get pet"
+    assert pet["parameters"]["query"] == [{"name": "expand"}]
+    assert "404" in pet["responses"]
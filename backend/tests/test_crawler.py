@@ -0,0 +1,61 @@
+import asyncio
+import httpx
+from app.core.http import HTTPClientRegistry
+from app.services.crawler import DocCrawler, canonicalize_url
+
+SITE = {
+    "/robots.txt": "User-agent: *\nDisallow: /docs/private",
+    "/docs/": '<main><h1>Intro</h1><a href="users">Users</a><a href="orders#top">Orders</a>'
+              '<a href="/blog/">Blog</a><a href="https://other.com/docs/x">Ext</a><a href="private">P</a></main>',
+    "/docs/users": '<main><h2>GET /users</h2><a href="/docs/">Home</a><a href="users/deep">Deep</a></main>',
+    "/docs/orders": '<main><h2>GET /users</h2><a href="/docs/">Home</a><a href="users/deep">Deep</a></main>',
+    "/docs/users/deep": "<main><h3>Too deep</h3></main>",
+    "/docs/private": "<main>secret</main>",
+    "/blog": "<main>blog</main>",
+}
+
+def handler(request):
+    path = request.url.path
+    if path not in SITE and path.rstrip("/") + "/" in SITE:
+        path = path.rstrip("/") + "/"
+    if path not in SITE:
+        return httpx.Response(404)
+    content_type = "text/plain" if path == "/robots.txt" else "text/html"
+    return httpx.Response(200, text=SITE[path], headers={"content-type": content_type})
+
+def test_canonicalize_url():
+    assert canonicalize_url("HTTPS://Docs.Example.com:443/api/#intro") == "https://docs.example.com/api"
+
+def test_crawl_stays_in_scope_and_dedups():
+    async def run():
+        clients = HTTPClientRegistry(transport=httpx.MockTransport(handler))
+        crawler = DocCrawler(clients, concurrency=3, max_pages=10, max_depth=1)
+        pages = [page async for page in crawler.crawl("https://docs.example.com/docs/")]
+        await clients.aclose()
+        return pages
+
+    pages = asyncio.run(run())
+    urls = sorted(p.url for p in pages)
+    # orders has the same content as users; private is disallowed; deep exceeds max_depth
+    assert len(urls) == 2
+    assert urls[0] == "https://docs.example.com/docs/"
+    assert urls[1] in ("https://docs.example.com/docs/users", "https://docs.example.com/docs/orders")
+    assert any("Intro" in p.text for p in pages)
+
+def test_large_pages_extract_links_off_loop(monkeypatch):
+    import threading
+    from app.services import crawler
+
+    threads = []
+    extract = DocCrawler.extract_links
+
+    def recording(html, base_url):
+        threads.append(threading.current_thread() is threading.main_thread())
+        return extract(html, base_url)
+
+    monkeypatch.setattr(DocCrawler, "extract_links", staticmethod(recording))
+    big = '<a href="a">A</a>' + "<p>x</p>" * crawler.INLINE_CLEAN_LIMIT
+    small = '<a href="b">B</a>'
+    links = asyncio.run(DocCrawler.extract_links_async(big, "https://d.test/docs/")) + asyncio.run(DocCrawler.extract_links_async(small, "https://d.test/docs/"))
+    assert links == ["https://d.test/docs/a", "https://d.test/docs/b"]
+    assert threads == [False, True]
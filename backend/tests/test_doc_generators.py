@@ -0,0 +1,110 @@
+import json
+import asyncio
+import httpx
+from app.core.http import HTTPClientRegistry
+from app.parsers.openapi import OpenAPIParser
+from app.parsers.postman import postman_to_openapi
+from app.services.doc_generators import find_embedded_spec
+from app.services.scraper import ScraperService, FetchValidatorStore
+
+SPEC = {"openapi": "3.0.0", "info": {"title": "Pets", "version": "1"}, "paths": {"/pets": {"get": {"summary": "List"}}}}
+PAGE = "https://docs.example.com/api/"
+
+def test_detects_common_doc_generators():
+    redoc = find_embedded_spec('<body><redoc spec-url="/openapi.yaml"></redoc></body>', PAGE)
+    assert (redoc.generator, redoc.url) == ("redoc", "https://docs.example.com/openapi.yaml")
+
+    elements = find_embedded_spec('<elements-api apiDescriptionUrl="spec.json" router="hash" />', PAGE)
+    assert (elements.generator, elements.url) == ("stoplight", "https://docs.example.com/api/spec.json")
+
+    inline = find_embedded_spec(f"<script>const __redoc_state = {json.dumps({'spec': {'data': SPEC}})};</script>", PAGE)
+    assert inline.generator == "redoc" and json.loads(inline.document) == SPEC
+
+    swagger = find_embedded_spec(
+        '<div id="swagger-ui"></div><script>window.ui = SwaggerUIBundle({ dom_id: "#swagger-ui", url: "./v1/swagger.json" })</script>',
+        PAGE,
+    )
+    assert (swagger.generator, swagger.url) == ("swagger-ui", "https://docs.example.com/api/v1/swagger.json")
+
+    postman = find_embedded_spec("<html></html>", "https://documenter.getpostman.com/view/123456/SzYW3f8B")
+    assert postman.kind == "postman" and "/collections/123456/SzYW3f8B" in postman.url
+
+    assert find_embedded_spec("<h1>Pets API</h1><p>GET /pets lists pets</p>", PAGE) is None
+
+def test_swagger_ui_initializer_is_followed_to_the_spec(monkeypatch):
+    def handler(request):
+        path = request.url.path
+        if path == "/api/":
+            html = '<div id="swagger-ui"></div><script src="./swagger-ui-bundle.js"></script><script src="./swagger-initializer.js"></script>'
+            return httpx.Response(200, text=html, headers={"content-type": "text/html"})
+        if path == "/api/swagger-initializer.js":
+            return httpx.Response(200, text='window.ui = SwaggerUIBundle({ configUrl: "/v3/api-docs/swagger-config" });')
+        if path == "/v3/api-docs/swagger-config":
+            return httpx.Response(200, json={"urls": [{"url": "/v3/api-docs", "name": "default"}]})
+        if path == "/v3/api-docs":
+            return httpx.Response(200, json=SPEC)
+        return httpx.Response(404)
+
+    clients = HTTPClientRegistry(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(ScraperService, "validators", FetchValidatorStore())
+    fetched = asyncio.run(ScraperService.fetch(PAGE, clients=clients))
+
+    assert fetched.is_raw_spec and fetched.generator == "swagger-ui"
+    assert OpenAPIParser().parse(fetched.body).endpoints[0].path == "/pets"
+
+def test_postman_collection_converts_to_openapi():
+    collection = {
+        "info": {"name": "Shop", "schema": "https://schema.getpostman.com/json/collection/v2.1.0/collection.json"},
+        "variable": [{"key": "baseUrl", "value": "https://api.shop.io"}],
+        "item": [{"name": "Orders", "item": [{
+            "name": "Get order",
+            "request": {"method": "GET", "url": {"raw": "{{baseUrl}}/orders/:id?expand=items", "host": ["{{baseUrl}}"], "path": ["orders", ":id"], "query": [{"key": "expand", "value": "items"}]}},
+        }]}],
+    }
+    spec = OpenAPIParser().parse(json.dumps(postman_to_openapi(collection)))
+    endpoint = spec.endpoints[0]
+    assert spec.name == "Shop" and spec.base_url == "https://api.shop.io"
+    assert (endpoint.method, endpoint.path, endpoint.tags) == ("GET", "/orders/{id}", ["Orders"])
+    assert [p["name"] for p in endpoint.parameters["path"]] == ["id"]
+    assert [p["name"] for p in endpoint.parameters["query"]] == ["expand"]
+
+def test_unusable_embedded_specs_fall_back_to_the_page(monkeypatch):
+    from app.core.cache import LRUCache, ResultCache
+    from app.services.llm_parser import LLMParserService
+    from app.services.pipeline import GenerationPipeline
+    from app.schemas import GenerateRequest
+
+    def handler(request):
+        path = request.url.path
+        if path == "/config/":
+            html = '<div id="swagger-ui"></div><script>SwaggerUIBundle({ configUrl: "/swagger-config" })</script><h1>Pets</h1>'
+            return httpx.Response(200, text=html, headers={"content-type": "text/html"})
+        if path == "/swagger-config":
+            return httpx.Response(200, json=[{"url": "/v3/api-docs"}])
+        if path == "/bundle/":
+            return httpx.Response(200, text='<redoc spec-url="/app.js"></redoc><h1>Pets</h1>', headers={"content-type": "text/html"})
+        if path == "/app.js":
+            return httpx.Response(200, text='!function(){var swagger={"openapi":1}}()')
+        if path == "/broken/":
+            return httpx.Response(200, text='<redoc spec-url="/broken.json"></redoc><h1>Pets</h1>', headers={"content-type": "text/html"})
+        if path == "/broken.json":
+            return httpx.Response(200, text='{"openapi": "3.0.0", "info": ')
+        return httpx.Response(404)
+
+    clients = HTTPClientRegistry(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(ScraperService, "validators", FetchValidatorStore())
+    for page in ("https://docs.example.com/config/", "https://docs.example.com/bundle/"):
+        fetched = asyncio.run(ScraperService.fetch(page, clients=clients))
+        assert not fetched.is_raw_spec and "Pets" in fetched.text
+
+    parser_service = LLMParserService()
+    parser_service.model, parser_service.model_name = object(), "models/fake"
+
+    async def parse_docs(text):
+        assert "Pets" in text
+        return {"name": "Pets", "version": "1", "endpoints": [], "source": "gemini_fake"}
+
+    parser_service.parse_docs = parse_docs
+    pipeline = GenerationPipeline(parser_service=parser_service, result_cache=ResultCache(local=LRUCache()))
+    result = asyncio.run(pipeline.generate(GenerateRequest(source_url="https://docs.example.com/broken/"), clients))
+    assert result.name == "Pets" and result.source == "gemini_fake"
@@ -0,0 +1,45 @@
+import pytest
+from app.services.extractors import get_extractor
+
+PAGE = """
+<html><head><title>x</title><script>var a = 1;</script></head>
+<body>
+  <nav>Menu</nav>
+  <main>
+    <h1>Users API</h1>
+    <p>Returns a <code>User</code> object.</p>
+    <h2>List users</h2>
+    <pre>GET /users?limit=10
+Authorization: Bearer TOKEN</pre>
+    <table>
+      <thead><tr><th>Name</th><th>Type</th></tr></thead>
+      <tbody><tr><td>limit</td><td>integer</td></tr></tbody>
+    </table>
+    <ul><li>First item</li><li>Second item</li></ul>
+  </main>
+  <footer>Copyright</footer>
+</body></html>
+"""
+
+EXPECTED = """
+### Users API ###
+Returns a `User` object.
+
+### List users ###
+```
+GET /users?limit=10
+Authorization: Bearer TOKEN
+```
+| Name | Type |
+| --- | --- |
+| limit | integer |
+- First item
+- Second item"""
+
+@pytest.mark.parametrize("backend", ["soup", "lxml"])
+def test_extractors_preserve_structure(backend):
+    if backend == "lxml":
+        pytest.importorskip("lxml")
+    text = get_extractor(backend).extract(PAGE)
+    assert text == EXPECTED
+    assert "Menu" not in text and "var a" not in text and "Copyright" not in text
@@ -0,0 +1,87 @@
+import asyncio
+import time
+import pytest
+from app.services.llm_client import LLMClient, LLMTimeoutError
+
+class AsyncModel:
+    def __init__(self, delay):
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+
+    async def generate_content_async(self, prompt, generation_config=None):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(self.delay)
+        self.active -= 1
+        return prompt.upper()
+
+class SyncModel:
+    def generate_content(self, prompt, generation_config=None):
+        time.sleep(0.05)
+        return prompt
+
+def test_generate_respects_concurrency_limit():
+    async def run():
+        client = LLMClient(max_concurrency=2)
+        model = AsyncModel(0.01)
+        results = await asyncio.gather(*(client.generate(model, f"p{i}") for i in range(6)))
+        return model, results
+
+    model, results = asyncio.run(run())
+    assert results == [f"P{i}" for i in range(6)]
+    assert model.peak == 2
+
+def test_sync_model_does_not_block_event_loop():
+    async def run():
+        client = LLMClient(max_concurrency=4)
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            for _ in range(5):
+                await asyncio.sleep(0.005)
+                ticks += 1
+
+        tick_task = asyncio.ensure_future(ticker())
+        result = await client.generate(SyncModel(), "hi")
+        ticks_during_call = ticks
+        await tick_task
+        return result, ticks_during_call
+
+    result, ticks_during_call = asyncio.run(run())
+    assert result == "hi"
+    assert ticks_during_call >= 3
+
+def test_generate_times_out():
+    client = LLMClient(timeout=0.01)
+    with pytest.raises(LLMTimeoutError):
+        asyncio.run(client.generate(AsyncModel(1), "slow"))
+
+def test_timed_out_thread_keeps_its_slot():
+    class SlowModel:
+        def generate_content(self, prompt, generation_config=None):
+            time.sleep(0.2)
+            return prompt
+
+    async def run():
+        client = LLMClient(max_concurrency=1, timeout=0.05)
+        with pytest.raises(LLMTimeoutError):
+            await client.generate(SlowModel(), "slow")
+        # The first thread is still busy: the next call waits for the slot, and its timeout covers only its own run
+        started = time.monotonic()
+        result = await client.generate(SyncModel(), "next", timeout=0.1)
+        return result, time.monotonic() - started
+
+    result, waited = asyncio.run(run())
+    assert result == "next" and waited >= 0.1
+
+def test_each_event_loop_gets_its_own_semaphore():
+    client = LLMClient(max_concurrency=1)
+
+    async def contended():
+        # Waiting on the semaphore binds it to the running loop
+        return await asyncio.gather(client.generate(AsyncModel(0.01), "a"), client.generate(AsyncModel(0.01), "b"))
+
+    # A second loop (e.g. a job worker thread) must not trip over the first loop's semaphore
+    assert asyncio.run(contended()) == asyncio.run(contended()) == ["A", "B"]
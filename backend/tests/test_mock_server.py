@@ -0,0 +1,73 @@
+import json
+import asyncio
+import httpx
+from app.parsers.openapi import OpenAPIParser
+from app.services.mock_server import RouteTrie, build_mock_app
+
+SPEC = {
+    "openapi": "3.0.0",
+    "info": {"title": "Pets", "version": "1"},
+    "paths": {
+        "/pets": {"get": {"responses": {"200": {"content": {"application/json": {"schema": {"type": "array", "items": {"$ref": "#/components/schemas/Pet"}}}}}}}},
+        "/pets/{id}": {
+            "get": {"responses": {
+                "200": {"content": {"application/json": {"schema": {"$ref": "#/components/schemas/Pet"}}}},
+                "404": {"content": {"application/json": {"example": {"error": "not found"}}}},
+            }},
+            "delete": {"responses": {"204": {"description": "Deleted"}}},
+        },
+        "/pets/mine": {"get": {"responses": {"200": {"content": {"application/json": {"example": {"mine": True}}}}}}},
+    },
+    "components": {"schemas": {"Pet": {"type": "object", "properties": {
+        "id": {"type": "integer"}, "name": {"type": "string", "example": "Rex"},
+        "born": {"type": "string", "format": "date"}, "status": {"type": "string", "enum": ["available", "sold"]},
+    }}}},
+}
+
+def test_route_trie_prefers_literals_and_extracts_params():
+    trie = RouteTrie()
+    trie.insert("GET", "/pets/{id}", "by_id")
+    trie.insert("GET", "/pets/mine", "mine")
+    trie.insert("GET", "/pets/{id}/toys/{toy}", "toy")
+    trie.insert("GET", "/pets/{petId}/owner", "owner")
+    assert trie.match("GET", "/pets/mine") == ("mine", {}, True)
+    # Routes sharing a {param} node keep their own parameter names
+    assert trie.match("GET", "/pets/7/owner") == ("owner", {"petId": "7"}, True)
+    assert trie.match("GET", "/pets/7") == ("by_id", {"id": "7"}, True)
+    assert trie.match("get", "/pets/7/toys/ball") == ("toy", {"id": "7", "toy": "ball"}, True)
+    assert trie.match("POST", "/pets/7")[::2] == (None, True)
+    assert trie.match("GET", "/owners") == (None, {}, False)
+
+def test_mock_app_serves_synthesized_responses_and_injects_errors():
+    app = build_mock_app(OpenAPIParser().parse(json.dumps(SPEC)))
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://mock") as client:
+            return [
+                await client.get("/pets"),
+                await client.get("/pets/3"),
+                await client.get("/pets/3", headers={"X-Mock-Status": "404"}),
+                await client.delete("/pets/3"),
+                await client.post("/pets/3"),
+                await client.get("/nope"),
+                await client.get("/pets", headers={"X-Mock-Latency": "soon"}),
+                await client.get("/pets", headers={"X-Mock-Status": "teapot"}),
+            ]
+
+    pets, pet, missing, deleted, not_allowed, not_found, bad_latency, bad_status = asyncio.run(run())
+    assert pets.json() == [{"id": 1, "name": "Rex", "born": "2024-01-01", "status": "available"}] * 2
+    assert pet.status_code == 200 and pet.json()["name"] == "Rex"
+    assert missing.status_code == 404 and missing.json() == {"error": "not found"}
+    assert deleted.status_code == 204 and deleted.content == b""
+    assert not_allowed.status_code == 405 and not_found.status_code == 404
+    assert not_allowed.headers["allow"] == "DELETE, GET"
+    assert bad_latency.status_code == 400 and bad_status.status_code == 400
+
+    flaky = build_mock_app(OpenAPIParser().parse(json.dumps(SPEC)), error_rate=0.5, seed=7)
+
+    async def hammer():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=flaky), base_url="http://mock") as client:
+            return [(await client.get("/pets/mine")).status_code for _ in range(200)]
+
+    codes = asyncio.run(hammer())
+    assert set(codes) == {200, 500} and 60 < codes.count(500) < 140
@@ -0,0 +1,64 @@
+import asyncio
+import google.generativeai as genai
+from types import SimpleNamespace
+from app.services.llm_parser import LLMParserService
+from app.services.model_resolver import ModelResolver
+from app.services.translator import TranslationService
+from app.core.cache import LRUCache, ResultCache
+
+def fake_genai(monkeypatch):
+    calls = []
+
+    def list_models():
+        calls.append("list_models")
+        return [SimpleNamespace(name="models/gemini-pro"), SimpleNamespace(name="models/gemini-1.5-flash")]
+
+    monkeypatch.setattr(genai, "configure", lambda api_key: None)
+    monkeypatch.setattr(genai, "list_models", list_models)
+    monkeypatch.setattr(genai, "GenerativeModel", lambda name: SimpleNamespace(name=name))
+    return calls
+
+def test_resolution_is_lazy_shared_and_persisted(monkeypatch, tmp_path):
+    calls = fake_genai(monkeypatch)
+    monkeypatch.setenv("GEMINI_API_KEY", "test-key")
+    monkeypatch.delenv("GEMINI_MODEL", raising=False)
+    cache_path = str(tmp_path / "model.json")
+
+    resolver = ModelResolver(cache_path=cache_path)
+    parser = LLMParserService(resolver=resolver)
+    translator = TranslationService(cache=ResultCache(local=LRUCache()), resolver=resolver)
+    assert calls == []
+
+    # Properties are snapshots: reading them never triggers discovery
+    assert parser.model_name is None
+    assert calls == []
+
+    async def resolve_concurrently():
+        await asyncio.gather(parser.ensure_model(), resolver.ensure(), resolver.ensure())
+
+    asyncio.run(resolve_concurrently())
+    assert parser.model_name == "models/gemini-1.5-flash"
+    assert translator.model.name == "models/gemini-1.5-flash"
+    assert calls == ["list_models"]
+
+    # A fresh process reuses the persisted choice
+    fresh = ModelResolver(cache_path=cache_path)
+    assert asyncio.run(fresh.ensure()).name == "models/gemini-1.5-flash"
+    assert calls == ["list_models"]
+
+def test_missing_key_or_failures_do_not_hit_the_network_per_call(monkeypatch, tmp_path):
+    calls = fake_genai(monkeypatch)
+    monkeypatch.delenv("GEMINI_API_KEY", raising=False)
+    resolver = ModelResolver(cache_path=str(tmp_path / "model.json"), retry_interval=60)
+    assert asyncio.run(resolver.ensure()) is None
+    assert calls == []
+
+    def failing():
+        calls.append("list_models")
+        raise RuntimeError("network down")
+
+    monkeypatch.setenv("GEMINI_API_KEY", "test-key")
+    monkeypatch.setattr(genai, "list_models", failing)
+    assert asyncio.run(resolver.ensure()) is None
+    assert asyncio.run(resolver.ensure()) is None
+    assert calls == ["list_models"]
@@ -49,3 +49,33 @@ paths:
     assert result.name == "YAML API"
     assert result.version == "2.0.0"
     assert result.endpoints[0].path == "/ping"
+
+def test_openapi_parser_streams_bytes_with_metadata_after_paths():
+    sample_spec = b"""
+    {
+      "paths": {
+        "/users/{id}": {
+          "parameters": [],
+          "get": {"summary": "Get user", "parameters": [{"name": "id", "in": "path", "required": true}]},
+          "delete": {"summary": "Delete user"}
+        },
+        "/health": {"get": {"summary": "Health"}}
+      },
+      "swagger": "2.0",
+      "info": {"title": "Late Info API", "version": 3},
+      "host": "api.example.com",
+      "basePath": "/v1"
+    }
+    """
+    parser = OpenAPIParser()
+    endpoints = parser.iter_endpoints(sample_spec)
+    first = next(endpoints)
+    assert (first.method, first.path) == ("GET", "/users/{id}")
+    assert first.parameters["path"][0]["name"] == "id"
+    assert len(list(endpoints)) == 2
+
+    result = parser.parse(sample_spec)
+    assert result.name == "Late Info API"
+    assert result.version == "3"
+    assert result.base_url == "https://api.example.com/v1"
+    assert len(result.endpoints) == 3
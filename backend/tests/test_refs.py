@@ -0,0 +1,55 @@
+import json
+from app.parsers.openapi import OpenAPIParser
+from app.parsers.refs import SchemaGraph
+
+DOC = {
+    "openapi": "3.0.0",
+    "components": {
+        "schemas": {
+            "Pet": {"type": "object", "properties": {"owner": {"$ref": "#/components/schemas/Owner"}}},
+            "Owner": {"type": "object", "properties": {"pets": {"type": "array", "items": {"$ref": "#/components/schemas/Pet"}}}},
+            "Id": {"type": "string"},
+        },
+        "parameters": {"PetId": {"name": "id", "in": "path", "required": True, "schema": {"$ref": "#/components/schemas/Id"}}},
+    },
+}
+
+def test_resolve_memoizes_and_breaks_cycles():
+    graph = SchemaGraph(DOC)
+    pet = graph.resolve({"$ref": "#/components/schemas/Pet"})
+
+    assert pet["x-schema-name"] == "Pet"
+    owner = pet["properties"]["owner"]
+    assert owner["x-schema-name"] == "Owner"
+    assert owner["properties"]["pets"]["items"] == {"$ref": "#/components/schemas/Pet"}
+    assert graph.resolve({"$ref": "#/components/schemas/Pet"}) is pet
+    assert graph.get("Id") == {"type": "string"}
+    json.dumps(pet)
+
+def test_relative_file_refs_stay_inside_base_dir(tmp_path):
+    (tmp_path / "common.json").write_text(json.dumps({"Error": {"type": "object", "properties": {"code": {"type": "integer"}}}}))
+    spec = {
+        "openapi": "3.0.0",
+        "info": {"title": "Files", "version": "1"},
+        "paths": {
+            "/pets/{id}": {
+                "get": {
+                    "parameters": [{"$ref": "#/components/parameters/PetId"}],
+                    "responses": {
+                        "404": {"content": {"application/json": {"schema": {"$ref": "common.json#/Error"}}}},
+                        "500": {"content": {"application/json": {"schema": {"$ref": "../outside.json#/Error"}}}},
+                    },
+                }
+            }
+        },
+        "components": DOC["components"],
+    }
+    path = tmp_path / "spec.json"
+    path.write_text(json.dumps(spec))
+
+    result = OpenAPIParser().parse_file(str(path))
+    endpoint = result.endpoints[0]
+    assert endpoint.parameters["path"][0] == {"name": "id", "required": True, "type": "string", "description": ""}
+    assert endpoint.responses["404"]["content"]["application/json"]["schema"]["properties"]["code"]["type"] == "integer"
+    assert endpoint.responses["500"]["content"]["application/json"]["schema"] == {"$ref": "../outside.json#/Error"}
+    assert set(result.schemas) == {"Pet", "Owner", "Id"}
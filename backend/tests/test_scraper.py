@@ -0,0 +1,45 @@
+import asyncio
+import httpx
+from app.core.http import HTTPClientRegistry
+from app.services.scraper import ScraperService, FetchValidatorStore
+
+SPEC = b'{"openapi": "3.0.0", "info": {"title": "T", "version": "1"}, "paths": {}}'
+
+def test_conditional_fetch_reuses_stored_spec(monkeypatch):
+    seen = []
+
+    def handler(request):
+        seen.append(dict(request.headers))
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, content=SPEC, headers={"content-type": "application/json", "etag": '"v1"'})
+
+    clients = HTTPClientRegistry(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(ScraperService, "validators", FetchValidatorStore())
+    url = "https://example.com/openapi.json"
+
+    first = asyncio.run(ScraperService.fetch(url, clients=clients))
+    assert first.is_raw_spec and not first.not_modified and first.spec is None
+    assert "if-none-match" not in seen[0]
+
+    ScraperService.remember_spec(url, first.digest, {"name": "T", "version": "1"}, "openapi")
+
+    second = asyncio.run(ScraperService.fetch(url, clients=clients))
+    assert seen[1]["if-none-match"] == '"v1"'
+    assert second.not_modified
+    assert second.digest == first.digest
+    assert second.spec == {"name": "T", "version": "1"}
+
+def test_llm_spec_is_not_reused_after_model_change(monkeypatch):
+    page = b"<html><body><h1>API</h1></body></html>"
+    clients = HTTPClientRegistry(transport=httpx.MockTransport(lambda request: httpx.Response(200, content=page, headers={"content-type": "text/html"})))
+    monkeypatch.setattr(ScraperService, "validators", FetchValidatorStore(max_entries=1))
+    url = "https://example.com/docs"
+
+    first = asyncio.run(ScraperService.fetch(url, clients=clients, llm_parser="llm:models/a"))
+    ScraperService.remember_spec(url, first.digest, {"name": "A", "version": "1"}, "llm:models/a")
+
+    same = asyncio.run(ScraperService.fetch(url, clients=clients, llm_parser="llm:models/a"))
+    assert same.spec == {"name": "A", "version": "1"}
+    changed = asyncio.run(ScraperService.fetch(url, clients=clients, llm_parser="llm:models/b"))
+    assert changed.spec is None and changed.text
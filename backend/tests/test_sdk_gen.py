@@ -0,0 +1,230 @@
+import json
+import pytest
+from app.generators.sdk_gen import CodeGenerator
+from app.parsers.openapi import APIEndpointSchema, NormalizedAPISpec
+
+def make_spec():
+    return NormalizedAPISpec(
+        name="Pet Store",
+        version="1.0.0",
+        base_url="https://api.pets.io",
+        authentication={"type": "bearer"},
+        endpoints=[
+            APIEndpointSchema(method="GET", path="/pets/{id}", summary="Get pet",
+                              parameters={"path": [{"name": "id", "type": "str"}]}),
+        ],
+    )
+
+def test_templates_are_compiled_once(tmp_path):
+    generator = CodeGenerator(bytecode_cache_dir=str(tmp_path))
+    generator.precompile()
+    assert generator.get_template("python") is generator.get_template("python")
+    assert generator.get_template("ts") is generator.get_template("typescript")
+    assert list(tmp_path.iterdir())
+
+    code = generator.generate_sdk(make_spec(), "python")
+    assert "class PetStoreClient:" in code
+    assert "def get_pet(" in code
+
+    with pytest.raises(ValueError):
+        generator.generate_sdk(make_spec(), "cobol")
+
+def test_package_splits_tags_into_lazily_imported_modules(tmp_path, monkeypatch):
+    import io
+    import sys
+    import zipfile
+    from app.generators.package_gen import PackageGenerator
+
+    spec = make_spec()
+    spec.endpoints[0].tags = ["Pets"]
+    spec.endpoints.append(APIEndpointSchema(method="GET", path="/users", summary="List users", tags=["users"]))
+
+    archive = zipfile.ZipFile(io.BytesIO(PackageGenerator().build_zip(spec, "python")))
+    assert {"pet_store/client.py", "pet_store/resources/pets.py", "pet_store/resources/users.py", "pyproject.toml"} <= set(archive.namelist())
+    archive.extractall(tmp_path)
+
+    monkeypatch.syspath_prepend(str(tmp_path))
+    import pet_store
+    client = pet_store.PetStoreClient()
+    assert "pet_store.resources.users" not in sys.modules
+    assert callable(client.users.list_users)
+    assert "pet_store.resources.users" in sys.modules
+    client.close()
+
+    ts_files = PackageGenerator().build_files(spec, "ts")
+    assert "src/resources/pets.ts" in ts_files
+    assert "get pets(): PetsResource" in ts_files["src/index.ts"]
+
+def test_async_sdk_retries_and_gathers():
+    import asyncio
+    import httpx
+
+    code = CodeGenerator().generate_sdk(make_spec(), "python-async")
+    namespace = {}
+    exec(compile(code, "async_sdk.py", "exec"), namespace)
+
+    attempts = {}
+    in_flight = {"now": 0, "peak": 0}
+
+    async def handler(request):
+        pet_id = request.url.path.rsplit("/", 1)[-1]
+        attempts[pet_id] = attempts.get(pet_id, 0) + 1
+        if pet_id == "missing":
+            return httpx.Response(404, json={"error": "not found"})
+        if attempts[pet_id] == 1:
+            return httpx.Response(503)
+        in_flight["now"] += 1
+        in_flight["peak"] = max(in_flight["peak"], in_flight["now"])
+        await asyncio.sleep(0.01)
+        in_flight["now"] -= 1
+        return httpx.Response(200, json={"id": pet_id})
+
+    async def run():
+        client = namespace["PetStoreAsyncClient"](retry_backoff=0)
+        client.client = httpx.AsyncClient(base_url=client.base_url, transport=httpx.MockTransport(handler))
+        async with client:
+            pets = await client.gather(client.get_pet, [{"id": i} for i in range(20)], concurrency=4)
+            with pytest.raises(namespace["PetStoreAPIError"]) as excinfo:
+                await client.get_pet("missing")
+        return pets, excinfo.value
+
+    pets, error = asyncio.run(run())
+    assert [p["id"] for p in pets] == [str(i) for i in range(20)]
+    assert all(attempts[str(i)] == 2 for i in range(20))
+    assert in_flight["peak"] <= 4
+    # 4xx responses are not retried
+    assert attempts["missing"] == 1 and error.status_code == 404
+
+def test_models_decode_nested_responses_into_slotted_dataclasses():
+    import sys
+    import httpx
+    from app.parsers.openapi import OpenAPIParser
+
+    doc = {
+        "openapi": "3.0.0",
+        "info": {"title": "Pet Store", "version": "1.0.0"},
+        "paths": {
+            "/pets": {"get": {"summary": "List pets", "responses": {"200": {"content": {"application/json": {
+                "schema": {"type": "array", "items": {"$ref": "#/components/schemas/Pet"}}}}}}}},
+            "/pets/{petId}": {"get": {"summary": "Get pet", "parameters": [{"name": "petId", "in": "path", "schema": {"type": "integer"}}],
+                                      "responses": {"200": {"content": {"application/json": {"schema": {"$ref": "#/components/schemas/Pet"}}}}}}},
+        },
+        "components": {"schemas": {
+            "Pet": {"type": "object", "required": ["id"], "properties": {
+                "id": {"type": "integer"}, "owner": {"$ref": "#/components/schemas/Owner"}}},
+            "Owner": {"type": "object", "properties": {
+                "firstName": {"type": "string"}, "pets": {"type": "array", "items": {"$ref": "#/components/schemas/Pet"}}}},
+        }},
+    }
+    spec = OpenAPIParser().parse(json.dumps(doc))
+    namespace = {}
+    code = CodeGenerator().generate_sdk(spec, "python")
+    # The sync client has no retry loop, so it must not depend on tenacity
+    assert "tenacity" not in code
+    exec(compile(code, "sdk.py", "exec"), namespace)
+
+    def handler(request):
+        if request.url.path == "/pets":
+            return httpx.Response(200, json=[{"id": 1, "owner": {"firstName": "Ada", "pets": [{"id": 2}]}}])
+        return httpx.Response(200, json={"id": int(request.url.path.rsplit("/", 1)[-1])})
+
+    client = namespace["PetStoreClient"](models=True)
+    client.client = httpx.Client(base_url="https://pets.test", transport=httpx.MockTransport(handler))
+    pets = client.list_pets()
+    assert pets[0].owner.first_name == "Ada" and pets[0].owner.pets[0].id == 2
+    assert client.get_pet(7).id == 7
+    assert pets[0].to_dict() == {"id": 1, "owner": {"firstName": "Ada", "pets": [{"id": 2}]}}
+    if sys.version_info >= (3, 10):
+        assert not hasattr(pets[0], "__dict__")
+
+    client.models = False
+    assert client.get_pet(7) == {"id": 7}
+
+def test_paginated_endpoints_get_lazy_prefetching_iterators():
+    import httpx
+    from app.parsers.openapi import OpenAPIParser
+
+    doc = {
+        "openapi": "3.0.0",
+        "info": {"title": "Pet Store", "version": "1.0.0"},
+        "paths": {
+            "/pets": {"get": {
+                "summary": "List pets",
+                "parameters": [{"name": "cursor", "in": "query"}, {"name": "limit", "in": "query"}],
+                "responses": {"200": {"content": {"application/json": {"schema": {"type": "object", "properties": {
+                    "data": {"type": "array", "items": {"type": "object"}},
+                    "meta": {"type": "object", "properties": {"next_cursor": {"type": "string"}}},
+                }}}}}},
+            }},
+            "/tags": {"get": {
+                "summary": "List tags",
+                "parameters": [{"name": "offset", "in": "query"}, {"name": "limit", "in": "query"}],
+                "responses": {"200": {"content": {"application/json": {"schema": {"type": "array", "items": {"type": "string"}}}}}},
+            }},
+        },
+    }
+    spec = OpenAPIParser().parse(json.dumps(doc))
+    generator = CodeGenerator()
+    paginations = generator.schema_context(spec)["paginations"]
+    assert paginations["GET /pets"]["config"]["next"] == ["meta", "next_cursor"]
+    assert paginations["GET /tags"]["style"] == "offset"
+    assert "async *iterListPets(" in generator.generate_sdk(spec, "ts")
+
+    requests = []
+
+    def handler(request):
+        params = dict(request.url.params)
+        requests.append(params)
+        if request.url.path == "/pets":
+            start = int(params.get("cursor") or 0)
+            next_cursor = str(start + 2) if start + 2 < 5 else None
+            return httpx.Response(200, json={"data": [{"n": i} for i in range(start, min(start + 2, 5))], "meta": {"next_cursor": next_cursor}})
+        offset = int(params.get("offset") or 0)
+        return httpx.Response(200, json=[f"t{i}" for i in range(offset, min(offset + int(params["limit"]), 7))])
+
+    namespace = {}
+    exec(compile(generator.generate_sdk(spec, "python"), "sdk.py", "exec"), namespace)
+    client = namespace["PetStoreClient"]()
+    client.client = httpx.Client(base_url="https://pets.test", transport=httpx.MockTransport(handler))
+
+    pets = client.iter_list_pets(params={"limit": 2})
+    assert not requests  # nothing is fetched until iteration starts
+    assert [p["n"] for p in pets] == [0, 1, 2, 3, 4]
+    assert [r.get("cursor") for r in requests] == [None, "2", "4"]
+
+    assert list(client.iter_list_tags(params={"limit": 3})) == [f"t{i}" for i in range(7)]
+
+def test_incremental_generation_rerenders_only_changed_endpoints():
+    import re
+    from app.core.cache import LRUCache, ResultCache
+
+    generator = CodeGenerator(fragment_cache=ResultCache(local=LRUCache(max_entries=1000)))
+    spec = make_spec()
+    spec.endpoints += [
+        APIEndpointSchema(method="GET", path="/pets", summary="List pets", parameters={"query": [{"name": "limit"}]}),
+        APIEndpointSchema(method="DELETE", path="/pets/{id}", summary="Delete pet", parameters={"path": [{"name": "id"}]}),
+    ]
+    strip = lambda code: re.sub(r"Generated: .*", "", code)
+
+    for language in ("python", "python-async", "ts"):
+        first = generator.generate_sdk_incremental(spec, language)
+        assert strip(first["code"]) == strip(generator.generate_sdk(spec, language))
+        assert first["rendered"] == 3
+
+    first = generator.generate_sdk_incremental(spec, "python")
+    assert first["reused"] == 3 and first["rendered"] == 0
+
+    spec.endpoints[1].summary = "List all pets"
+    del spec.endpoints[2]
+    spec.endpoints.append(APIEndpointSchema(method="POST", path="/pets", summary="Create pet"))
+    second = generator.generate_sdk_incremental(spec, "python", previous=first["manifest"])
+
+    assert second["rendered"] == 2 and second["reused"] == 1
+    assert second["changes"] == {"added": ["POST /pets"], "removed": ["DELETE /pets/{id}"], "changed": ["GET /pets"], "unchanged": 1}
+    assert "def list_all_pets(" in second["code"] and "def delete_pet(" not in second["code"]
+    assert strip(second["code"]) == strip(generator.generate_sdk(spec, "python"))
+
+    # Same spec again: served from the assembled cache, no context build or rendering
+    third = generator.generate_sdk_incremental(spec, "python", previous=second["manifest"])
+    assert third["code"] == second["code"] and third["rendered"] == 0
+    assert third["changes"]["added"] == [] and third["changes"]["unchanged"] == 3
@@ -0,0 +1,52 @@
+import asyncio
+from app.core.singleflight import SingleFlight
+
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {"ok": True}
+
+    async def main():
+        return await asyncio.gather(*(flight.do("k", work) for _ in range(5)))
+
+    results = asyncio.run(main())
+    assert results == [{"ok": True}] * 5
+    assert len(calls) == 1
+    assert flight.stats() == {"leaders": 1, "followers": 4, "in_flight": 0}
+
+def test_cancelled_caller_does_not_cancel_shared_work():
+    flight = SingleFlight()
+    started = []
+
+    async def work():
+        started.append(1)
+        await asyncio.sleep(0.05)
+        return "done"
+
+    async def main():
+        first = asyncio.ensure_future(flight.do("k", work))
+        second = asyncio.ensure_future(flight.do("k", work))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        return await second, first.cancelled()
+
+    assert asyncio.run(main()) == ("done", True)
+    assert len(started) == 1
+
+def test_errors_reach_every_caller_and_are_not_cached():
+    flight = SingleFlight()
+
+    async def boom():
+        await asyncio.sleep(0.01)
+        raise ValueError("upstream down")
+
+    async def main():
+        return await asyncio.gather(flight.do("k", boom), flight.do("k", boom), return_exceptions=True)
+
+    results = asyncio.run(main())
+    assert all(isinstance(r, ValueError) for r in results)
+    assert flight.stats()["in_flight"] == 0
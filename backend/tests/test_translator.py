@@ -0,0 +1,54 @@
+import json
+import asyncio
+from types import SimpleNamespace
+from app.core.cache import LRUCache, ResultCache
+from app.services.translator import TranslationService
+
+DICTIONARY = {"Hola mundo": "Hello world", "Perro": "Dog", "Le chien est très content": "The dog is very happy"}
+
+class FakeModel:
+    def __init__(self):
+        self.batches = []
+
+    async def generate_content_async(self, prompt, generation_config=None):
+        texts = json.loads(prompt[prompt.index("["):prompt.rindex("]") + 1])
+        self.batches.append(texts)
+        return SimpleNamespace(text=json.dumps([DICTIONARY.get(t, t) for t in texts]))
+
+def make_service():
+    service = TranslationService(cache=ResultCache(local=LRUCache()))
+    service.model = FakeModel()
+    return service
+
+def test_only_distinct_uncached_prose_is_sent_once():
+    service = make_service()
+    data = {
+        "id": "550e8400-e29b-41d4-a716-446655440000",
+        "url": "https://api.example.com/pets/1",
+        "status": "ACTIVE",
+        "count": 3,
+        "title": "Hola mundo",
+        "notes": ["Hola mundo", "The dog is happy", {"text": "Le chien est très content"}],
+    }
+
+    first = asyncio.run(service.translate_response(data))
+    assert first["title"] == "Hello world"
+    assert first["notes"] == ["Hello world", "The dog is happy", {"text": "The dog is very happy"}]
+    assert first["id"] == data["id"] and first["count"] == 3
+    assert service.model.batches == [["Hola mundo", "Le chien est très content"]]
+
+    second = asyncio.run(service.translate_response(data))
+    assert second == first
+    assert len(service.model.batches) == 1
+
+def test_misses_are_split_into_batches():
+    service = make_service()
+    service.batch_size = 2
+    data = [f"Palabra número {i} aquí" for i in range(5)]
+    asyncio.run(service.translate_response(data))
+    assert [len(b) for b in service.model.batches] == [2, 2, 1]
+
+def test_single_foreign_words_are_translated():
+    service = make_service()
+    assert asyncio.run(service.translate_response({"kind": "Perro", "state": "error"})) == {"kind": "Dog", "state": "error"}
+    assert service.model.batches == [["Perro"]]
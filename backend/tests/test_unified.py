@@ -0,0 +1,260 @@
+import json
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.core.http import HTTPClientRegistry
+
+SPEC = {
+    "openapi": "3.0.0",
+    "info": {"title": "Stream API", "version": "1.0.0"},
+    "paths": {f"/items{i}": {"get": {"summary": f"List items {i}"}} for i in range(50)},
+}
+
+def spec_server(request):
+    return httpx.Response(200, json=SPEC)
+
+def test_generate_stream_emits_spec_then_sdk_chunks():
+    with TestClient(app) as client:
+        app.state.http_clients = HTTPClientRegistry(transport=httpx.MockTransport(spec_server))
+        response = client.post("/api/v1/generate/stream", json={"source_url": "https://stream.test/openapi.json"})
+
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    events = [json.loads(line) for line in response.text.splitlines()]
+    types = [e["type"] for e in events]
+    assert types[0] == "status"
+    assert types.index("spec") < types.index("endpoint") < types.index("sdk")
+    assert types[-1] == "done"
+
+    spec = next(e for e in events if e["type"] == "spec")
+    assert spec["name"] == "Stream API" and spec["endpoint_count"] == 50
+    sdk = "".join(e["chunk"] for e in events if e["type"] == "sdk")
+    assert "class StreamAPIClient:" in sdk
+    assert "def list_items_49(" in sdk
+
+def test_crawl_limits_are_enforced():
+    with TestClient(app) as client:
+        too_many = client.post("/api/v1/generate", json={"source_url": "https://crawl.test/", "crawl": True, "max_pages": 100_000})
+        too_deep = client.post("/api/v1/jobs", json={"source_url": "https://crawl.test/", "crawl": True, "max_depth": 50})
+    assert too_many.status_code == 422 and too_deep.status_code == 422
+
+def test_generation_job_runs_on_worker_and_dedupes(monkeypatch):
+    from app.services import jobs
+
+    # In-memory broker/backend stand-in; eager mode runs the task in the submitting thread
+    monkeypatch.setattr(jobs.celery_app.conf, "broker_url", "memory://")
+    monkeypatch.setattr(jobs.celery_app.conf, "result_backend", "cache+memory://")
+    monkeypatch.setattr(jobs.celery_app.conf, "task_always_eager", True)
+    monkeypatch.setattr(jobs, "clients_factory", lambda: HTTPClientRegistry(transport=httpx.MockTransport(spec_server)))
+    monkeypatch.setattr(jobs.job_queue, "_registry", jobs.InflightRegistry())
+
+    request = jobs.schemas.GenerateRequest(source_url="https://jobs.test/openapi.json")
+    key = jobs.job_queue.dedup_key(request)
+    assert jobs.job_queue.registry.claim(key, "running-job") is None
+    assert jobs.job_queue.submit(request) == {"job_id": "running-job", "deduplicated": True}
+    jobs.job_queue.registry.release(key, "running-job")
+
+    with TestClient(app) as client:
+        submitted = client.post("/api/v1/jobs", json={"source_url": "https://JOBS.test/openapi.json"})
+        assert submitted.status_code == 202
+        job_id = submitted.json()["job_id"]
+
+        status = client.get(f"/api/v1/jobs/{job_id}").json()
+        assert status["state"] == "succeeded" and status["progress"] == 100
+        result = client.get(f"/api/v1/jobs/{job_id}/result").json()
+        assert result["name"] == "Stream API"
+        assert "class StreamAPIClient:" in result["sdk_code"]
+
+        assert client.get("/api/v1/jobs/not-a-job").status_code == 404
+        assert client.get("/api/v1/jobs/not-a-job/result").status_code == 404
+
+def test_playground_stream_mode_passes_upstream_through(monkeypatch):
+    from app.routers import unified
+    from app.services import playground
+
+    async def chunks(*parts):
+        for part in parts:
+            yield part
+
+    def upstream(request):
+        if request.url.path == "/feed":
+            return httpx.Response(200, content=chunks(*((json.dumps({"seq": i}) + "\n").encode() for i in range(5))), headers={"content-type": "application/x-ndjson", "x-upstream": "1"})
+        if request.url.path == "/big":
+            return httpx.Response(200, content=b"x" * 2048, headers={"content-type": "application/octet-stream"})
+        if request.url.path == "/big-chunked":
+            return httpx.Response(200, content=chunks(*[b"x" * 512] * 4), headers={"content-type": "application/octet-stream"})
+        return httpx.Response(404, content=chunks(b'{"message": ', b'"Hola mundo"}'), headers={"content-type": "application/json"})
+
+    class Translator:
+        async def translate_response(self, data):
+            return {**data, "message": "Hello world"}
+
+    monkeypatch.setattr(playground, "_proxy", playground.PlaygroundProxy(max_body_bytes=1024))
+    monkeypatch.setattr(unified, "translator_service", Translator())
+    with TestClient(app) as client:
+        app.state.http_clients = HTTPClientRegistry(transport=httpx.MockTransport(upstream))
+        call = lambda path, **extra: client.post("/api/v1/playground/execute", json={"base_url": "https://up.test", "path": path, "method": "GET", "stream": True, **extra})
+
+        feed_response = call("/feed")
+        big = call("/big")
+        untranslated = call("/missing")
+        translated = call("/missing", translate=True)
+        # No declared length: the cap trips mid-body and the connection is aborted, not ended cleanly
+        with pytest.raises(playground.StreamAborted):
+            call("/big-chunked")
+
+    assert feed_response.status_code == 200 and feed_response.headers["x-upstream"] == "1"
+    assert [json.loads(line)["seq"] for line in feed_response.text.splitlines()] == [0, 1, 2, 3, 4]
+    assert big.status_code == 413
+    assert untranslated.status_code == 404 and untranslated.json() == {"message": "Hola mundo"}
+    assert translated.status_code == 404 and translated.json() == {"message": "Hello world"}
+
+def test_playground_batch_streams_progress_and_latency_summary():
+    import asyncio
+    in_flight = {"now": 0, "peak": 0}
+    seen = []
+
+    async def stand_in(request):
+        in_flight["now"] += 1
+        in_flight["peak"] = max(in_flight["peak"], in_flight["now"])
+        await asyncio.sleep(0.01)
+        in_flight["now"] -= 1
+        seen.append((request.url.path, request.url.params.get("verbose")))
+        if request.url.path == "/pets/13":
+            return httpx.Response(500, json={"error": "boom"})
+        return httpx.Response(200, json={"ok": True})
+
+    batch = {
+        "request": {"base_url": "https://load.test", "path": "/pets/{id}", "method": "GET", "params": {"verbose": "1"}},
+        "parameter_sets": [{"path_params": {"id": i}} for i in range(10, 15)],
+        "count": 20,
+        "concurrency": 4,
+    }
+    with TestClient(app) as client:
+        app.state.http_clients = HTTPClientRegistry(transport=httpx.MockTransport(stand_in))
+        response = client.post("/api/v1/playground/batch", json=batch)
+        oversized = client.post("/api/v1/playground/batch", json={**batch, "count": 5000})
+        empty = client.post("/api/v1/playground/batch", json={**batch, "count": 0})
+        stalled = client.post("/api/v1/playground/batch", json={**batch, "concurrency": 0})
+
+    assert oversized.status_code == 400
+    assert empty.status_code == 422 and stalled.status_code == 422
+    events = [json.loads(line) for line in response.text.splitlines()]
+    assert events[0] == {"type": "status", "stage": "running", "total": 20, "concurrency": 4}
+    result = events[-1]
+    assert result["type"] == "result" and result["completed"] == 20
+    assert result["status_codes"] == {"200": 16, "500": 4}
+    assert result["error_breakdown"] == {"HTTP 500": 4}
+    assert result["latency_ms"]["p50"] <= result["latency_ms"]["p95"] <= result["latency_ms"]["p99"]
+    assert sum(b["count"] for b in result["histogram"]) == 20
+    assert in_flight["peak"] <= 4
+    assert sorted(set(seen)) == [(f"/pets/{i}", "1") for i in range(10, 15)]
+
+def test_playground_record_replay(monkeypatch):
+    from app.core.cache import LRUCache, ResultCache
+    from app.routers import unified
+    from app.services import playground
+
+    calls = []
+
+    def upstream(request):
+        calls.append(str(request.url))
+        return httpx.Response(200, json={"id": int(request.url.path.rsplit("/", 1)[-1])})
+
+    class Translator:
+        runs = 0
+
+        async def translate_response(self, data):
+            Translator.runs += 1
+            return {**data, "translated": True}
+
+    monkeypatch.setattr(unified, "translator_service", Translator())
+    monkeypatch.setattr(playground, "_recorder", playground.PlaygroundRecorder(cache=ResultCache(local=LRUCache())))
+    body = lambda pet, **extra: {"base_url": "https://REC.test:443", "path": f"/pets/{pet}", "method": "GET", "translate": False, **extra}
+    with TestClient(app) as client:
+        app.state.http_clients = HTTPClientRegistry(transport=httpx.MockTransport(upstream))
+        execute = lambda payload: client.post("/api/v1/playground/execute", json=payload)
+
+        miss = execute(body(1, record_mode="record", params={"b": 2, "a": 1}))
+        hit = execute(body(1, record_mode="record", params={"a": 1, "b": 2}))
+        offline_miss = execute(body(2, record_mode="replay"))
+        offline_hit = execute({**body(1, record_mode="replay"), "base_url": "https://rec.test", "params": {"a": "1", "b": "2"}})
+        other_key = execute(body(1, record_mode="record", params={"a": 1, "b": 2}, headers={"Authorization": "Bearer other"}))
+        other_cookie = execute(body(1, record_mode="record", params={"a": 1, "b": 2}, headers={"Authorization": "Bearer other", "Cookie": "session=2"}))
+        off = execute(body(1))
+        deletes = [execute(body(3, record_mode="record", method="DELETE")) for _ in range(2)]
+        replayed_delete = execute(body(3, record_mode="replay", method="DELETE"))
+        translated = [execute(body(4, record_mode="record", translate=None)) for _ in range(2)]
+
+    assert miss.headers["x-playground-cache"] == "MISS" and miss.json() == {"status_code": 200, "response": {"id": 1}}
+    assert hit.headers["x-playground-cache"] == "HIT" and hit.json() == miss.json()
+    assert offline_miss.status_code == 404
+    assert offline_hit.headers["x-playground-cache"] == "HIT"
+    assert other_key.headers["x-playground-cache"] == "MISS"
+    assert other_cookie.headers["x-playground-cache"] == "MISS"
+    assert "x-playground-cache" not in off.headers
+    # Non-idempotent calls always reach upstream unless record_unsafe is set
+    assert all("x-playground-cache" not in r.headers for r in deletes)
+    assert replayed_delete.status_code == 404
+    # The translated body is what gets recorded; a hit doesn't translate again
+    assert [r.json()["response"] for r in translated] == [{"id": 4, "translated": True}] * 2
+    assert Translator.runs == 1
+    assert len(calls) == 7
+
+def test_cached_generation_reports_an_empty_diff():
+    spec = {**SPEC, "paths": {"/a": {"get": {"summary": "A"}}}}
+    served = lambda request: httpx.Response(200, json=spec)
+    with TestClient(app) as client:
+        app.state.http_clients = HTTPClientRegistry(transport=httpx.MockTransport(served))
+        generate = lambda **extra: client.post("/api/v1/generate", json={"source_url": "https://changes.test/openapi.json", **extra}).json()
+
+        assert generate()["changes"] is None
+        spec["paths"] = {**spec["paths"], "/b": {"get": {"summary": "B"}}}
+        assert generate()["changes"]["added"] == ["GET /b"]
+        # Unchanged document: served from the result cache with an empty diff, not the earlier run's
+        assert generate()["changes"] == {"added": [], "removed": [], "changed": [], "unchanged": 2}
+        # Other crawl options make a different request with its own manifest history
+        assert generate(max_pages=3)["changes"] is None
+
+def test_playground_recorder_is_lazy_and_skips_failed_translations(monkeypatch):
+    from app.core.cache import LRUCache, ResultCache
+    from app.routers import unified
+    from app.services import playground
+
+    calls = []
+
+    def upstream(request):
+        calls.append(request.url.path)
+        return httpx.Response(200, json={"message": "Hola"})
+
+    class FlakyTranslator:
+        cache = ResultCache(local=LRUCache())
+        runs = 0
+
+        async def translate_response(self, data):
+            FlakyTranslator.runs += 1
+            if FlakyTranslator.runs == 1:
+                raise RuntimeError("translator down")
+            return {"message": "Hello"}
+
+    recorder = playground.PlaygroundRecorder(default_mode="off")
+    monkeypatch.setattr(unified, "translator_service", FlakyTranslator())
+    monkeypatch.setattr(playground, "_recorder", recorder)
+    body = {"base_url": "https://lazy.test", "path": "/greeting", "method": "GET"}
+    with TestClient(app) as client:
+        app.state.http_clients = HTTPClientRegistry(transport=httpx.MockTransport(upstream))
+        client.post("/api/v1/playground/execute", json={**body, "translate": False})
+        assert client.get("/api/v1/cache/stats").json()["playground"] is None
+        # Off by default: the recording store was never built
+        assert recorder._cache is None
+
+        recorder._cache = ResultCache(local=LRUCache())
+        failed = client.post("/api/v1/playground/execute", json={**body, "record_mode": "record"})
+        retried = client.post("/api/v1/playground/execute", json={**body, "record_mode": "record"})
+        replayed = client.post("/api/v1/playground/execute", json={**body, "record_mode": "record"})
+
+    assert failed.json()["response"] == {"message": "Hola"}
+    # The untranslated fallback wasn't recorded under the translated key
+    assert retried.headers["x-playground-cache"] == "MISS" and retried.json()["response"] == {"message": "Hello"}
+    assert replayed.headers["x-playground-cache"] == "HIT" and replayed.json()["response"] == {"message": "Hello"}
+    assert len(calls) == 3